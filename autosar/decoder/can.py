@@ -0,0 +1,479 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from autosar.decoder.pdu import PduDecoder
+from autosar.misc import HasLogger
+from autosar.model.can_cluster import CanFrameTriggering, CanPhysicalChannel
+from autosar.model.frame import Frame
+from autosar.model.pdu import ISignalIPdu
+
+# Flag of error frames in the 8 digit identifiers of candump logs
+CAN_ERR_FLAG = 0x20000000
+CAN_EFF_MASK = 0x1fffffff
+
+# Marks extended identifiers in the keys of CanIdIndex
+_extended_key = 1 << 32
+
+
+@dataclass
+class CanFrameChunk:
+    """
+    Consecutive data frames of a CAN log. Row i of data holds the length[i] data bytes of frame i, padded with
+    zeros to the longest frame of the chunk. timestamp is in seconds, relative to the start of the measurement
+    for ASC logs.
+    """
+    first_frame: int
+    timestamp: np.ndarray
+    channel: np.ndarray
+    can_id: np.ndarray
+    extended: np.ndarray
+    length: np.ndarray
+    data: np.ndarray
+
+    def __len__(self):
+        return len(self.can_id)
+
+    def select(self, rows: np.ndarray) -> 'CanFrameChunk':
+        """
+        Returns the frames selected by rows, a boolean mask or an index array
+        """
+        return CanFrameChunk(
+            first_frame=self.first_frame,
+            timestamp=self.timestamp[rows],
+            channel=self.channel[rows],
+            can_id=self.can_id[rows],
+            extended=self.extended[rows],
+            length=self.length[rows],
+            data=self.data[rows],
+        )
+
+
+class _ChunkBuilder:
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self.first_frame = 0
+        self._clear()
+
+    def _clear(self):
+        self.timestamp: list[float] = []
+        self.channel: list[str] = []
+        self.can_id: list[int] = []
+        self.extended: list[bool] = []
+        self.data: list[bytes] = []
+
+    @property
+    def full(self) -> bool:
+        return len(self.can_id) >= self.chunk_size
+
+    def append(self, timestamp: float, channel: str, can_id: int, extended: bool, data: bytes):
+        self.timestamp.append(timestamp)
+        self.channel.append(channel)
+        self.can_id.append(can_id)
+        self.extended.append(extended)
+        self.data.append(data)
+
+    def build(self) -> CanFrameChunk | None:
+        if len(self.can_id) == 0:
+            return None
+        length = np.fromiter(map(len, self.data), dtype=np.int64, count=len(self.data))
+        width = int(length.max())
+        data = np.frombuffer(b''.join(row.ljust(width, b'\0') for row in self.data), dtype=np.uint8)
+        chunk = CanFrameChunk(
+            first_frame=self.first_frame,
+            timestamp=np.array(self.timestamp, dtype=np.float64),
+            channel=np.array(self.channel, dtype=str),
+            can_id=np.array(self.can_id, dtype=np.uint32),
+            extended=np.array(self.extended, dtype=bool),
+            length=length,
+            data=data.reshape(len(length), width),
+        )
+        self.first_frame += len(length)
+        self._clear()
+        return chunk
+
+
+def iter_candump(path: str | Path, chunk_size: int = 65536) -> Iterator[CanFrameChunk]:
+    """
+    Reads a candump log in chunks of chunk_size data frames. Both the log file format of candump -l,
+    '(1436509052.249713) can0 123#DEADBEEF', with '##' for CAN FD frames, and the screen format with
+    absolute timestamps, '(1436509052.249713) can0 123 [4] DE AD BE EF', are understood.
+    Remote and error frames are skipped.
+    """
+    builder = _ChunkBuilder(chunk_size)
+    with open(path, encoding='ascii', errors='replace') as file:
+        for line in file:
+            tokens = line.split()
+            if len(tokens) < 3 or not tokens[0].startswith('('):
+                continue
+            timestamp = float(tokens[0][1:-1])
+            channel = tokens[1]
+            frame = tokens[2]
+            if '#' in frame:
+                identifier, _, data = frame.partition('#')
+                if data.startswith('R'):
+                    continue
+                if data.startswith('#'):
+                    # CAN FD, the digit after '##' holds the flags
+                    data = data[2:]
+                data = bytes.fromhex(data)
+            else:
+                if len(tokens) < 4 or not tokens[3].startswith('['):
+                    continue
+                identifier = frame
+                if 'remote' in tokens[4:5]:
+                    continue
+                data = bytes.fromhex(''.join(tokens[4:4 + int(tokens[3][1:-1])]))
+            can_id = int(identifier, 16)
+            if len(identifier) == 8 and can_id & CAN_ERR_FLAG:
+                continue
+            builder.append(timestamp, channel, can_id & CAN_EFF_MASK, len(identifier) == 8, data)
+            if builder.full:
+                yield builder.build()
+    if (chunk := builder.build()) is not None:
+        yield chunk
+
+
+def iter_asc(path: str | Path, chunk_size: int = 65536) -> Iterator[CanFrameChunk]:
+    """
+    Reads a Vector ASC log in chunks of chunk_size data frames. Classic CAN and CANFD data frames are read,
+    identifiers and data in hex or decimal as given by the 'base' header line. Remote frames, error frames and
+    other events are skipped.
+    """
+    builder = _ChunkBuilder(chunk_size)
+    base = 16
+    with open(path, encoding='ascii', errors='replace') as file:
+        for line in file:
+            tokens = line.split()
+            if len(tokens) < 2:
+                continue
+            if tokens[0] == 'base':
+                base = 16 if tokens[1] == 'hex' else 10
+                continue
+            try:
+                timestamp = float(tokens[0])
+            except ValueError:
+                continue
+            if tokens[1] == 'CANFD':
+                frame = _asc_can_fd(tokens, base)
+            else:
+                frame = _asc_can(tokens, base)
+            if frame is None:
+                continue
+            channel, identifier, data = frame
+            builder.append(timestamp, channel, int(identifier.rstrip('xX'), base), identifier[-1] in 'xX', data)
+            if builder.full:
+                yield builder.build()
+    if (chunk := builder.build()) is not None:
+        yield chunk
+
+
+def _asc_can(tokens: list[str], base: int) -> tuple[str, str, bytes] | None:
+    """
+    <time> <channel> <id>[x] <Rx|Tx> d <dlc> <data bytes> ...
+    """
+    if len(tokens) < 6 or tokens[4] != 'd' or not tokens[1].isdigit():
+        return None
+    length = int(tokens[5], 16)
+    data = bytes(int(value, base) for value in tokens[6:6 + length])
+    return tokens[1], tokens[2], data
+
+
+def _asc_can_fd(tokens: list[str], base: int) -> tuple[str, str, bytes] | None:
+    """
+    <time> CANFD <channel> <Rx|Tx> <id>[x] [<symbolic name>] <brs> <esi> <dlc> <data length> <data bytes> ...
+    """
+    if len(tokens) < 9:
+        return None
+    i = 5
+    if not (tokens[5] in ('0', '1') and tokens[6] in ('0', '1')):
+        i = 6
+    if len(tokens) < i + 4:
+        return None
+    length = int(tokens[i + 3])
+    data = bytes(int(value, base) for value in tokens[i + 4:i + 4 + length])
+    return tokens[2], tokens[4], data
+
+
+def iter_can_log(path: str | Path, chunk_size: int = 65536) -> Iterator[CanFrameChunk]:
+    """
+    Reads a Vector ASC log if path ends with .asc, a candump log otherwise
+    """
+    if Path(path).suffix.lower() == '.asc':
+        return iter_asc(path, chunk_size)
+    return iter_candump(path, chunk_size)
+
+
+STANDARD_ID_MASK = 0x7ff
+EXTENDED_ID_MASK = CAN_EFF_MASK
+
+
+@dataclass(frozen=True)
+class CanIdFilter:
+    """
+    CAN IDs a frame triggering receives: can_id itself, the IDs equal to can_id in the bits of rx_mask,
+    or the IDs from lower_can_id to upper_can_id. The range takes precedence over the mask.
+    """
+    name: str
+    can_id: int | None
+    extended: bool = False
+    rx_mask: int | None = None
+    lower_can_id: int | None = None
+    upper_can_id: int | None = None
+
+    @classmethod
+    def from_triggering(cls, triggering: CanFrameTriggering) -> 'CanIdFilter':
+        id_range = triggering.rx_identifier_range
+        return cls(
+            name=triggering.name,
+            can_id=triggering.identifier,
+            extended=triggering.can_addressing_mode == 'EXTENDED',
+            rx_mask=triggering.rx_mask,
+            lower_can_id=None if id_range is None else id_range.lower_can_id,
+            upper_can_id=None if id_range is None else id_range.upper_can_id,
+        )
+
+    @property
+    def id_mask(self) -> int:
+        return EXTENDED_ID_MASK if self.extended else STANDARD_ID_MASK
+
+
+class CanIdIndex:
+    """
+    Answers which CanIdFilters accept a CAN ID. Exact IDs are looked up in a dict. Ranges and masks covering
+    contiguous low bits, like 0x7f0, are merged into disjoint segments found by binary search. Any other mask
+    gets one dict per distinct mask. lookup() returns the positions of all accepting filters, resolve() and
+    lookup_array() the position of the one a frame is assigned to: the first exact match, otherwise the first
+    filter accepting the ID.
+    """
+
+    def __init__(self, filters: Iterable[CanIdFilter]):
+        self.filters = tuple(filters)
+        exact: dict[int, list[int]] = {}
+        masked: dict[int, dict[int, list[int]]] = {}
+        ranges: list[tuple[int, int, int]] = []
+        for i, id_filter in enumerate(self.filters):
+            flag = _extended_key if id_filter.extended else 0
+            full = id_filter.id_mask
+            if id_filter.lower_can_id is not None and id_filter.upper_can_id is not None:
+                ranges.append((id_filter.lower_can_id | flag, id_filter.upper_can_id | flag, i))
+                continue
+            if id_filter.can_id is None:
+                continue
+            mask = full if id_filter.rx_mask is None else id_filter.rx_mask & full
+            value = id_filter.can_id & mask
+            if mask == full:
+                exact.setdefault(value | flag, []).append(i)
+            elif (full & ~mask) & ((full & ~mask) + 1) == 0:
+                # The free bits are the lowest ones, the accepted IDs form one range
+                ranges.append((value | flag, value | (full & ~mask) | flag, i))
+            else:
+                masked.setdefault(mask | flag, {}).setdefault(value | flag, []).append(i)
+        self._exact = {key: tuple(indices) for key, indices in exact.items()}
+        self._masked = {mask: {key: tuple(indices) for key, indices in values.items()} for mask, values in masked.items()}
+        # Segment k covers the keys from _segment_starts[k] up to the next start, accepted by _segment_matches[k]
+        self._segment_starts = sorted({low for low, _, _ in ranges} | {high + 1 for _, high, _ in ranges})
+        self._segment_matches = [
+            tuple(sorted(i for low, high, i in ranges if low <= start <= high))
+            for start in self._segment_starts
+        ]
+        self._exact_keys = np.array(sorted(self._exact), dtype=np.uint64)
+        self._exact_first = np.array([self._exact[key][0] for key in self._exact_keys.tolist()], dtype=np.int64)
+        self._mask_tables = []
+        for mask, values in self._masked.items():
+            keys = sorted(values)
+            self._mask_tables.append((
+                np.uint64(mask | _extended_key),
+                np.array(keys, dtype=np.uint64),
+                np.array([values[key][0] for key in keys], dtype=np.int64),
+            ))
+        self._segment_array = np.array(self._segment_starts, dtype=np.uint64)
+        self._segment_first = np.array([matches[0] if matches else -1 for matches in self._segment_matches], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.filters)
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(exact={len(self._exact)}, masks={len(self._masked)}, '
+                f'segments={len(self._segment_starts)})')
+
+    @classmethod
+    def from_physical_channel(cls, channel: CanPhysicalChannel) -> 'CanIdIndex':
+        return cls(
+            CanIdFilter.from_triggering(triggering)
+            for triggering in channel.frame_triggerings
+            if isinstance(triggering, CanFrameTriggering)
+        )
+
+    def lookup(self, can_id: int, extended: bool = False) -> tuple[int, ...]:
+        """
+        Returns the positions of the filters accepting can_id in ascending order
+        """
+        key = can_id | (_extended_key if extended else 0)
+        matches = set(self._exact.get(key, ()))
+        for mask, values in self._masked.items():
+            matches.update(values.get(key & (mask | _extended_key), ()))
+        k = bisect_right(self._segment_starts, key) - 1
+        if k >= 0:
+            matches.update(self._segment_matches[k])
+        return tuple(sorted(matches))
+
+    def resolve(self, can_id: int, extended: bool = False) -> int | None:
+        """
+        Returns the position of the filter a frame with can_id is assigned to, None if no filter accepts it
+        """
+        key = can_id | (_extended_key if extended else 0)
+        exact = self._exact.get(key)
+        if exact is not None:
+            return exact[0]
+        matches = self.lookup(can_id, extended)
+        return matches[0] if matches else None
+
+    def lookup_array(self, can_ids: np.ndarray, extended: np.ndarray | bool = False) -> np.ndarray:
+        """
+        Returns the position of the filter every ID of can_ids is assigned to as in resolve(), -1 if none accepts it
+        """
+        keys = np.asarray(can_ids).astype(np.uint64)
+        keys |= np.where(extended, np.uint64(_extended_key), np.uint64(0))
+        result = self._search(self._exact_keys, self._exact_first, keys)
+        missing = result < 0
+        if not missing.any():
+            return result
+        keys = keys[missing]
+        none = np.iinfo(np.int64).max
+        first = np.full(len(keys), none, dtype=np.int64)
+        for mask, mask_keys, mask_first in self._mask_tables:
+            found = self._search(mask_keys, mask_first, keys & mask)
+            np.minimum(first, np.where(found < 0, none, found), out=first)
+        if len(self._segment_array) > 0:
+            k = np.searchsorted(self._segment_array, keys, side='right') - 1
+            found = np.where(k >= 0, self._segment_first[np.maximum(k, 0)], -1)
+            np.minimum(first, np.where(found < 0, none, found), out=first)
+        result[missing] = np.where(first == none, -1, first)
+        return result
+
+    @staticmethod
+    def _search(sorted_keys: np.ndarray, first: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        if len(sorted_keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        position = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        return np.where(sorted_keys[position] == keys, first[position], -1)
+
+
+@dataclass(frozen=True)
+class CanFrameLayout:
+    """
+    PDUs of the frame received with the IDs of id_filter, as PduDecoders and the byte offset of each PDU in the frame
+    """
+    id_filter: CanIdFilter
+    pdus: tuple[tuple[int, PduDecoder], ...]
+
+    @property
+    def name(self) -> str:
+        return self.id_filter.name
+
+
+@dataclass
+class DecodedPdu:
+    """
+    Signals of one PDU decoded from the frames index of a CanFrameChunk
+    """
+    frame: str
+    pdu: str
+    index: np.ndarray
+    timestamp: np.ndarray
+    signals: dict[str, np.ndarray]
+
+
+class CanLogDecoder(HasLogger):
+    """
+    Decodes CAN logs with the frames triggered on a CAN physical channel. Frames of a chunk are assigned to
+    frame layouts through a CanIdIndex and grouped, every PDU is then decoded over all frames of its group at once.
+    """
+
+    def __init__(self, frames: Iterable[CanFrameLayout], channel: str | None = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frames = tuple(frames)
+        self.channel = channel
+        self.index = CanIdIndex(frame.id_filter for frame in self.frames)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(frames={len(self.frames)}, channel={self.channel!r})'
+
+    @classmethod
+    def from_physical_channel(cls, channel: CanPhysicalChannel, log_channel: str | None = None) -> 'CanLogDecoder':
+        """
+        Maps every CanFrameTriggering of channel through its frame and PduToFrameMappings to the ISignalIPdus it
+        carries. With log_channel only frames logged on that channel, e.g. 'can0' or '1', are decoded.
+        """
+        ws = channel.root_ws()
+        decoders: dict[str, PduDecoder] = {}
+        frames = []
+        for triggering in channel.frame_triggerings:
+            if not isinstance(triggering, CanFrameTriggering):
+                continue
+            frame = ws.find(triggering.frame_ref)
+            if not isinstance(frame, Frame):
+                cls._logger.warning(f'Triggering {triggering.name}: Cannot find frame {triggering.frame_ref}')
+                continue
+            pdus = []
+            for mapping in frame.pdu_to_frame_mappings:
+                pdu = ws.find(mapping.pdu_ref)
+                if not isinstance(pdu, ISignalIPdu):
+                    continue
+                if mapping.start_position % 8 != 0:
+                    cls._logger.warning(f'Frame {frame.name}: PDU {pdu.name} is not byte aligned, skipping')
+                    continue
+                if pdu.ref not in decoders:
+                    decoders[pdu.ref] = PduDecoder.from_i_signal_i_pdu(pdu)
+                pdus.append((mapping.start_position // 8, decoders[pdu.ref]))
+            if len(pdus) > 0:
+                frames.append(CanFrameLayout(CanIdFilter.from_triggering(triggering), tuple(pdus)))
+        return cls(frames, log_channel)
+
+    def iter_decode(self, path: str | Path, chunk_size: int = 65536) -> Iterator[list[DecodedPdu]]:
+        """
+        Reads the CAN log at path in chunks of chunk_size frames and yields the decoded PDUs of every chunk
+        """
+        for chunk in iter_can_log(path, chunk_size):
+            yield self.decode(chunk)
+
+    def decode(self, chunk: CanFrameChunk) -> list[DecodedPdu]:
+        rows = np.arange(len(chunk))
+        if self.channel is not None:
+            rows = rows[chunk.channel == self.channel]
+        found = self.index.lookup_array(chunk.can_id[rows], chunk.extended[rows])
+        rows = rows[found >= 0]
+        found = found[found >= 0]
+        order = rows[np.argsort(found, kind='stable')]
+        bounds = np.zeros(len(self.frames) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(found, minlength=len(self.frames)), out=bounds[1:])
+        result = []
+        for i, frame in enumerate(self.frames):
+            if bounds[i] == bounds[i + 1]:
+                continue
+            index = order[bounds[i]:bounds[i + 1]]
+            for offset, decoder in frame.pdus:
+                result.append(self._decode_pdu(chunk, frame, index, offset, decoder))
+        return result
+
+    def _decode_pdu(self, chunk: CanFrameChunk, frame: CanFrameLayout, index: np.ndarray, offset: int, decoder: PduDecoder) -> DecodedPdu:
+        end = offset + decoder.required_length
+        covered = chunk.length[index] >= end
+        if not covered.all():
+            self._logger.debug(f'Frame {frame.name}: {int((~covered).sum())} frames too short for PDU {decoder.name}')
+            index = index[covered]
+        payloads = chunk.data[index, offset:end]
+        if payloads.shape[1] < decoder.required_length:
+            # No frame of the group is long enough, all rows were dropped above
+            payloads = np.zeros((0, decoder.required_length), dtype=np.uint8)
+        return DecodedPdu(
+            frame=frame.name,
+            pdu=decoder.name,
+            index=index,
+            timestamp=chunk.timestamp[index],
+            signals=decoder.decode(payloads),
+        )
@@ -0,0 +1,386 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from autosar.decoder.can import CanFrameChunk, CanIdFilter, CanIdIndex, DecodedPdu, iter_can_log
+from autosar.decoder.pdu import PduDecoder
+from autosar.misc import HasLogger
+from autosar.model.can_cluster import CanClusterVariants, CanFrameTriggering
+from autosar.model.frame import Frame
+from autosar.model.pdu import ISignalIPdu, Pdu
+from autosar.model.system import System
+from autosar.model.transport_protocol import CanTpAddress, CanTpConfig, CanTpConnection, CanTpNode
+
+# N_PCI type in the high nibble of the first protocol control byte
+N_PCI_SINGLE_FRAME = 0
+N_PCI_FIRST_FRAME = 1
+N_PCI_CONSECUTIVE_FRAME = 2
+N_PCI_FLOW_CONTROL = 3
+# Flow status of a flow control frame aborting the transfer
+FLOW_STATUS_OVERFLOW = 2
+# Addressing formats with an address byte in front of the N_PCI: the target address or the address extension
+EXTENDED_ADDRESSING = 'EXTENDED'
+MIXED_ADDRESSING = ('MIXED', 'MIXED-29-BIT', 'MIXED29BIT')
+# N_Cr of ISO 15765-2 in seconds, used for connections without timeout_cr
+DEFAULT_TIMEOUT = 1.0
+# Largest SDU reassembled unless configured otherwise, first frames announcing more are dropped
+DEFAULT_MAX_TRANSFER_SIZE = 0x10000
+
+
+@dataclass(frozen=True)
+class CanTpLayout:
+    """
+    One CanTpConnection as seen on the bus: the IDs of its data and flow control N-PDUs, the address byte
+    in front of the N_PCI with extended and mixed addressing, None with normal addressing, the largest message
+    accepted, None if the length of the SDU is not known, the timeout between consecutive frames in seconds and the decoder of the reassembled SDU
+    """
+    name: str
+    data_id: CanIdFilter
+    flow_control_id: CanIdFilter | None = None
+    address: int | None = None
+    flow_control_address: int | None = None
+    max_size: int | None = None
+    timeout: float = DEFAULT_TIMEOUT
+    decoder: PduDecoder | None = None
+
+
+@dataclass
+class CanTpMessage:
+    """
+    An SDU reassembled for connection, completed by frame index of a CanFrameChunk. data is a view of the buffer
+    the SDU was reassembled in, or of the single frame it was sent in.
+    """
+    connection: int
+    index: int
+    timestamp: float
+    data: memoryview
+
+    def __len__(self):
+        return len(self.data)
+
+
+class _Session:
+    __slots__ = ('buffer', 'size', 'received', 'sequence', 'last_timestamp')
+
+    def __init__(self, size: int, timestamp: float):
+        self.buffer = bytearray(size)
+        self.size = size
+        self.received = 0
+        self.sequence = 1
+        self.last_timestamp = timestamp
+
+
+class CanTpReassembler(HasLogger):
+    """
+    Reassembles the SDUs of CanTp (ISO 15765-2) connections from CAN logs and decodes them. Frames are assigned to
+    connections through a CanIdIndex over the IDs of all data and flow control N-PDUs and, with extended and mixed
+    addressing, their first byte. Every connection has at most one message in transfer, its buffer is allocated
+    with the length announced by the first frame. A first frame announcing more than the max_size of its connection
+    or more than max_transfer_size bytes is dropped, as is a transfer on a wrong sequence number, an overflow
+    flow control or after timeout without consecutive frame. Memory use is therefore bounded by the number of
+    connections times max_transfer_size. Logs are read in chunks, transfers continue across chunks.
+    """
+
+    def __init__(
+            self,
+            connections: Iterable[CanTpLayout],
+            channel: str | None = None,
+            max_transfer_size: int = DEFAULT_MAX_TRANSFER_SIZE,
+            *args, **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.connections = tuple(connections)
+        self.channel = channel
+        self.max_transfer_size = max_transfer_size
+        self._max_sizes = tuple(
+            max_transfer_size if connection.max_size is None else min(connection.max_size, max_transfer_size)
+            for connection in self.connections
+        )
+        filters: dict[tuple[int, bool], CanIdFilter] = {}
+        targets: dict[tuple[int, bool], dict[int | None, tuple[int, bool]]] = {}
+        for i, connection in enumerate(self.connections):
+            ids = [(connection.data_id, connection.address, False)]
+            if connection.flow_control_id is not None:
+                ids.append((connection.flow_control_id, connection.flow_control_address, True))
+            for id_filter, address, flow_control in ids:
+                key = (id_filter.can_id, id_filter.extended)
+                filters.setdefault(key, id_filter)
+                target = targets.setdefault(key, {})
+                if address in target:
+                    self._logger.warning(f'Connection {connection.name}: Frames of {id_filter.name} already assigned '
+                                         f'to {self.connections[target[address][0]].name}')
+                    continue
+                target[address] = (i, flow_control)
+        self.index = CanIdIndex(filters.values())
+        self._targets = [targets[key] for key in filters]
+        self.sessions: dict[int, _Session] = {}
+        self.dropped = 0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(connections={len(self.connections)}, sessions={len(self.sessions)})'
+
+    @classmethod
+    def from_system(
+            cls,
+            system: System,
+            log_channel: str | None = None,
+            max_transfer_size: int = DEFAULT_MAX_TRANSFER_SIZE,
+    ) -> 'CanTpReassembler':
+        """
+        Collects the connections of every CanTpConfig of system, see from_tp_configs
+        """
+        ws = system.root_ws()
+        configs = (ws.find(ref) for ref in system.fibex_element_refs)
+        configs = (config for config in configs if isinstance(config, CanTpConfig))
+        return cls.from_tp_configs(configs, log_channel, max_transfer_size)
+
+    @classmethod
+    def from_tp_configs(
+            cls,
+            configs: Iterable[CanTpConfig],
+            log_channel: str | None = None,
+            max_transfer_size: int = DEFAULT_MAX_TRANSFER_SIZE,
+    ) -> 'CanTpReassembler':
+        """
+        Finds the CAN IDs of data and flow control N-PDUs in the frame triggerings of the cluster of every config,
+        the address bytes in the CanTpAddresses of the transmitting and receiving CanTpNodes, and compiles
+        a PduDecoder for every SDU that is an ISignalIPdu. With log_channel only frames logged on that channel
+        are reassembled. SDUs of unknown or dynamic length are limited to max_transfer_size bytes.
+        """
+        layouts = []
+        for config in configs:
+            triggerings = cls._n_pdu_triggerings(config)
+            for connection in config.tp_connections:
+                layout = cls._layout(config, connection, triggerings)
+                if layout is not None:
+                    layouts.append(layout)
+        return cls(layouts, log_channel, max_transfer_size)
+
+    @classmethod
+    def _n_pdu_triggerings(cls, config: CanTpConfig) -> dict[str, CanFrameTriggering]:
+        """
+        Maps the reference of every PDU sent at the start of a CAN frame of the cluster to the frame's triggering
+        """
+        ws = config.root_ws()
+        cluster = ws.find(config.communication_cluster_ref)
+        if not isinstance(cluster, CanClusterVariants):
+            cls._logger.warning(f'{config.name}: Cannot find CAN cluster {config.communication_cluster_ref}')
+            return {}
+        triggerings = {}
+        for variant in cluster:
+            for channel in variant.physical_channels:
+                for triggering in channel.frame_triggerings:
+                    if not isinstance(triggering, CanFrameTriggering):
+                        continue
+                    frame = ws.find(triggering.frame_ref)
+                    if not isinstance(frame, Frame):
+                        continue
+                    for mapping in frame.pdu_to_frame_mappings:
+                        if mapping.start_position == 0:
+                            triggerings.setdefault(mapping.pdu_ref, triggering)
+        return triggerings
+
+    @classmethod
+    def _layout(cls, config: CanTpConfig, connection: CanTpConnection, triggerings: dict[str, CanFrameTriggering]) -> CanTpLayout | None:
+        ws = config.root_ws()
+        data = triggerings.get(connection.data_pdu_ref)
+        if data is None:
+            cls._logger.warning(f'{config.name}: No CAN frame carries N-PDU {connection.data_pdu_ref}')
+            return None
+        sdu = ws.find(connection.tp_sdu_ref)
+        name = data.name if sdu is None else sdu.name
+        flow_control = triggerings.get(connection.flow_control_pdu_ref)
+        transmitter = cls._address(ws, connection.transmitter_ref)
+        receivers = [address for ref in connection.receiver_refs if (address := cls._address(ws, ref)) is not None]
+        receiver = receivers[0] if len(receivers) > 0 else None
+        address = flow_control_address = None
+        if connection.addressing_format == EXTENDED_ADDRESSING:
+            # Data frames carry the address of the receiver, flow control frames the one of the transmitter
+            address = None if receiver is None else receiver.tp_address
+            flow_control_address = None if transmitter is None else transmitter.tp_address
+            if address is None:
+                cls._logger.warning(f'Connection {name}: No target address for extended addressing')
+                return None
+        elif connection.addressing_format in MIXED_ADDRESSING:
+            extensions = [a.tp_address_extension_value for a in (receiver, transmitter) if a is not None]
+            extensions = [value for value in extensions if value is not None]
+            if len(extensions) == 0:
+                cls._logger.warning(f'Connection {name}: No address extension for mixed addressing')
+                return None
+            address = flow_control_address = extensions[0]
+        decoder = None
+        if isinstance(sdu, ISignalIPdu):
+            decoder = PduDecoder.from_i_signal_i_pdu(sdu)
+        max_size = None
+        if isinstance(sdu, Pdu) and sdu.length is not None and not sdu.has_dynamic_length:
+            max_size = sdu.length
+        return CanTpLayout(
+            name=name,
+            data_id=CanIdFilter(data.name, data.identifier, data.can_addressing_mode == 'EXTENDED'),
+            flow_control_id=None if flow_control is None else CanIdFilter(
+                flow_control.name, flow_control.identifier, flow_control.can_addressing_mode == 'EXTENDED',
+            ),
+            address=address,
+            flow_control_address=flow_control_address,
+            max_size=max_size,
+            timeout=connection.timeout_cr or DEFAULT_TIMEOUT,
+            decoder=decoder,
+        )
+
+    @staticmethod
+    def _address(ws, node_ref: str | None) -> CanTpAddress | None:
+        node = None if node_ref is None else ws.find(node_ref)
+        if not isinstance(node, CanTpNode) or node.tp_address_ref is None:
+            return None
+        address = ws.find(node.tp_address_ref)
+        return address if isinstance(address, CanTpAddress) else None
+
+    def reset(self):
+        self.sessions.clear()
+
+    def expire(self, timestamp: float):
+        """
+        Drops the transfers without frames in their timeout before timestamp
+        """
+        expired = [
+            i for i, session in self.sessions.items()
+            if timestamp - session.last_timestamp > self.connections[i].timeout
+        ]
+        for i in expired:
+            del self.sessions[i]
+        self.dropped += len(expired)
+
+    def feed(self, chunk: CanFrameChunk) -> list[CanTpMessage]:
+        """
+        Processes the frames of chunk in order and returns the messages they complete
+        """
+        rows = np.arange(len(chunk))
+        if self.channel is not None:
+            rows = rows[chunk.channel == self.channel]
+        found = self.index.lookup_array(chunk.can_id[rows], chunk.extended[rows])
+        rows = rows[found >= 0]
+        found = found[found >= 0]
+        if len(rows) == 0:
+            return []
+        width = chunk.data.shape[1]
+        raw = memoryview(np.ascontiguousarray(chunk.data[rows]).tobytes())
+        complete = []
+        items = zip(rows.tolist(), found.tolist(), chunk.length[rows].tolist(), chunk.timestamp[rows].tolist())
+        for k, (row, position, length, timestamp) in enumerate(items):
+            frame = raw[k * width:k * width + length]
+            targets = self._targets[position]
+            target = targets.get(None)
+            start = 0
+            if target is None:
+                if length == 0 or (target := targets.get(frame[0])) is None:
+                    continue
+                start = 1
+            i, flow_control = target
+            if length <= start:
+                continue
+            if flow_control:
+                self._flow_control(i, frame, start)
+                continue
+            data = self._data_frame(i, frame, start, timestamp)
+            if data is not None:
+                complete.append(CanTpMessage(i, row, timestamp, data))
+        self.expire(float(chunk.timestamp[-1]))
+        return complete
+
+    def _flow_control(self, i: int, frame: memoryview, start: int):
+        if frame[start] >> 4 == N_PCI_FLOW_CONTROL and frame[start] & 0xf == FLOW_STATUS_OVERFLOW:
+            if self.sessions.pop(i, None) is not None:
+                self.dropped += 1
+
+    def _data_frame(self, i: int, frame: memoryview, start: int, timestamp: float) -> memoryview | None:
+        """
+        Adds one data frame to the transfer of connection i, returns the SDU if it is complete
+        """
+        pci = frame[start] >> 4
+        low = frame[start] & 0xf
+        if pci == N_PCI_CONSECUTIVE_FRAME:
+            session = self.sessions.get(i)
+            if session is None:
+                return None
+            if low != session.sequence or timestamp - session.last_timestamp > self.connections[i].timeout:
+                del self.sessions[i]
+                self.dropped += 1
+                return None
+            size = min(len(frame) - start - 1, session.size - session.received)
+            session.buffer[session.received:session.received + size] = frame[start + 1:start + 1 + size]
+            session.received += size
+            session.sequence = (session.sequence + 1) & 0xf
+            session.last_timestamp = timestamp
+            if session.received < session.size:
+                return None
+            del self.sessions[i]
+            return memoryview(session.buffer)
+        if pci == N_PCI_SINGLE_FRAME:
+            if low == 0 and len(frame) > 8:
+                # CAN FD single frame, the length follows in the next byte
+                size, start = frame[start + 1], start + 2
+            else:
+                size, start = low, start + 1
+            if size == 0 or start + size > len(frame):
+                return None
+            if self.sessions.pop(i, None) is not None:
+                self.dropped += 1
+            return frame[start:start + size]
+        if pci == N_PCI_FIRST_FRAME:
+            if len(frame) < start + 2:
+                return None
+            size = (low << 8) | frame[start + 1]
+            start += 2
+            if size == 0:
+                if len(frame) < start + 4:
+                    return None
+                size = int.from_bytes(frame[start:start + 4], 'big')
+                start += 4
+            if self.sessions.pop(i, None) is not None:
+                self.dropped += 1
+            if size > self._max_sizes[i]:
+                self.dropped += 1
+                return None
+            session = self.sessions[i] = _Session(size, timestamp)
+            received = min(len(frame) - start, size)
+            session.buffer[:received] = frame[start:start + received]
+            session.received = received
+        return None
+
+    def decode(self, chunk: CanFrameChunk) -> list[DecodedPdu]:
+        """
+        Reassembles the messages of chunk and decodes the SDUs of every connection with a decoder at once.
+        Messages shorter than the signals of their SDU are left out.
+        """
+        by_connection: dict[int, list[CanTpMessage]] = {}
+        for message in self.feed(chunk):
+            by_connection.setdefault(message.connection, []).append(message)
+        result = []
+        for i, messages in by_connection.items():
+            connection = self.connections[i]
+            decoder = connection.decoder
+            if decoder is None:
+                continue
+            required = decoder.required_length
+            messages = [message for message in messages if len(message) >= required]
+            payloads = np.empty((len(messages), required), dtype=np.uint8)
+            for j, message in enumerate(messages):
+                payloads[j] = np.frombuffer(message.data, dtype=np.uint8, count=required)
+            result.append(DecodedPdu(
+                frame=connection.data_id.name,
+                pdu=decoder.name,
+                index=np.array([message.index for message in messages], dtype=np.int64),
+                timestamp=np.array([message.timestamp for message in messages], dtype=np.float64),
+                signals=decoder.decode(payloads),
+            ))
+        return result
+
+    def iter_decode(self, path: str | Path, chunk_size: int = 65536) -> Iterator[list[DecodedPdu]]:
+        """
+        Reads the CAN log at path in chunks of chunk_size frames and yields the decoded SDUs of every chunk
+        """
+        self.reset()
+        for chunk in iter_can_log(path, chunk_size):
+            yield self.decode(chunk)
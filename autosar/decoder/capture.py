@@ -0,0 +1,454 @@
+import ipaddress
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Mapping
+
+import numpy as np
+
+from autosar.decoder.someip import HEADER_SIZE, TP_FLAG, SomeIpDecoder, SomeIpMessages, gather
+from autosar.decoder.someip_tp import ReassembledMessage, SomeIpTpReassembler, concatenate_messages
+from autosar.extractor.common import SomeIpFeature
+from autosar.extractor.system_extractor import ExtractedSystem
+from autosar.misc import HasLogger
+from autosar.model.ecu import EcuInstance
+
+PCAP_MAGIC = 0xa1b2c3d4
+PCAP_NANOSECOND_MAGIC = 0xa1b23c4d
+PCAPNG_SECTION_HEADER = 0x0a0d0d0a
+PCAPNG_BYTE_ORDER_MAGIC = 0x1a2b3c4d
+
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = (12, 14, 101)
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86dd
+_vlan_ethertypes = (0x8100, 0x88a8, 0x9100)
+
+IP_PROTOCOL_TCP = 6
+IP_PROTOCOL_UDP = 17
+
+# Source address of a message as an IPv6 address, IPv4 addresses are IPv4-mapped, and source port
+SOURCE_DTYPE = np.dtype([('address', 'u1', (16,)), ('port', '>u2')])
+_ipv4_mapped_prefix = np.array([0] * 10 + [0xff, 0xff], dtype=np.uint8)
+
+
+@dataclass
+class PacketChunk:
+    """
+    Consecutive packets of a capture file. offset and length locate the captured bytes of each packet in buffer,
+    a uint8 array over the whole memory mapped file. timestamp is NaT for packets without one.
+    """
+    first_packet: int
+    buffer: np.ndarray
+    offset: np.ndarray
+    length: np.ndarray
+    timestamp: np.ndarray
+    link_type: np.ndarray
+
+    def __len__(self):
+        return len(self.offset)
+
+
+@dataclass
+class TransportPayloads:
+    """
+    UDP and TCP payloads of a PacketChunk, payload i is buffer[start[i]:end[i]] of packet packet[i] of the chunk
+    """
+    packet: np.ndarray
+    protocol: np.ndarray
+    source: np.ndarray
+    destination_port: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+
+
+@dataclass
+class DecodedChunk:
+    """
+    SOME/IP messages decoded from one PacketChunk. The index of every SomeIpMessages refers to the per message
+    arrays: the packet number in the file, the capture timestamp and the sending EcuInstance, None if unknown.
+    Messages reassembled from SOME/IP-TP segments follow the unsegmented messages, with packet and timestamp of
+    their last segment.
+    """
+    first_packet: int
+    packets: int
+    messages: dict[SomeIpFeature, SomeIpMessages]
+    packet: np.ndarray
+    timestamp: np.ndarray
+    sender: np.ndarray
+
+
+class CaptureFile(HasLogger):
+    """
+    Reads pcap and pcapng files through a memory map. Packets are read in chunks of chunk_size packets, the arrays
+    of a chunk refer to the captured bytes in the map without copying them.
+    """
+
+    def __init__(self, path: str | Path, chunk_size: int = 65536, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        # (link type, ticks per second) of every interface, pcap files have a single one
+        self._interfaces: list[tuple[int, int]] = []
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(path={str(self.path)!r})'
+
+    def iter_chunks(self) -> Iterator[PacketChunk]:
+        with open(self.path, 'rb') as file:
+            if self.path.stat().st_size == 0:
+                return
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield from self._iter_chunks(data)
+        finally:
+            try:
+                data.close()
+            except BufferError:
+                # Chunks still held by the caller refer to the map, it is closed once they are collected
+                pass
+
+    def _iter_chunks(self, data: mmap.mmap) -> Iterator[PacketChunk]:
+        self._interfaces = []
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        if len(data) < 24:
+            raise ValueError(f'{self.path} is too short for a pcap or pcapng file')
+        magic, = struct.unpack_from('<I', data, 0)
+        if magic == PCAPNG_SECTION_HEADER:
+            records = self._iter_pcapng(data)
+        elif magic in (PCAP_MAGIC, PCAP_NANOSECOND_MAGIC):
+            records = self._iter_pcap(data, buffer, '<', magic)
+        elif struct.unpack_from('>I', data, 0)[0] in (PCAP_MAGIC, PCAP_NANOSECOND_MAGIC):
+            records = self._iter_pcap(data, buffer, '>', struct.unpack_from('>I', data, 0)[0])
+        else:
+            raise ValueError(f'{self.path} is neither a pcap nor a pcapng file')
+        first_packet = 0
+        for offset, length, ticks, interface in records:
+            link_types = np.array([link_type for link_type, _ in self._interfaces], dtype=np.int64)
+            rates = np.array([rate for _, rate in self._interfaces], dtype=np.int64)[interface]
+            # Split into seconds and fraction first, nanoseconds since the epoch overflow int64 when multiplied
+            seconds, fraction = np.divmod(ticks, rates)
+            timestamp = (seconds * 1000000000 + fraction * 1000000000 // rates).astype('M8[ns]')
+            timestamp[ticks < 0] = np.datetime64('NaT')
+            yield PacketChunk(first_packet, buffer, offset, length, timestamp, link_types[interface])
+            first_packet += len(offset)
+
+    def _iter_pcap(self, data: mmap.mmap, buffer: np.ndarray, endian: str, magic: int) -> Iterator[tuple[np.ndarray, ...]]:
+        """
+        Yields offset, length, timestamp in ticks and interface of the packets of a pcap file in chunks.
+        Only the record offsets are found one by one, the record headers of a chunk are read at once.
+        """
+        header = struct.unpack_from(f'{endian}IHHiIII', data, 0)
+        rate = 1000000000 if magic == PCAP_NANOSECOND_MAGIC else 1000000
+        self._interfaces.append((header[6] & 0xffff, rate))
+        unpack = struct.Struct(f'{endian}I').unpack_from
+        size = len(data)
+        offset = 24
+        records = []
+        while True:
+            end_of_file = offset + 16 > size
+            if not end_of_file:
+                length, = unpack(data, offset + 8)
+                if offset + 16 + length > size:
+                    self._logger.warning(f'{self.path}: Last packet is truncated')
+                    end_of_file = True
+                else:
+                    records.append(offset)
+                    offset += 16 + length
+            if len(records) == self.chunk_size or (end_of_file and len(records) > 0):
+                fields = gather(buffer, np.array(records, dtype=np.int64), 16).view(f'{endian}u4').astype(np.int64)
+                yield (
+                    np.array(records, dtype=np.int64) + 16,
+                    fields[:, 2],
+                    fields[:, 0] * rate + fields[:, 1],
+                    np.zeros(len(records), dtype=np.int64),
+                )
+                records = []
+            if end_of_file:
+                return
+
+    def _iter_pcapng(self, data: mmap.mmap) -> Iterator[tuple[np.ndarray, ...]]:
+        """
+        Yields offset, length, timestamp in ticks and interface of the packets of a pcapng file in chunks
+        """
+        size = len(data)
+        offset = 0
+        endian = '<'
+        section_start = 0
+        packets = []
+        while offset + 12 <= size:
+            block_type, = struct.unpack_from(f'{endian}I', data, offset)
+            if block_type == PCAPNG_SECTION_HEADER:
+                byte_order, = struct.unpack_from('<I', data, offset + 8)
+                endian = '<' if byte_order == PCAPNG_BYTE_ORDER_MAGIC else '>'
+                section_start = len(self._interfaces)
+            block_length, = struct.unpack_from(f'{endian}I', data, offset + 4)
+            if block_length < 12 or offset + block_length > size:
+                self._logger.warning(f'{self.path}: Truncated block at offset {offset}')
+                break
+            if block_type == 1:
+                self._interfaces.append(self._interface_description(data, endian, offset, block_length))
+            elif block_type == 6:
+                interface, high, low, length = struct.unpack_from(f'{endian}IIII', data, offset + 8)
+                packets.append((offset + 28, length, (high << 32) | low, section_start + interface))
+            elif block_type == 3:
+                length, = struct.unpack_from(f'{endian}I', data, offset + 8)
+                packets.append((offset + 12, min(length, block_length - 16), -1, section_start))
+            elif block_type == 2:
+                interface, _, high, low, length = struct.unpack_from(f'{endian}HHIII', data, offset + 8)
+                packets.append((offset + 28, length, (high << 32) | low, section_start + interface))
+            offset += block_length
+            if len(packets) == self.chunk_size:
+                yield tuple(np.array(packets, dtype=np.int64).T)
+                packets = []
+        if len(packets) > 0:
+            yield tuple(np.array(packets, dtype=np.int64).T)
+
+    @staticmethod
+    def _interface_description(data: mmap.mmap, endian: str, offset: int, block_length: int) -> tuple[int, int]:
+        link_type, = struct.unpack_from(f'{endian}H', data, offset + 8)
+        rate = 1000000
+        position = offset + 16
+        end = offset + block_length - 4
+        while position + 4 <= end:
+            code, length = struct.unpack_from(f'{endian}HH', data, position)
+            if code == 0:
+                break
+            if code == 9 and length >= 1:
+                resolution = data[position + 4]
+                rate = 2 ** (resolution & 0x7f) if resolution & 0x80 else 10 ** resolution
+            position += 4 + (length + 3) // 4 * 4
+        return link_type, rate
+
+
+def _u8(buffer: np.ndarray, position: np.ndarray) -> np.ndarray:
+    return gather(buffer, position, 1)[:, 0].astype(np.int64)
+
+
+def _u16(buffer: np.ndarray, position: np.ndarray) -> np.ndarray:
+    return gather(buffer, position, 2).view('>u2')[:, 0].astype(np.int64)
+
+
+def _u32(buffer: np.ndarray, position: np.ndarray) -> np.ndarray:
+    return gather(buffer, position, 4).view('>u4')[:, 0].astype(np.int64)
+
+
+def transport_payloads(chunk: PacketChunk) -> TransportPayloads:
+    """
+    Locates the UDP and TCP payloads of the IPv4 and IPv6 packets of chunk. Ethernet with up to two VLAN tags,
+    Linux cooked captures and raw IP are supported. IPv4 fragments and IPv6 extension headers are skipped.
+    """
+    buffer = chunk.buffer
+    start = chunk.offset
+    end = start + chunk.length
+    link_type = chunk.link_type
+    ethertype = np.full(len(chunk), -1, dtype=np.int64)
+    network = start.copy()
+    ethernet = link_type == LINKTYPE_ETHERNET
+    ethertype[ethernet] = _u16(buffer, start[ethernet] + 12)
+    network[ethernet] += 14
+    for _ in range(2):
+        vlan = ethernet & np.isin(ethertype, _vlan_ethertypes)
+        ethertype[vlan] = _u16(buffer, network[vlan] + 2)
+        network[vlan] += 4
+    sll = link_type == LINKTYPE_LINUX_SLL
+    ethertype[sll] = _u16(buffer, start[sll] + 14)
+    network[sll] += 16
+    sll2 = link_type == LINKTYPE_LINUX_SLL2
+    ethertype[sll2] = _u16(buffer, start[sll2])
+    network[sll2] += 20
+    raw = np.isin(link_type, LINKTYPE_RAW + (LINKTYPE_IPV4, LINKTYPE_IPV6))
+    version = _u8(buffer, start[raw]) >> 4
+    ethertype[raw] = np.where(version == 4, ETHERTYPE_IPV4, np.where(version == 6, ETHERTYPE_IPV6, -1))
+
+    first = _u8(buffer, network)
+    ipv4 = (ethertype == ETHERTYPE_IPV4) & (first >> 4 == 4)
+    ipv6 = (ethertype == ETHERTYPE_IPV6) & (first >> 4 == 6)
+    fragment = ipv4 & (_u16(buffer, network + 6) & 0x3fff != 0)
+    protocol = np.where(ipv4, _u8(buffer, network + 9), _u8(buffer, network + 6))
+    transport = np.where(ipv4, network + (first & 0xf) * 4, network + 40)
+    network_end = np.where(ipv4, network + _u16(buffer, network + 2), transport + _u16(buffer, network + 4))
+    udp = protocol == IP_PROTOCOL_UDP
+    tcp = protocol == IP_PROTOCOL_TCP
+    payload = np.where(udp, transport + 8, transport + (_u8(buffer, transport + 12) >> 4) * 4)
+    payload_end = np.minimum(np.where(udp, transport + _u16(buffer, transport + 4), network_end), np.minimum(network_end, end))
+    valid = (ipv4 | ipv6) & ~fragment & (udp | tcp) & (transport + 8 <= end) & (payload <= payload_end)
+
+    packet = np.flatnonzero(valid)
+    ipv4 = ipv4[packet]
+    network = network[packet]
+    transport = transport[packet]
+    address = gather(buffer, network + 8, 16)
+    address[ipv4, :12] = _ipv4_mapped_prefix
+    address[ipv4, 12:] = gather(buffer, network[ipv4] + 12, 4)
+    source = np.empty(len(packet), dtype=SOURCE_DTYPE)
+    source['address'] = address
+    source['port'] = _u16(buffer, transport)
+    return TransportPayloads(
+        packet=packet,
+        protocol=protocol[packet],
+        source=source,
+        destination_port=_u16(buffer, transport + 2),
+        start=payload[packet],
+        end=payload_end[packet],
+    )
+
+
+def split_some_ip(buffer: np.ndarray, start: np.ndarray, end: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Splits the payloads buffer[start[i]:end[i]] into the SOME/IP messages they hold back to back.
+    Returns the start and end of every message and the index of its payload, ordered by position in buffer.
+    A payload ends at the first message that does not fit, SOME/IP over TCP is therefore only decoded as long as
+    messages are not split across segments.
+    """
+    starts, ends, payloads = [], [], []
+    position = start
+    index = np.arange(len(start))
+    active = position + HEADER_SIZE <= end
+    while active.any():
+        position, end, index = position[active], end[active], index[active]
+        length = _u32(buffer, position + 4)
+        message_end = position + 8 + length
+        fits = (length >= 8) & (message_end <= end)
+        starts.append(position[fits])
+        ends.append(message_end[fits])
+        payloads.append(index[fits])
+        position = message_end
+        active = fits & (position + HEADER_SIZE <= end)
+    if len(starts) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    starts, ends, payloads = np.concatenate(starts), np.concatenate(ends), np.concatenate(payloads)
+    order = np.argsort(starts, kind='stable')
+    return starts[order], ends[order], payloads[order]
+
+
+class CapturePipeline(HasLogger):
+    """
+    Decodes the SOME/IP messages in pcap and pcapng files with the mappings of an ExtractedSystem.
+    Senders are attributed to EcuInstances by their source address and port through ecu_mapping.
+    Files are processed in chunks of chunk_size packets, every chunk is decoded into one DecodedChunk,
+    memory use is therefore bounded by the chunk size and not by the file size.
+    With a reassembler SOME/IP-TP segments are reassembled across chunks and decoded once complete.
+    """
+
+    def __init__(
+            self,
+            some_ip_mapping: Mapping,
+            ecu_mapping: Mapping[str, EcuInstance],
+            chunk_size: int = 65536,
+            reassembler: SomeIpTpReassembler | None = None,
+            *args, **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.decoder = SomeIpDecoder(some_ip_mapping)
+        self.chunk_size = chunk_size
+        self.reassembler = reassembler
+        self._ecus: dict[tuple[bytes, int], EcuInstance] = {}
+        for source, ecu in ecu_mapping.items():
+            key = self._parse_source(source)
+            if key is None:
+                self._logger.warning(f'Cannot parse source address {source} of {ecu.name}')
+                continue
+            self._ecus[key] = ecu
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(layouts={len(self.decoder.layouts)}, ecus={len(self._ecus)})'
+
+    @classmethod
+    def from_extracted_system(cls, extracted_system: ExtractedSystem, chunk_size: int = 65536) -> 'CapturePipeline':
+        reassembler = None
+        if len(extracted_system.some_ip_tp_mapping) > 0:
+            reassembler = SomeIpTpReassembler.from_extracted_system(extracted_system)
+        return cls(extracted_system.some_ip_mapping, extracted_system.ecu_mapping, chunk_size, reassembler)
+
+    @staticmethod
+    def _parse_source(source: str) -> tuple[bytes, int] | None:
+        address, _, port = source.rpartition(':')
+        try:
+            address = ipaddress.ip_address(address.strip('[]'))
+            port = int(port)
+        except ValueError:
+            return None
+        if isinstance(address, ipaddress.IPv4Address):
+            address = ipaddress.IPv6Address(f'::ffff:{address}')
+        return address.packed, port
+
+    def iter_chunks(self, path: str | Path) -> Iterator[DecodedChunk]:
+        if self.reassembler is not None:
+            self.reassembler.reset()
+        for chunk in CaptureFile(path, self.chunk_size).iter_chunks():
+            yield self.decode_chunk(chunk)
+
+    def decode_chunk(self, chunk: PacketChunk) -> DecodedChunk:
+        payloads = transport_payloads(chunk)
+        starts, ends, payload = split_some_ip(chunk.buffer, payloads.start, payloads.end)
+        packet = payloads.packet[payload]
+        timestamp = chunk.timestamp[packet]
+        source = payloads.source[payload]
+        messages = self.decoder.decode(chunk.buffer, starts, ends)
+        if self.reassembler is not None:
+            segmented = np.flatnonzero(_u8(chunk.buffer, starts + 14) & TP_FLAG)
+            reassembled = self.reassembler.feed(
+                chunk.buffer, starts[segmented], ends[segmented], timestamp[segmented], source[segmented],
+            )
+            if len(reassembled) > 0:
+                last_segment = segmented[[message.index for message in reassembled]]
+                self._decode_reassembled(reassembled, len(packet), messages)
+                packet = np.concatenate([packet, packet[last_segment]])
+                timestamp = np.concatenate([timestamp, timestamp[last_segment]])
+                source = np.concatenate([source, source[last_segment]])
+        return DecodedChunk(
+            first_packet=chunk.first_packet,
+            packets=len(chunk),
+            messages=messages,
+            packet=chunk.first_packet + packet,
+            timestamp=timestamp,
+            sender=self._senders(source),
+        )
+
+    def _decode_reassembled(
+            self,
+            reassembled: list[ReassembledMessage],
+            first_index: int,
+            messages: dict[SomeIpFeature, SomeIpMessages],
+    ):
+        """
+        Decodes every reassembled message straight from its reassembly buffer and adds it to messages,
+        numbered from first_index on
+        """
+        parts: dict[SomeIpFeature, list[SomeIpMessages]] = {}
+        for i, message in enumerate(reassembled):
+            for key, decoded in self.decoder.decode(message.array(), np.zeros(1, dtype=np.int64)).items():
+                decoded.index = decoded.index + first_index + i
+                parts.setdefault(key, [messages[key]] if key in messages else []).append(decoded)
+        for key, items in parts.items():
+            messages[key] = concatenate_messages(items)
+
+    def _senders(self, source: np.ndarray) -> np.ndarray:
+        """
+        Looks up every distinct source once, sources are grouped by sorting the address as two 64-bit words
+        """
+        if len(source) == 0:
+            return np.empty(0, dtype=object)
+        words = np.ascontiguousarray(source['address']).view('>u8')
+        port = source['port']
+        order = np.lexsort((port, words[:, 1], words[:, 0]))
+        sorted_source = source[order]
+        sorted_words = words[order]
+        new = np.ones(len(order), dtype=bool)
+        new[1:] = (np.diff(sorted_words, axis=0) != 0).any(axis=1) | (np.diff(sorted_source['port']) != 0)
+        group = np.cumsum(new) - 1
+        unique_sources = sorted_source[new]
+        senders = np.empty(len(unique_sources), dtype=object)
+        for i, item in enumerate(unique_sources):
+            senders[i] = self._ecus.get((bytes(item['address']), int(item['port'])))
+        inverse = np.empty(len(order), dtype=np.int64)
+        inverse[order] = group
+        return senders[inverse]
@@ -0,0 +1,251 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from autosar.decoder.pdu import PduDecoder
+from autosar.decoder.someip import gather
+from autosar.misc import HasLogger
+from autosar.model.communication_cluster import PduTriggering
+from autosar.model.ethernet_cluster import PduTriggering as EthernetPduTriggering
+from autosar.model.pdu import ContainedIPduProps, ContainerIPdu, IPdu, ISignalIPdu
+
+SHORT_HEADER = 'SHORT-HEADER'
+LONG_HEADER = 'LONG-HEADER'
+NO_HEADER = 'NO-HEADER'
+# Short headers hold a 24-bit ID and an 8-bit length, long headers a 32-bit ID and a 32-bit length
+SHORT_HEADER_SIZE = 4
+LONG_HEADER_SIZE = 8
+
+
+@dataclass(frozen=True)
+class ContainedPduLayout:
+    """
+    A PDU that can be sent in a container: the header ID announcing it, its byte offset in containers without
+    header, the bit set in the container when it was updated, its length and the decoder of its signals
+    """
+    name: str
+    header_id: int | None = None
+    offset: int = 0
+    update_indication_bit_position: int | None = None
+    length: int | None = None
+    decoder: PduDecoder | None = None
+
+
+@dataclass
+class ContainedPdus:
+    """
+    Instances of one contained PDU in a batch of containers: instance i was found in container container[i], its
+    bytes are buffer[start[i]:start[i] + length[i]] of the buffer the containers were split from
+    """
+    layout: ContainedPduLayout
+    container: np.ndarray
+    start: np.ndarray
+    length: np.ndarray
+
+    def __len__(self):
+        return len(self.container)
+
+    def views(self, buffer: np.ndarray) -> list[np.ndarray]:
+        """
+        Returns the bytes of every instance as a view of buffer
+        """
+        return [buffer[start:start + length] for start, length in zip(self.start.tolist(), self.length.tolist())]
+
+
+@dataclass
+class DecodedContainedPdu:
+    """
+    Signals of one contained PDU decoded from the containers container of a batch
+    """
+    pdu: str
+    container: np.ndarray
+    signals: dict[str, np.ndarray]
+
+
+def _triggered_pdu_ref(triggering) -> str | None:
+    if isinstance(triggering, PduTriggering):
+        return triggering.i_pdu_ref
+    if isinstance(triggering, EthernetPduTriggering):
+        return triggering.i_signal_ref
+    return None
+
+
+class ContainerDemultiplexer(HasLogger):
+    """
+    Splits batches of payloads of one ContainerIPdu into its contained PDUs. With short or long headers the headers
+    of all containers are read together, one contained PDU per container at a time, and every instance is located
+    by its container and byte range in the original buffer without copying. Instances of unknown header IDs are left
+    out, a container ends at a header ID of 0 or at the first contained PDU that does not fit. Without headers every
+    contained PDU has a fixed offset, and is present unless it has an update indication bit that is not set.
+    """
+
+    def __init__(self, name: str, header_type: str, contained: Iterable[ContainedPduLayout], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if header_type not in (SHORT_HEADER, LONG_HEADER, NO_HEADER):
+            raise ValueError(f'Unsupported container header type {header_type}')
+        self.name = name
+        self.header_type = header_type
+        self.contained = tuple(contained)
+        if header_type != NO_HEADER:
+            headers = {}
+            for i, layout in enumerate(self.contained):
+                if layout.header_id is None:
+                    self._logger.warning(f'{name}: Contained PDU {layout.name} has no {header_type.lower()} ID')
+                    continue
+                headers.setdefault(layout.header_id, i)
+            self._header_ids = np.array(sorted(headers), dtype=np.int64)
+            self._header_layouts = np.array([headers[key] for key in sorted(headers)], dtype=np.int64)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(name={self.name!r}, header_type={self.header_type}, contained={len(self.contained)})'
+
+    @classmethod
+    def from_container_i_pdu(cls, container: ContainerIPdu) -> 'ContainerDemultiplexer':
+        """
+        Resolves the contained PDU triggerings of container, with the header IDs and offsets of the container's
+        ContainedIPduProps or otherwise of the contained PDU's own, and compiles a PduDecoder for every ISignalIPdu
+        """
+        ws = container.root_ws()
+        props = container.contained_i_pdu_triggering_props
+        if isinstance(props, ContainedIPduProps):
+            props = [props]
+        triggering_props = {p.contained_pdu_triggering_ref: p for p in props if p.contained_pdu_triggering_ref is not None}
+        refs = list(container.contained_pdu_triggering_refs)
+        refs.extend(ref for ref in triggering_props if ref not in refs)
+        header_type = container.header_type or NO_HEADER
+        layouts = []
+        for ref in refs:
+            triggering = ws.find(ref)
+            pdu_ref = _triggered_pdu_ref(triggering)
+            pdu = None if pdu_ref is None else ws.find(pdu_ref)
+            if not isinstance(pdu, IPdu):
+                cls._logger.warning(f'{container.name}: Cannot find the PDU of contained PDU triggering {ref}')
+                continue
+            pdu_props = triggering_props.get(ref, pdu.contained_i_pdu_props)
+            if pdu_props is None:
+                cls._logger.warning(f'{container.name}: Contained PDU {pdu.name} has no ContainedIPduProps')
+                continue
+            header_id = pdu_props.header_id_long_header if header_type == LONG_HEADER else pdu_props.header_id_short_header
+            layouts.append(ContainedPduLayout(
+                name=pdu.name,
+                header_id=header_id,
+                offset=pdu_props.offset,
+                update_indication_bit_position=pdu_props.update_indication_bit_position,
+                length=pdu.length,
+                decoder=PduDecoder.from_i_signal_i_pdu(pdu) if isinstance(pdu, ISignalIPdu) else None,
+            ))
+        return cls(container.name, header_type, layouts)
+
+    def split(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> list[ContainedPdus]:
+        """
+        Splits the containers buffer[starts[i]:ends[i]] and returns the instances of every contained PDU found
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if self.header_type == NO_HEADER:
+            return self._split_static(buffer, starts, ends)
+        if len(self._header_ids) == 0:
+            return []
+        size = SHORT_HEADER_SIZE if self.header_type == SHORT_HEADER else LONG_HEADER_SIZE
+        containers, positions, header_ids, lengths = [], [], [], []
+        container = np.arange(len(starts))
+        position = starts
+        active = position + size <= ends
+        while active.any():
+            container = container[active]
+            position = position[active]
+            end = ends[container]
+            header = gather(buffer, position, size)
+            if size == SHORT_HEADER_SIZE:
+                header_id = (header[:, :3].astype(np.int64) << np.array([16, 8, 0])).sum(axis=1)
+                length = header[:, 3].astype(np.int64)
+            else:
+                header_id = header[:, :4].view('>u4')[:, 0].astype(np.int64)
+                length = header[:, 4:].view('>u4')[:, 0].astype(np.int64)
+            position = position + size
+            fits = (header_id != 0) & (position + length <= end)
+            containers.append(container[fits])
+            positions.append(position[fits])
+            header_ids.append(header_id[fits])
+            lengths.append(length[fits])
+            position = position + length
+            active = fits & (position + size <= end)
+        if len(containers) == 0:
+            return []
+        container = np.concatenate(containers)
+        position = np.concatenate(positions)
+        header_id = np.concatenate(header_ids)
+        length = np.concatenate(lengths)
+        found = np.minimum(np.searchsorted(self._header_ids, header_id), len(self._header_ids) - 1)
+        known = self._header_ids[found] == header_id
+        layout = self._header_layouts[found[known]]
+        container, position, length = container[known], position[known], length[known]
+        # Group by contained PDU, in the order of the containers and their position within them
+        order = np.lexsort((position, container, layout))
+        bounds = np.zeros(len(self.contained) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(layout, minlength=len(self.contained)), out=bounds[1:])
+        result = []
+        for i, contained in enumerate(self.contained):
+            if bounds[i] == bounds[i + 1]:
+                continue
+            index = order[bounds[i]:bounds[i + 1]]
+            result.append(ContainedPdus(contained, container[index], position[index], length[index]))
+        return result
+
+    def _split_static(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> list[ContainedPdus]:
+        result = []
+        for contained in self.contained:
+            if contained.length is None:
+                continue
+            present = starts + contained.offset + contained.length <= ends
+            if contained.update_indication_bit_position is not None:
+                byte, bit = divmod(contained.update_indication_bit_position, 8)
+                present &= starts + byte < ends
+                present &= (gather(buffer, starts + byte, 1)[:, 0] >> bit) & 1 == 1
+            container = np.flatnonzero(present)
+            length = np.full(len(container), contained.length, dtype=np.int64)
+            result.append(ContainedPdus(contained, container, starts[container] + contained.offset, length))
+        return result
+
+    def split_rows(self, payloads: np.ndarray, lengths: np.ndarray | None = None) -> list[ContainedPdus]:
+        """
+        Splits the rows of an N x length uint8 array, lengths gives the number of valid bytes of every row
+        """
+        rows, width = payloads.shape
+        starts = np.arange(rows, dtype=np.int64) * width
+        ends = starts + (width if lengths is None else np.minimum(np.asarray(lengths, dtype=np.int64), width))
+        return self.split(np.ascontiguousarray(payloads).reshape(-1), starts, ends)
+
+    def static_views(self, payloads: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Returns the columns of every contained PDU of containers without header as views of the N x length array
+        payloads, without regard to update indication bits
+        """
+        if self.header_type != NO_HEADER:
+            raise ValueError(f'{self.name}: Containers with {self.header_type.lower()} have no fixed layout')
+        return {
+            contained.name: payloads[:, contained.offset:contained.offset + contained.length]
+            for contained in self.contained
+            if contained.length is not None and contained.offset + contained.length <= payloads.shape[1]
+        }
+
+    def decode(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> list[DecodedContainedPdu]:
+        """
+        Splits the containers and decodes every contained PDU with a decoder over all its instances at once.
+        Instances shorter than the signals of their PDU are left out.
+        """
+        result = []
+        for instances in self.split(buffer, starts, ends):
+            decoder = instances.layout.decoder
+            if decoder is None:
+                continue
+            covered = instances.length >= decoder.required_length
+            if not covered.all():
+                self._logger.debug(f'{self.name}: {int((~covered).sum())} instances too short for PDU {decoder.name}')
+            result.append(DecodedContainedPdu(
+                pdu=decoder.name,
+                container=instances.container[covered],
+                signals=decoder.decode(gather(buffer, instances.start[covered], decoder.required_length)),
+            ))
+        return result
@@ -0,0 +1,330 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from autosar.extractor.common import DataType
+from autosar.extractor.e2e import e2e_profiles
+from autosar.misc import HasLogger
+from autosar.model.signal import EndToEndTransformationISignalProps, ISignal
+from autosar.model.transformation import EndToEndTransformationDescription, TransformationTechnology
+
+# Check status values as in E2E_PXXCheckStatusType
+STATUS_OK = 0x00
+STATUS_ERROR = 0x07
+STATUS_REPEATED = 0x08
+STATUS_OK_SOME_LOST = 0x20
+STATUS_WRONG_SEQUENCE = 0x40
+
+
+def _crc_table(width: int, polynomial: int, reflected: bool) -> np.ndarray:
+    """
+    Returns the 256 entry lookup table of a CRC, for reflected CRCs polynomial is the reflected polynomial
+    """
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    table = []
+    for byte in range(256):
+        if reflected:
+            crc = byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ polynomial if crc & 1 else crc >> 1
+        else:
+            crc = byte << (width - 8)
+            for _ in range(8):
+                crc = ((crc << 1) ^ polynomial if crc & top else crc << 1) & mask
+        table.append(crc)
+    return np.array(table, dtype=f'u{max(width // 8, 2)}')
+
+
+@dataclass(frozen=True)
+class Crc:
+    """
+    Table driven CRC computed over all messages of a batch at once, one byte position at a time
+    """
+    width: int
+    table: np.ndarray
+    initial: int
+    final_xor: int
+    reflected: bool
+
+    @classmethod
+    def create(cls, width: int, polynomial: int, initial: int, final_xor: int, reflected: bool) -> 'Crc':
+        return cls(width, _crc_table(width, polynomial, reflected), initial, final_xor, reflected)
+
+    def start(self, n: int) -> np.ndarray:
+        return np.full(n, self.initial, dtype=self.table.dtype)
+
+    def update(self, crc: np.ndarray, data: np.ndarray) -> np.ndarray:
+        """
+        Feeds one byte per message, data holds the bytes as a uint8 array or a single int
+        """
+        dtype = self.table.dtype
+        if self.reflected:
+            return self.table[(crc ^ np.asarray(data, dtype=dtype)) & 0xff] ^ (crc >> dtype.type(8))
+        shift = dtype.type(self.width - 8)
+        mask = dtype.type((1 << self.width) - 1)
+        return ((crc << dtype.type(8)) & mask) ^ self.table[((crc >> shift) ^ np.asarray(data, dtype=dtype)) & 0xff]
+
+    def finish(self, crc: np.ndarray) -> np.ndarray:
+        return crc ^ self.table.dtype.type(self.final_xor)
+
+
+# CRC-16/CCITT-FALSE, CRC-32P4 and CRC-64/ECMA-182 as used by the E2E profiles 5, 4 and 7
+CRC16 = Crc.create(16, 0x1021, 0xffff, 0x0000, reflected=False)
+CRC32P4 = Crc.create(32, 0xc8df352f, 0xffffffff, 0xffffffff, reflected=True)
+CRC64 = Crc.create(64, 0xc96c5795d7870f42, 0xffffffffffffffff, 0xffffffffffffffff, reflected=True)
+
+
+@dataclass(frozen=True)
+class E2EProfile:
+    """
+    Header layout of an E2E profile, positions in bytes relative to the header offset. Fields a profile does
+    not transmit have no position. The data ID of profile 5 is not transmitted but fed into the CRC last,
+    low byte first.
+    """
+    name: str
+    header_size: int
+    crc: Crc
+    crc_position: int
+    crc_dtype: str
+    counter_position: int
+    counter_dtype: str
+    length_position: int | None = None
+    length_dtype: str | None = None
+    data_id_position: int | None = None
+    data_id_dtype: str | None = None
+
+    @property
+    def counter_modulus(self) -> int:
+        return 1 << (8 * np.dtype(self.counter_dtype).itemsize)
+
+    @classmethod
+    def from_fields(cls, name: str, fields: dict[str, DataType], crc: Crc) -> 'E2EProfile':
+        """
+        Lays out the header fields of an e2e_profiles entry one after the other in the given order
+        """
+        positions = {}
+        dtypes = {}
+        position = 0
+        for field_name, data_type in fields.items():
+            positions[field_name] = position
+            dtypes[field_name] = data_type.dtype
+            position += np.dtype(data_type.dtype).itemsize
+        return cls(
+            name=name,
+            header_size=position,
+            crc=crc,
+            crc_position=positions['E2E_crc'],
+            crc_dtype=dtypes['E2E_crc'],
+            counter_position=positions['E2E_counter'],
+            counter_dtype=dtypes['E2E_counter'],
+            length_position=positions.get('E2E_length'),
+            length_dtype=dtypes.get('E2E_length'),
+            data_id_position=positions.get('E2E_data_id'),
+            data_id_dtype=dtypes.get('E2E_data_id'),
+        )
+
+
+profile_crcs = {
+    'PROFILE_04': CRC32P4,
+    'PROFILE_05': CRC16,
+    'PROFILE_07': CRC64,
+}
+# Derived from the header fields the extractor adds to the data types of E2E protected data elements
+profile_layouts = {name: E2EProfile.from_fields(name, e2e_profiles[name], crc) for name, crc in profile_crcs.items()}
+
+
+def _read(buffer: np.ndarray, position: np.ndarray, dtype: str) -> np.ndarray:
+    dtype = np.dtype(dtype)
+    index = position[:, np.newaxis] + np.arange(dtype.itemsize)
+    np.minimum(index, len(buffer) - 1, out=index)
+    return buffer[index].view(dtype)[:, 0].astype(dtype.newbyteorder('='))
+
+
+class E2EChecker(HasLogger):
+    """
+    Checks batches of messages protected with E2E profile 4, 5 or 7 of one data element, in the order they were
+    received. CRC, data ID and length are checked for every message, the counter against the last message that
+    passed these checks, also across batches. Returns one status per message: STATUS_OK, STATUS_OK_SOME_LOST
+    if less than max_delta_counter messages were lost, STATUS_REPEATED, STATUS_WRONG_SEQUENCE or STATUS_ERROR.
+    offset is the byte position of the E2E header in the message. min_length and max_length limit the message
+    length in bytes, profile 5 messages have a fixed length given as both.
+    """
+
+    def __init__(
+            self,
+            profile: str,
+            data_id: int,
+            offset: int = 0,
+            max_delta_counter: int = 1,
+            min_length: int | None = None,
+            max_length: int | None = None,
+            *args, **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if profile not in profile_layouts:
+            raise ValueError(f'Unsupported E2E profile {profile}')
+        self.profile = profile_layouts[profile]
+        self.data_id = data_id
+        self.offset = offset
+        self.max_delta_counter = max_delta_counter
+        self.min_length = min_length
+        self.max_length = max_length
+        self.counter: int | None = None
+        self.reset()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(profile={self.profile.name}, data_id={self.data_id}, offset={self.offset})'
+
+    def reset(self):
+        """
+        Returns to the initial state, the next counter is then expected to be 0
+        """
+        self.counter = self.profile.counter_modulus - 1
+
+    @classmethod
+    def from_description(
+            cls,
+            description: EndToEndTransformationDescription,
+            props: EndToEndTransformationISignalProps,
+    ) -> 'E2EChecker':
+        """
+        Builds the checker from the E2E transformer configuration and the signal specific data ID and lengths,
+        raises ValueError for unsupported profiles and incomplete configurations. The CRC and counter are
+        expected at their profile's positions, window sizes are not evaluated, other values are warned about.
+        """
+        if len(props.data_ids) == 0:
+            raise ValueError(f'No data ID for {description.profile_name}')
+        offset = description.offset or 0
+        if offset % 8 != 0:
+            raise ValueError(f'E2E header offset of {offset} bits is not byte aligned')
+        cls._check_description(description, offset)
+        min_length = props.min_data_length
+        max_length = props.max_data_length
+        if description.profile_name == 'PROFILE_05' and props.data_length > 0:
+            min_length = max_length = props.data_length
+        return cls(
+            profile=description.profile_name,
+            data_id=props.data_ids[0],
+            offset=offset // 8,
+            max_delta_counter=description.max_delta_counter or 1,
+            min_length=None if min_length is None else min_length // 8,
+            max_length=None if max_length is None else max_length // 8,
+        )
+
+    @classmethod
+    def _check_description(cls, description: EndToEndTransformationDescription, offset: int):
+        """
+        Warns about the settings of description the checker does not honor
+        """
+        profile = profile_layouts.get(description.profile_name)
+        if profile is None:
+            return
+        expected = {
+            'crc_offset': offset + 8 * profile.crc_position,
+            'counter_offset': offset + 8 * profile.counter_position,
+        }
+        for attribute, value in expected.items():
+            configured = getattr(description, attribute)
+            if configured is not None and configured != value:
+                cls._logger.warning(f'{profile.name}: Ignoring {attribute} of {configured} bits, '
+                                    f'the profile places the field at bit {value}')
+        window_sizes = (description.window_size_init, description.window_size_invalid, description.window_size_valid)
+        if any(size is not None for size in window_sizes):
+            cls._logger.warning(f'{profile.name}: Ignoring window sizes, the E2E state machine is not evaluated')
+
+    @classmethod
+    def from_i_signal(cls, signal: ISignal) -> 'E2EChecker | None':
+        """
+        Builds the checker for a signal transformed by an E2E transformer, None if it is not protected
+        """
+        ws = signal.root_ws()
+        for variants in signal.transformation_i_signal_props:
+            props = variants.single
+            if not isinstance(props, EndToEndTransformationISignalProps):
+                continue
+            transformer = ws.find(props.transformer_ref)
+            if not isinstance(transformer, TransformationTechnology):
+                cls._logger.warning(f'Signal {signal.name}: Cannot find transformer {props.transformer_ref}')
+                continue
+            for description in transformer.transformation_descriptions:
+                if isinstance(description, EndToEndTransformationDescription):
+                    return cls.from_description(description, props)
+        return None
+
+    def check_rows(self, messages: np.ndarray) -> np.ndarray:
+        """
+        Checks the rows of an N x length uint8 array of equally long messages
+        """
+        rows, width = messages.shape
+        starts = np.arange(rows, dtype=np.int64) * width
+        return self.check(np.ascontiguousarray(messages).reshape(-1), starts, starts + width)
+
+    def check(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Checks the messages buffer[starts[i]:ends[i]] and returns their status as a uint8 array
+        """
+        profile = self.profile
+        starts = np.asarray(starts, dtype=np.int64)
+        length = np.asarray(ends, dtype=np.int64) - starts
+        header = starts + self.offset
+        error = length < self.offset + profile.header_size
+        if self.min_length is not None:
+            error |= length < self.min_length
+        if self.max_length is not None:
+            error |= length > self.max_length
+        if len(buffer) == 0:
+            return np.full(len(starts), STATUS_ERROR, dtype=np.uint8)
+        if profile.length_position is not None:
+            error |= _read(buffer, header + profile.length_position, profile.length_dtype) != length
+        if profile.data_id_position is not None:
+            error |= _read(buffer, header + profile.data_id_position, profile.data_id_dtype) != self.data_id
+        received = _read(buffer, header + profile.crc_position, profile.crc_dtype)
+        error |= self._compute_crc(buffer, starts, length, ~error) != received
+        counter = _read(buffer, header + profile.counter_position, profile.counter_dtype).astype(np.int64)
+        return self._check_counter(counter, ~error)
+
+    def _compute_crc(self, buffer: np.ndarray, starts: np.ndarray, length: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Computes the CRC over every message without its CRC field, only for rows, other messages get 0
+        """
+        profile = self.profile
+        crc = profile.crc
+        result = np.zeros(len(starts), dtype=crc.table.dtype)
+        rows = np.flatnonzero(rows)
+        if len(rows) == 0:
+            return result
+        # Longest messages first, at byte position j the messages still running are a prefix
+        rows = rows[np.argsort(-length[rows], kind='stable')]
+        row_starts = starts[rows]
+        remaining = -length[rows]
+        skipped = range(self.offset + profile.crc_position, self.offset + profile.crc_position + profile.crc.width // 8)
+        value = crc.start(len(rows))
+        for j in range(int(-remaining[0])):
+            if j in skipped:
+                continue
+            running = np.searchsorted(remaining, -j, side='left')
+            value[:running] = crc.update(value[:running], buffer[row_starts[:running] + j])
+        if profile.data_id_position is None:
+            value = crc.update(value, self.data_id & 0xff)
+            value = crc.update(value, (self.data_id >> 8) & 0xff)
+        result[rows] = crc.finish(value)
+        return result
+
+    def _check_counter(self, counter: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        n = len(counter)
+        # Every message is compared with the last valid message before it, or with the state of the last batch
+        last_valid = np.maximum.accumulate(np.where(valid, np.arange(n), -1))
+        previous_index = np.empty(n, dtype=np.int64)
+        previous_index[:1] = -1
+        previous_index[1:] = last_valid[:-1]
+        previous = np.where(previous_index >= 0, counter[np.maximum(previous_index, 0)], self.counter)
+        delta = (counter - previous) % self.profile.counter_modulus
+        status = np.full(n, STATUS_WRONG_SEQUENCE, dtype=np.uint8)
+        status[delta <= self.max_delta_counter] = STATUS_OK_SOME_LOST
+        status[delta == 1] = STATUS_OK
+        status[delta == 0] = STATUS_REPEATED
+        status[~valid] = STATUS_ERROR
+        if n > 0 and last_valid[-1] >= 0:
+            self.counter = int(counter[last_valid[-1]])
+        return status
@@ -0,0 +1,275 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+import numpy as np
+
+from autosar.misc import HasLogger
+from autosar.model.datatype import SwBaseType
+from autosar.model.pdu import ISignalIPdu
+from autosar.model.signal import ISignal
+
+LITTLE_ENDIAN = 'MOST-SIGNIFICANT-BYTE-LAST'
+BIG_ENDIAN = 'MOST-SIGNIFICANT-BYTE-FIRST'
+OPAQUE = 'OPAQUE'
+
+_integer_encodings = ('NONE', 'BOOLEAN', '2C', '1C', 'SM')
+
+
+@dataclass(frozen=True, slots=True)
+class SignalLayout:
+    """
+    Position of a signal in a PDU as given by ISignalToIPduMapping.
+    start_position counts bits from bit 0 of byte 0 upwards within each byte, it is the least significant bit
+    of little endian (MOST-SIGNIFICANT-BYTE-LAST) and the most significant bit of big endian
+    (MOST-SIGNIFICANT-BYTE-FIRST) signals. encoding is a SwBaseType encoding, IEEE754 for floats.
+    OPAQUE signals and signals longer than 64 bits must be byte aligned and are decoded into rows of bytes.
+    """
+    name: str
+    start_position: int
+    length: int
+    byte_order: str = LITTLE_ENDIAN
+    encoding: str = 'NONE'
+    update_indication_bit_position: int | None = None
+
+    @property
+    def is_opaque(self) -> bool:
+        return self.byte_order == OPAQUE or self.length > 64
+
+    @property
+    def first_bit(self) -> int:
+        """
+        Offset of the first bit of the signal when the PDU is read as a big endian bit string
+        """
+        if self.byte_order == BIG_ENDIAN and not self.is_opaque:
+            return self.start_position // 8 * 8 + 7 - self.start_position % 8
+        return self.start_position
+
+    @property
+    def end_byte(self) -> int:
+        """
+        Index of the byte following the last byte the signal occupies
+        """
+        if self.byte_order == BIG_ENDIAN and not self.is_opaque:
+            return (self.first_bit + self.length + 7) // 8
+        return (self.start_position + self.length + 7) // 8
+
+
+class PduDecoder(HasLogger):
+    """
+    Decodes batches of PDU payloads, given as an N x length uint8 array, into one array of N values per signal.
+    The bit layout of every signal is compiled into a few shift and mask operations on 64-bit words once,
+    decoding runs these over all rows at a time.
+    """
+
+    def __init__(self, name: str, length: int, signals: Iterable[SignalLayout], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = name
+        self.length = length
+        self.signals = tuple(signals)
+        self.required_length = max((signal.end_byte for signal in self.signals), default=0)
+        for signal in self.signals:
+            if signal.update_indication_bit_position is not None:
+                self.required_length = max(self.required_length, signal.update_indication_bit_position // 8 + 1)
+        self._decoders = tuple((signal.name, _compile_signal(signal)) for signal in self.signals)
+        self._update_bits = tuple(
+            (signal.name, divmod(signal.update_indication_bit_position, 8))
+            for signal in self.signals
+            if signal.update_indication_bit_position is not None
+        )
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(name={self.name!r}, length={self.length}, signals={len(self.signals)})'
+
+    @classmethod
+    def from_i_signal_i_pdu(cls, pdu: ISignalIPdu) -> 'PduDecoder':
+        """
+        Builds the decoder from the ISignalToIPduMapping entries of pdu, the signals and their base types are
+        looked up in the workspace of pdu. Mappings of signal groups and signals that cannot be decoded are skipped.
+        """
+        ws = pdu.root_ws()
+        signals = []
+        for mapping in pdu.i_signal_to_pdu_mappings:
+            if mapping.i_signal_ref is None:
+                continue
+            signal = None if ws is None else ws.find(mapping.i_signal_ref)
+            if not isinstance(signal, ISignal):
+                cls._logger.warning(f'PDU {pdu.name}: Cannot find signal {mapping.i_signal_ref}')
+                continue
+            if signal.length is None:
+                cls._logger.warning(f'PDU {pdu.name}: Signal {signal.name} has no length, skipping')
+                continue
+            if mapping.start_position is None:
+                cls._logger.warning(f'PDU {pdu.name}: Signal {signal.name} has no start position, skipping')
+                continue
+            byte_order = mapping.packing_byte_order
+            if byte_order is None:
+                byte_order = LITTLE_ENDIAN
+            layout = SignalLayout(
+                name=signal.name,
+                start_position=mapping.start_position,
+                length=signal.length,
+                byte_order=byte_order,
+                encoding=cls._signal_encoding(signal),
+                update_indication_bit_position=mapping.update_indication_bit_position,
+            )
+            if pdu.length is not None and layout.end_byte > pdu.length:
+                cls._logger.warning(f'PDU {pdu.name}: Signal {signal.name} exceeds the PDU length of {pdu.length} bytes, skipping')
+                continue
+            try:
+                _compile_signal(layout)
+            except ValueError as e:
+                cls._logger.warning(f'PDU {pdu.name}: {e}, skipping')
+                continue
+            signals.append(layout)
+        return cls(pdu.name, pdu.length or 0, signals)
+
+    @classmethod
+    def _signal_encoding(cls, signal: ISignal) -> str:
+        if signal.network_representation_props is None:
+            return 'NONE'
+        props = signal.network_representation_props.single
+        if props is None or props.base_type_ref is None:
+            return 'NONE'
+        base_type = signal.root_ws().find(props.base_type_ref)
+        if not isinstance(base_type, SwBaseType) or base_type.type_encoding is None:
+            return 'NONE'
+        return base_type.type_encoding
+
+    def decode(self, payloads: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Returns the values of every signal by signal name. Integer signals get the smallest fitting integer type,
+        IEEE754 signals float32 or float64, BOOLEAN signals bool and opaque signals an N x bytes uint8 array.
+        payloads may be wider than the PDU, it must hold every byte a signal occupies.
+        """
+        words = _Words(self._check(payloads))
+        return {name: decoder(words) for name, decoder in self._decoders}
+
+    def update_flags(self, payloads: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Returns the update indication bit of every signal that has one as a bool array, by signal name
+        """
+        payloads = self._check(payloads)
+        return {
+            name: (payloads[:, byte] & (1 << bit)) != 0
+            for name, (byte, bit) in self._update_bits
+        }
+
+    def _check(self, payloads: np.ndarray) -> np.ndarray:
+        if payloads.dtype != np.uint8 or payloads.ndim != 2:
+            raise ValueError(f'Expected a 2-dimensional uint8 array, got {payloads.ndim} dimensions of {payloads.dtype}')
+        if payloads.shape[1] < self.required_length:
+            raise ValueError(f'PDU {self.name} needs {self.required_length} bytes per payload, got {payloads.shape[1]}')
+        return payloads
+
+
+class _Words:
+    """
+    64-bit words starting at every byte offset of every payload, read from one zero padded copy of the payloads
+    """
+
+    def __init__(self, payloads: np.ndarray):
+        rows, width = payloads.shape
+        self.payloads = payloads
+        self._buffer = np.zeros((rows, width + 8), dtype=np.uint8)
+        self._buffer[:, :width] = payloads
+        self._views: dict[str, np.ndarray] = {}
+
+    def view(self, dtype: str) -> np.ndarray:
+        """
+        Returns an N x (width + 1) array of dtype '<u8' or '>u8' whose column i overlaps bytes i to i + 7 of each row
+        """
+        view = self._views.get(dtype)
+        if view is None:
+            rows, stride = self._buffer.shape
+            view = self._views[dtype] = np.ndarray(
+                shape=(rows, stride - 7),
+                dtype=dtype,
+                buffer=self._buffer,
+                strides=(stride, 1),
+            )
+        return view
+
+
+def _compile_signal(signal: SignalLayout) -> Callable[[_Words], np.ndarray]:
+    """
+    Returns a function extracting signal from _Words, raises ValueError if the layout is not supported
+    """
+    if signal.length <= 0:
+        raise ValueError(f'Signal {signal.name} has invalid length {signal.length}')
+    if signal.is_opaque:
+        if signal.start_position % 8 != 0 or signal.length % 8 != 0:
+            raise ValueError(f'Signal {signal.name} of {signal.length} bits is not byte aligned')
+        first = signal.start_position // 8
+        last = first + signal.length // 8
+        return lambda words: words.payloads[:, first:last]
+    if signal.byte_order not in (LITTLE_ENDIAN, BIG_ENDIAN):
+        raise ValueError(f'Signal {signal.name} has unknown byte order {signal.byte_order}')
+    convert = _compile_conversion(signal)
+    length = signal.length
+    mask = np.uint64((1 << length) - 1)
+    if signal.byte_order == LITTLE_ENDIAN:
+        byte, shift = divmod(signal.start_position, 8)
+        if shift + length <= 64:
+            shift = np.uint64(shift)
+            return lambda words: convert((words.view('<u8')[:, byte] >> shift) & mask)
+        # Spans 9 bytes, the missing high bits come from the 9th byte
+        high_shift = np.uint64(64 - shift)
+        shift = np.uint64(shift)
+        return lambda words: convert(
+            ((words.view('<u8')[:, byte] >> shift) | (words.view('<u8')[:, byte + 8] << high_shift)) & mask
+        )
+    byte, offset = divmod(signal.first_bit, 8)
+    if offset + length <= 64:
+        shift = np.uint64(64 - offset - length)
+        return lambda words: convert((words.view('>u8')[:, byte] >> shift) & mask)
+    # Spans 9 bytes, the missing low bits come from the 9th byte
+    offset_shift = np.uint64(offset)
+    low_shift = np.uint64(8 - offset)
+    low_byte = np.uint64(0xff)
+    shift = np.uint64(64 - length)
+    return lambda words: convert(
+        ((words.view('>u8')[:, byte] << offset_shift) | ((words.view('<u8')[:, byte + 8] & low_byte) >> low_shift)) >> shift
+    )
+
+
+def _compile_conversion(signal: SignalLayout) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Returns a function converting the raw uint64 bits of signal into its value according to its encoding
+    """
+    length = signal.length
+    encoding = signal.encoding
+    if encoding == 'IEEE754':
+        if length == 32:
+            return lambda raw: raw.astype(np.uint32).view(np.float32)
+        if length == 64:
+            return lambda raw: raw.view(np.float64)
+        raise ValueError(f'Signal {signal.name} of {length} bits cannot be IEEE754')
+    if encoding not in _integer_encodings:
+        raise ValueError(f'Signal {signal.name} has unsupported encoding {encoding}')
+    if encoding == 'BOOLEAN':
+        return lambda raw: raw != 0
+    size = 8
+    while size < length:
+        size *= 2
+    if encoding == 'NONE':
+        dtype = np.dtype(f'u{size // 8}')
+        return lambda raw: raw.astype(dtype)
+    dtype = np.dtype(f'i{size // 8}')
+    sign = np.uint64(1 << (length - 1))
+    if encoding == '2C':
+        # Flipping the sign bit and subtracting it again extends the sign over the upper bits
+        return lambda raw: ((raw ^ sign) - sign).view(np.int64).astype(dtype)
+    magnitude_mask = np.uint64((1 << (length - 1)) - 1)
+    if encoding == 'SM':
+        return lambda raw: np.where(
+            raw & sign,
+            -(raw & magnitude_mask).view(np.int64),
+            (raw & magnitude_mask).view(np.int64),
+        ).astype(dtype)
+    # 1C, negative values are the bitwise complement of their magnitude
+    mask = np.uint64((1 << length) - 1)
+    return lambda raw: np.where(
+        raw & sign,
+        -(~raw & mask).view(np.int64),
+        raw.view(np.int64),
+    ).astype(dtype)
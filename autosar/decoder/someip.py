@@ -0,0 +1,266 @@
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from autosar.extractor.common import Array, DataType, SomeIpFeature
+from autosar.extractor.data_type_extractor import ExtractedDataType
+from autosar.misc import HasLogger
+
+HEADER_SIZE = 16
+# Message ID, length, request ID, protocol and interface version, message type and return code
+HEADER_DTYPE = np.dtype([
+    ('service_id', '>u2'),
+    ('method_id', '>u2'),
+    ('length', '>u4'),
+    ('client_id', '>u2'),
+    ('session_id', '>u2'),
+    ('protocol_version', 'u1'),
+    ('interface_version', 'u1'),
+    ('message_type', 'u1'),
+    ('return_code', 'u1'),
+])
+# Set in the message type of SOME/IP-TP segments
+TP_FLAG = 0x20
+# Bytes of the length field in front of dynamic arrays unless the ISignal configures another size
+ARRAY_LENGTH_SIZE = 4
+# Big endian dtype of every supported length field size
+LENGTH_DTYPES = {1: np.dtype('u1'), 2: np.dtype('>u2'), 4: np.dtype('>u4')}
+
+
+@dataclass
+class RaggedArray:
+    """
+    Values of a dynamic array for a batch of messages, the values of message i are values[offsets[i]:offsets[i + 1]]
+    """
+    values: np.ndarray
+    offsets: np.ndarray
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+
+@dataclass
+class SomeIpMessages:
+    """
+    Decoded payloads of one SOME/IP event, index holds the position of each message in the decoded batch
+    """
+    key: SomeIpFeature
+    name: str
+    index: np.ndarray
+    columns: dict[str, np.ndarray | RaggedArray] = field(default_factory=dict)
+    header: np.ndarray | None = None
+
+
+@dataclass(frozen=True)
+class _FixedSegment:
+    dtype: np.dtype
+
+
+@dataclass(frozen=True)
+class _DynamicSegment:
+    name: str
+    element_dtype: np.dtype
+    max_count: int
+
+
+def gather(buffer: np.ndarray, starts: np.ndarray, size: int) -> np.ndarray:
+    """
+    Returns an N x size copy of the bytes following every start, bytes past the end of buffer read as the last byte
+    """
+    if len(buffer) == 0:
+        return np.zeros((len(starts), size), dtype=np.uint8)
+    index = starts[:, np.newaxis] + np.arange(size)
+    np.minimum(index, len(buffer) - 1, out=index)
+    return buffer[index]
+
+
+def _element_dtype(data_type: DataType | dict[str, DataType]) -> np.dtype:
+    if isinstance(data_type, dict):
+        if len(data_type) == 1:
+            return _element_dtype(next(iter(data_type.values())))
+        return np.dtype([(name or value.name, _element_dtype(value)) for name, value in data_type.items()])
+    if isinstance(data_type, Array):
+        if not isinstance(data_type.length, int):
+            raise NotImplementedError(f'Dynamic array {data_type.name} nested in another array')
+        return np.dtype((_element_dtype(data_type.dtype), (data_type.length,)))
+    return np.dtype(data_type.dtype)
+
+
+class SomeIpPayloadLayout:
+    """
+    Serialization of the payload of one SOME/IP event as given by its ExtractedDataType: the elements in order,
+    big endian and without padding, dynamic arrays preceded by their length in bytes in a field of
+    array_length_size bytes. Runs of fixed size elements are decoded at once through a structured dtype.
+    """
+
+    def __init__(
+            self,
+            key: SomeIpFeature,
+            name: str,
+            elements: Mapping[str, DataType],
+            array_length_size: int = ARRAY_LENGTH_SIZE,
+    ):
+        self.key = key
+        self.name = name
+        self.array_length_size = array_length_size
+        segments = []
+        fields = []
+        for element_name, data_type in elements.items():
+            # The elements of an array data type are keyed by an empty name
+            element_name = element_name or data_type.name
+            if isinstance(data_type, Array) and not isinstance(data_type.length, int):
+                if array_length_size not in LENGTH_DTYPES:
+                    raise ValueError(f'Unsupported array length field size of {array_length_size} bytes')
+                if len(fields) > 0:
+                    segments.append(_FixedSegment(np.dtype(fields)))
+                    fields = []
+                segments.append(_DynamicSegment(element_name, _element_dtype(data_type.dtype), data_type.length[1]))
+            else:
+                fields.append((element_name, _element_dtype(data_type)))
+        if len(fields) > 0:
+            segments.append(_FixedSegment(np.dtype(fields)))
+        self.segments = tuple(segments)
+        self.minimum_size = sum(
+            segment.dtype.itemsize if isinstance(segment, _FixedSegment) else array_length_size
+            for segment in self.segments
+        )
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(key={self.key}, name={self.name!r}, segments={len(self.segments)})'
+
+    def decode(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> tuple[dict[str, np.ndarray | RaggedArray], np.ndarray]:
+        """
+        Decodes the payloads buffer[starts[i]:ends[i]], returns the columns of the valid payloads and the mask of
+        valid payloads. A payload is invalid if it ends before its last element or if a dynamic array length is not
+        a multiple of the element size or exceeds the maximum number of elements.
+        """
+        position = starts.astype(np.int64)
+        ends = ends.astype(np.int64)
+        valid = np.ones(len(position), dtype=bool)
+        columns: dict[str, np.ndarray | RaggedArray] = {}
+        counts: dict[str, np.ndarray] = {}
+        for segment in self.segments:
+            if isinstance(segment, _FixedSegment):
+                size = segment.dtype.itemsize
+                valid &= position + size <= ends
+                values = gather(buffer, position, size).view(segment.dtype)[:, 0]
+                for name in segment.dtype.names:
+                    columns[name] = values[name]
+                position += size
+                continue
+            length_size = self.array_length_size
+            valid &= position + length_size <= ends
+            length = gather(buffer, position, length_size).view(LENGTH_DTYPES[length_size])[:, 0].astype(np.int64)
+            position += length_size
+            element_size = segment.element_dtype.itemsize
+            valid &= (position + length <= ends) & (length % element_size == 0)
+            valid &= length <= segment.max_count * element_size
+            length[~valid] = 0
+            count = length // element_size
+            columns[segment.name] = RaggedArray(self._gather_elements(buffer, position, length, segment), _offsets(count))
+            counts[segment.name] = count
+            position += length
+        if not valid.all():
+            columns = {name: self._select(column, valid, counts.get(name)) for name, column in columns.items()}
+        return columns, valid
+
+    @staticmethod
+    def _gather_elements(buffer: np.ndarray, position: np.ndarray, length: np.ndarray, segment: _DynamicSegment) -> np.ndarray:
+        total = int(length.sum())
+        if total == 0:
+            return np.zeros(0, dtype=segment.element_dtype)
+        # Byte i of the concatenated arrays is at the start of its array plus its distance from the array's first byte
+        first = np.cumsum(length) - length
+        index = np.repeat(position - first, length) + np.arange(total)
+        return buffer[index].view(segment.element_dtype)
+
+    @staticmethod
+    def _select(column: np.ndarray | RaggedArray, valid: np.ndarray, count: np.ndarray | None) -> np.ndarray | RaggedArray:
+        if not isinstance(column, RaggedArray):
+            return column[valid]
+        return RaggedArray(column.values[np.repeat(valid, count)], _offsets(count[valid]))
+
+
+def _offsets(count: np.ndarray) -> np.ndarray:
+    offsets = np.zeros(len(count) + 1, dtype=np.int64)
+    np.cumsum(count, out=offsets[1:])
+    return offsets
+
+
+class SomeIpDecoder(HasLogger):
+    """
+    Decodes batches of SOME/IP messages with the data types SystemExtractor mapped to (service ID, event ID, major
+    version). Messages are dispatched on service ID, method ID and interface version of their headers, every distinct
+    key is looked up once per batch and all messages of a key are decoded together.
+    """
+
+    def __init__(self, some_ip_mapping: Mapping[SomeIpFeature, tuple[str, ExtractedDataType]], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.layouts: dict[SomeIpFeature, SomeIpPayloadLayout] = {}
+        for key, (name, data_type) in some_ip_mapping.items():
+            if data_type.elements is None:
+                continue
+            try:
+                array_length_size = data_type.array_length_size
+                if array_length_size is None:
+                    array_length_size = ARRAY_LENGTH_SIZE
+                self.layouts[key] = SomeIpPayloadLayout(key, name, data_type.elements, array_length_size)
+            except (NotImplementedError, TypeError, ValueError) as e:
+                self._logger.warning(f'Cannot decode {name} {key}: {e}')
+        self._dispatch = {self._combine(*key): layout for key, layout in self.layouts.items()}
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(layouts={len(self.layouts)})'
+
+    @staticmethod
+    def _combine(service_id, method_id, interface_version):
+        return (service_id << 24) | (method_id << 8) | interface_version
+
+    def decode_messages(self, messages: Iterable[bytes]) -> dict[SomeIpFeature, SomeIpMessages]:
+        """
+        Decodes complete SOME/IP messages given one by one
+        """
+        messages = list(messages)
+        lengths = np.fromiter(map(len, messages), dtype=np.int64, count=len(messages))
+        buffer = np.frombuffer(b''.join(messages), dtype=np.uint8)
+        ends = np.cumsum(lengths)
+        return self.decode(buffer, ends - lengths, ends)
+
+    def decode(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray | None = None) -> dict[SomeIpFeature, SomeIpMessages]:
+        """
+        Decodes the SOME/IP messages starting at starts in the uint8 array buffer. Without ends a message ends where
+        its length field says, with ends at the earlier of both. Messages of unknown events, SOME/IP-TP segments and
+        messages too short for their payload are left out.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        header = gather(buffer, starts, HEADER_SIZE).view(HEADER_DTYPE)[:, 0]
+        message_ends = starts + 8 + header['length'].astype(np.int64)
+        if ends is not None:
+            message_ends = np.minimum(message_ends, np.asarray(ends, dtype=np.int64))
+        candidates = (starts + HEADER_SIZE <= message_ends) & (header['message_type'] & TP_FLAG == 0)
+        keys = self._combine(
+            header['service_id'].astype(np.uint64),
+            header['method_id'].astype(np.uint64),
+            header['interface_version'].astype(np.uint64),
+        )
+        keys[~candidates] = np.iinfo(np.uint64).max
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.zeros(len(unique_keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(inverse, minlength=len(unique_keys)), out=bounds[1:])
+        result = {}
+        for i, key in enumerate(unique_keys.tolist()):
+            layout = self._dispatch.get(key)
+            if layout is None:
+                continue
+            index = order[bounds[i]:bounds[i + 1]]
+            columns, valid = layout.decode(buffer, starts[index] + HEADER_SIZE, message_ends[index])
+            if not valid.all():
+                self._logger.debug(f'{layout.name}: Dropped {int((~valid).sum())} messages too short for their payload')
+                index = index[valid]
+            result[layout.key] = SomeIpMessages(layout.key, layout.name, index, columns, header[index])
+        return result
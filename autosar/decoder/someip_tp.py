@@ -0,0 +1,254 @@
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+
+from autosar.decoder.someip import HEADER_DTYPE, HEADER_SIZE, TP_FLAG, RaggedArray, SomeIpMessages, gather
+from autosar.extractor.system_extractor import ExtractedSystem
+from autosar.misc import HasLogger
+from autosar.model.ethernet_cluster import PduTriggering
+from autosar.model.pdu import IPdu
+from autosar.model.some_ip_tp import SomeIpConnection, SomeIpTPChannel
+
+# SOME/IP-TP header following the SOME/IP header of a segment: offset in units of 16 bytes and the more segments flag
+TP_HEADER_SIZE = 4
+TP_OFFSET_MASK = 0xfffffff0
+TP_MORE_SEGMENTS = 0x01
+# Payload of every segment but the last is a multiple of this
+TP_SEGMENT_ALIGNMENT = 16
+# Position of the message type in the SOME/IP header
+_MESSAGE_TYPE_POSITION = 14
+
+_SEGMENT_DTYPE = np.dtype(HEADER_DTYPE.descr + [('tp_header', '>u4')])
+
+
+@dataclass(frozen=True)
+class TpConnection:
+    """
+    Reassembly limits of one segmented SOME/IP event: the maximum payload size in bytes and the time in nanoseconds
+    after which a session without new segments is discarded
+    """
+    max_size: int
+    timeout: int
+
+
+@dataclass
+class ReassembledMessage:
+    """
+    A SOME/IP message reassembled from its segments. data is the complete message, header and payload, with the
+    TP flag cleared in the message type, as a view of the buffer it was reassembled in. index is the position of
+    the last segment in the batch that completed the message.
+    """
+    source: bytes
+    service_id: int
+    method_id: int
+    session_id: int
+    index: int
+    timestamp: int
+    data: memoryview
+
+    def __len__(self):
+        return len(self.data)
+
+    def array(self) -> np.ndarray:
+        return np.frombuffer(self.data, dtype=np.uint8)
+
+
+class _Session:
+    __slots__ = ('buffer', 'view', 'size', 'last_timestamp', 'connection')
+
+    def __init__(self, connection: TpConnection, timestamp: int):
+        self.connection = connection
+        self.buffer = bytearray(HEADER_SIZE + connection.max_size)
+        self.view = np.frombuffer(self.buffer, dtype=np.uint8)
+        self.size = 0
+        self.last_timestamp = timestamp
+
+
+class SomeIpTpReassembler(HasLogger):
+    """
+    Reassembles SOME/IP-TP segments into complete SOME/IP messages. Sessions are keyed by the source of the segments
+    and service ID, method ID and session ID of their headers. Every session writes its segments into a buffer sized
+    for the largest payload of its event when the first segment arrives, the completed message is returned as a
+    memoryview of that buffer. Segments have to arrive in order, a session that misses a segment or sees no segment
+    for longer than its timeout is discarded. dropped counts the discarded sessions and the segments that could not
+    be added to a session.
+    """
+
+    def __init__(self, connections: Mapping[tuple[int, int], TpConnection], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = dict(connections)
+        self.sessions: dict[tuple[bytes, int, int, int], _Session] = {}
+        self.dropped = 0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(connections={len(self.connections)}, sessions={len(self.sessions)})'
+
+    @classmethod
+    def from_extracted_system(
+            cls,
+            extracted_system: ExtractedSystem,
+            timeout_factor: float = 10,
+            default_timeout: float = 1.0,
+    ) -> 'SomeIpTpReassembler':
+        """
+        Sizes the sessions of every segmented event by the length of its SOME/IP-TP SDU. A session times out after
+        timeout_factor times the separation time of its connection or channel, after default_timeout seconds if
+        neither has one.
+        """
+        ws = extracted_system.system.root_ws()
+        connections = {}
+        for message_id, connection in extracted_system.some_ip_tp_mapping.items():
+            pdu_triggering = ws.find(connection.tp_sdu_ref)
+            # Ethernet PDU triggerings keep the ref of their PDU in i_signal_ref
+            pdu = ws.find(pdu_triggering.i_signal_ref) if isinstance(pdu_triggering, PduTriggering) else None
+            if not isinstance(pdu, IPdu) or pdu.length is None:
+                cls._logger.warning(f'Cannot find the length of SOME/IP-TP SDU {connection.tp_sdu_ref}')
+                continue
+            separation_time = cls._separation_time(ws, connection)
+            timeout = default_timeout if separation_time is None else separation_time * timeout_factor
+            connections[message_id >> 16, message_id & 0xffff] = TpConnection(pdu.length, int(timeout * 1e9))
+        return cls(connections)
+
+    @staticmethod
+    def _separation_time(ws, connection: SomeIpConnection) -> float | None:
+        separation_time = connection.separation_time
+        if separation_time is None and connection.tp_channel_ref is not None:
+            channel = ws.find(connection.tp_channel_ref)
+            if isinstance(channel, SomeIpTPChannel):
+                separation_time = channel.separation_time
+        try:
+            separation_time = float(separation_time)
+        except (TypeError, ValueError):
+            return None
+        return separation_time if separation_time > 0 else None
+
+    def reset(self):
+        self.sessions.clear()
+
+    def expire(self, timestamp: int):
+        """
+        Discards the sessions without segments in the timeout before timestamp, in nanoseconds
+        """
+        expired = [
+            key for key, session in self.sessions.items()
+            if timestamp - session.last_timestamp > session.connection.timeout
+        ]
+        for key in expired:
+            del self.sessions[key]
+        self.dropped += len(expired)
+
+    def feed(
+            self,
+            buffer: np.ndarray,
+            starts: np.ndarray,
+            ends: np.ndarray,
+            timestamps: np.ndarray,
+            sources: np.ndarray | None = None,
+    ) -> list[ReassembledMessage]:
+        """
+        Adds the segments buffer[starts[i]:ends[i]] received at timestamps, datetime64[ns] or integer nanoseconds,
+        from sources, an array of any fixed size dtype. Returns the messages completed by these segments.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if len(starts) == 0:
+            return []
+        timestamps = np.asarray(timestamps).astype(np.int64)
+        if sources is None:
+            source_keys = [b''] * len(starts)
+        else:
+            sources = np.ascontiguousarray(sources)
+            source_keys = sources.view(f'V{sources.dtype.itemsize}').tolist()
+        header = gather(buffer, starts, HEADER_SIZE + TP_HEADER_SIZE).view(_SEGMENT_DTYPE)[:, 0]
+        segment_starts = starts + HEADER_SIZE + TP_HEADER_SIZE
+        is_segment = (header['message_type'] & TP_FLAG != 0) & (segment_starts <= ends)
+        self.dropped += int((~is_segment).sum())
+        complete = []
+        rows = zip(
+            np.flatnonzero(is_segment).tolist(),
+            header['service_id'][is_segment].tolist(),
+            header['method_id'][is_segment].tolist(),
+            header['session_id'][is_segment].tolist(),
+            header['tp_header'][is_segment].tolist(),
+            segment_starts[is_segment].tolist(),
+            ends[is_segment].tolist(),
+            timestamps[is_segment].tolist(),
+        )
+        for i, service_id, method_id, session_id, tp_header, start, end, timestamp in rows:
+            key = (source_keys[i], service_id, method_id, session_id)
+            offset = tp_header & TP_OFFSET_MASK
+            session = self.sessions.get(key)
+            if session is not None and timestamp - session.last_timestamp > session.connection.timeout:
+                del self.sessions[key]
+                self.dropped += 1
+                session = None
+            if offset == 0:
+                connection = self.connections.get((service_id, method_id))
+                if connection is None:
+                    self.dropped += 1
+                    continue
+                if session is not None:
+                    self.dropped += 1
+                session = self.sessions[key] = _Session(connection, timestamp)
+                session.view[:HEADER_SIZE] = buffer[starts[i]:starts[i] + HEADER_SIZE]
+            elif session is None or offset != session.size:
+                # A segment is missing, the session cannot be completed any more
+                if session is not None:
+                    del self.sessions[key]
+                self.dropped += 1
+                continue
+            size = end - start
+            more = tp_header & TP_MORE_SEGMENTS != 0
+            if offset + size > session.connection.max_size or (more and size % TP_SEGMENT_ALIGNMENT != 0):
+                del self.sessions[key]
+                self.dropped += 1
+                continue
+            position = HEADER_SIZE + offset
+            session.view[position:position + size] = buffer[start:end]
+            session.size = offset + size
+            session.last_timestamp = timestamp
+            if more:
+                continue
+            del self.sessions[key]
+            complete.append(self._finish(session, key, i, timestamp))
+        self.expire(int(timestamps[-1]))
+        return complete
+
+    @staticmethod
+    def _finish(session: _Session, key: tuple[bytes, int, int, int], index: int, timestamp: int) -> ReassembledMessage:
+        session.buffer[4:8] = (session.size + 8).to_bytes(4, 'big')
+        session.buffer[_MESSAGE_TYPE_POSITION] &= ~TP_FLAG
+        source, service_id, method_id, session_id = key
+        return ReassembledMessage(
+            source=source,
+            service_id=service_id,
+            method_id=method_id,
+            session_id=session_id,
+            index=index,
+            timestamp=timestamp,
+            data=memoryview(session.buffer)[:HEADER_SIZE + session.size],
+        )
+
+
+def concatenate_messages(parts: list[SomeIpMessages]) -> SomeIpMessages:
+    """
+    Joins the decoded messages of one event, the index arrays have to refer to the same per message arrays
+    """
+    first = parts[0]
+    if len(parts) == 1:
+        return first
+    columns = {}
+    for name, column in first.columns.items():
+        if not isinstance(column, RaggedArray):
+            columns[name] = np.concatenate([part.columns[name] for part in parts], dtype=column.dtype)
+            continue
+        ragged = [part.columns[name] for part in parts]
+        shift = np.cumsum([0] + [len(item.values) for item in ragged[:-1]])
+        offsets = [ragged[0].offsets] + [item.offsets[1:] + s for item, s in zip(ragged[1:], shift[1:])]
+        values = np.concatenate([item.values for item in ragged], dtype=column.values.dtype)
+        columns[name] = RaggedArray(values, np.concatenate(offsets))
+    header = None
+    if first.header is not None:
+        header = np.concatenate([part.header for part in parts])
+    return SomeIpMessages(first.key, first.name, np.concatenate([part.index for part in parts]), columns, header)
@@ -4,9 +4,30 @@ from typing import Any, Sequence, Generator, Iterable, TypeVar
 from autosar.extractor.base import Interval
 from autosar.misc import HasRepr
 
+try:
+    import numpy as np
+except ImportError:  # only apply() needs numpy, see the decoder extra
+    np = None
+
+
+def _as_array(raw: Any) -> 'np.ndarray':
+    if np is None:
+        raise ImportError('numpy is required to apply conversions to arrays')
+    return np.asarray(raw)
+
 
 class Conversion(HasRepr):
-    pass
+    def apply(self, raw: 'np.ndarray') -> 'np.ndarray':
+        """
+        Converts an array of raw values into physical values
+        """
+        raise NotImplementedError
+
+    def apply_scalar(self, raw: int | float) -> Any:
+        """
+        Converts a single raw value into its physical value
+        """
+        raise NotImplementedError
 
 
 class ConstantConversion(Conversion):
@@ -18,6 +39,12 @@ class ConstantConversion(Conversion):
         super().__init__(*args, **kwargs)
         self.constant = constant
 
+    def apply(self, raw: 'np.ndarray') -> 'np.ndarray':
+        return np.full(_as_array(raw).shape, self.constant)
+
+    def apply_scalar(self, raw: int | float) -> Any:
+        return self.constant
+
 
 class LinearConversion(Conversion):
     def __init__(
@@ -34,6 +61,12 @@ class LinearConversion(Conversion):
         yield self.a
         yield self.b
 
+    def apply(self, raw: 'np.ndarray') -> 'np.ndarray':
+        return _as_array(raw) * self.a + self.b
+
+    def apply_scalar(self, raw: int | float) -> int | float:
+        return raw * self.a + self.b
+
 
 class RationalConversion(Conversion):
     def __init__(
@@ -58,12 +91,59 @@ class RationalConversion(Conversion):
         for n, c in enumerate(self.denominator_coeffs):
             yield c, self.denominator_order - n
 
+    @staticmethod
+    def _horner(coeffs: Sequence[int | float], x):
+        # coeffs start with the highest order, works on scalars and arrays alike
+        result = 0
+        for c in coeffs:
+            result = result * x + c
+        return result
+
+    def apply(self, raw: 'np.ndarray') -> 'np.ndarray':
+        x = _as_array(raw).astype(np.float64)
+        return self._horner(self.numerator_coeffs, x) / self._horner(self.denominator_coeffs, x)
+
+    def apply_scalar(self, raw: int | float) -> float:
+        return self._horner(self.numerator_coeffs, raw) / self._horner(self.denominator_coeffs, raw)
+
 
 @dataclass
 class ConversionInterval(Interval):
     convertion: Conversion | None = None
 
 
+def _locate(intervals: Sequence[ConversionInterval], bounds: 'np.ndarray', raw: 'np.ndarray') -> 'np.ndarray':
+    """
+    Returns the index of the interval of ordered intervals containing each raw value, -1 if there is none.
+    bounds holds the minimum of every interval followed by its maximum.
+    """
+    if len(intervals) == 0:
+        return np.full(raw.shape, -1, dtype=np.intp)
+    mins = bounds[:len(intervals)]
+    maxs = bounds[len(intervals):]
+    # First interval ending at or after raw, on a shared boundary the lower interval wins like in _locate_scalar()
+    index = np.searchsorted(maxs, raw, side='left')
+    clipped = np.minimum(index, len(intervals) - 1)
+    return np.where((index < len(intervals)) & (raw >= mins[clipped]), index, -1)
+
+
+def _locate_scalar(intervals: Sequence[ConversionInterval], raw: int | float) -> int:
+    for i, interval in enumerate(intervals):
+        if raw in interval:
+            return i
+    return -1
+
+
+def _constant(interval: ConversionInterval) -> Any:
+    if isinstance(interval.convertion, ConstantConversion):
+        return interval.convertion.constant
+    return None
+
+
+def _bounds(intervals: Sequence[ConversionInterval]) -> 'np.ndarray':
+    return np.array([iv.min for iv in intervals] + [iv.max for iv in intervals], dtype=np.float64)
+
+
 class ScaledConversion(Conversion):
     @staticmethod
     def order_intervals(intervals: Iterable[ConversionInterval]) -> list[ConversionInterval] | None:
@@ -101,7 +181,50 @@ class NumericConversion(ScaledConversion):
             for iv1, iv2 in zip(self.numeric_intervals, self.numeric_intervals[1:]):
                 mid_point = (iv1.max + iv2.min) / 2
                 iv1.max = mid_point
-                iv2.min - mid_point
+                iv2.min = mid_point
+        self._numeric_tables = None
+
+    def apply(self, raw: 'np.ndarray') -> 'np.ndarray':
+        """
+        Returns the physical values as float64, NaN where no numeric interval contains the raw value
+        """
+        raw = _as_array(raw)
+        intervals = self.numeric_intervals or ()
+        if self._numeric_tables is None:
+            self._numeric_tables = self._build_numeric_tables(intervals)
+        bounds, a, b = self._numeric_tables
+        index = _locate(intervals, bounds, raw)
+        if a is not None:
+            # Only linear scales, evaluated at once with the coefficients of every value's scale
+            clipped = np.maximum(index, 0)
+            result = raw * a[clipped] + b[clipped]
+        else:
+            result = np.empty(raw.shape, dtype=np.float64)
+            for i, interval in enumerate(intervals):
+                selected = index == i
+                if interval.convertion is None:
+                    result[selected] = raw[selected]
+                else:
+                    result[selected] = interval.convertion.apply(raw[selected])
+        return np.where(index >= 0, result, np.nan)
+
+    def apply_scalar(self, raw: int | float) -> float:
+        intervals = self.numeric_intervals or ()
+        i = _locate_scalar(intervals, raw)
+        if i < 0:
+            return float('nan')
+        if intervals[i].convertion is None:
+            return raw
+        return intervals[i].convertion.apply_scalar(raw)
+
+    @staticmethod
+    def _build_numeric_tables(intervals: Sequence[ConversionInterval]) -> tuple:
+        bounds = _bounds(intervals)
+        if len(intervals) == 0 or not all(isinstance(iv.convertion, LinearConversion) for iv in intervals):
+            return bounds, None, None
+        a = np.array([iv.convertion.a for iv in intervals], dtype=np.float64)
+        b = np.array([iv.convertion.b for iv in intervals], dtype=np.float64)
+        return bounds, a, b
 
 
 class MapConversion(ScaledConversion):
@@ -112,10 +235,57 @@ class MapConversion(ScaledConversion):
     ):
         super().__init__(*args, **kwargs)
         self.map_intervals = self.order_intervals(map_intervals)
+        # Distinct constants of the intervals, in order of appearance, and the code of each interval
+        labels = {}
+        for iv in self.map_intervals or ():
+            labels.setdefault(_constant(iv), len(labels))
+        self.labels = tuple(labels)
+        self._interval_codes = tuple(labels[_constant(iv)] for iv in self.map_intervals or ())
+        self._map_tables = None
+
+    def apply(self, raw: 'np.ndarray') -> 'np.ndarray':
+        return self.apply_codes(raw)
+
+    def apply_codes(self, raw: 'np.ndarray') -> 'np.ndarray':
+        """
+        Returns the index into self.labels of the text of every raw value as int32, -1 where no interval matches
+        """
+        raw = _as_array(raw)
+        intervals = self.map_intervals or ()
+        if self._map_tables is None:
+            self._map_tables = (_bounds(intervals), np.array(self._interval_codes + (-1,), dtype=np.int32))
+        bounds, codes = self._map_tables
+        # Index -1 picks the trailing -1 of codes
+        return codes[_locate(intervals, bounds, raw)]
+
+    def apply_scalar(self, raw: int | float) -> Any:
+        """
+        Returns the text of raw, None if no interval matches
+        """
+        i = _locate_scalar(self.map_intervals or (), raw)
+        if i < 0:
+            return None
+        return self.labels[self._interval_codes[i]]
 
 
 class NumericAndMapConversion(NumericConversion, MapConversion):
-    pass
+    """
+    apply() returns the numeric values, NaN for raw values with a text, apply_codes() the codes of these texts
+    """
+
+    def apply(self, raw: 'np.ndarray') -> 'np.ndarray':
+        raw = _as_array(raw)
+        # The gaps between numeric intervals are filled, a text takes precedence like in apply_scalar()
+        return np.where(self.apply_codes(raw) >= 0, np.nan, NumericConversion.apply(self, raw))
+
+    def apply_scalar(self, raw: int | float) -> Any:
+        """
+        Returns the text of raw if it has one, its numeric value otherwise
+        """
+        text = MapConversion.apply_scalar(self, raw)
+        if text is not None:
+            return text
+        return NumericConversion.apply_scalar(self, raw)
 
 
 class BitfieldConversion(Conversion):
@@ -130,6 +300,37 @@ class BitfieldConversion(Conversion):
             if mask not in self.mask_intervals:
                 self.mask_intervals[mask] = []
             self.mask_intervals[mask].append(iv)
+        self.labels: dict[int, tuple] = {
+            mask: tuple(_constant(iv) for iv in ivs)
+            for mask, ivs in self.mask_intervals.items()
+        }
+
+    def apply(self, raw: 'np.ndarray') -> dict[int, 'np.ndarray']:
+        """
+        Returns per mask the index into self.labels[mask] of the interval raw & mask falls into as int32,
+        -1 where none matches
+        """
+        raw = _as_array(raw).astype(np.int64)
+        result = {}
+        for mask, ivs in self.mask_intervals.items():
+            masked = raw & mask
+            codes = np.full(raw.shape, -1, dtype=np.int32)
+            # Earlier intervals take precedence, like in apply_scalar()
+            for i in reversed(range(len(ivs))):
+                codes[(masked >= ivs[i].min) & (masked <= ivs[i].max)] = i
+            result[mask] = codes
+        return result
+
+    def apply_scalar(self, raw: int | float) -> tuple:
+        """
+        Returns the texts of all masks whose interval contains raw & mask
+        """
+        texts = []
+        for mask, ivs in self.mask_intervals.items():
+            i = _locate_scalar(ivs, int(raw) & mask)
+            if i >= 0:
+                texts.append(self.labels[mask][i])
+        return tuple(texts)
 
 
 AnyConversion = TypeVar('AnyConversion', bound=Conversion)
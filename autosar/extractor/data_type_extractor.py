@@ -29,11 +29,14 @@ class ExtractedDataType(HasLogger):
             self,
             data_element: DataElement,
             transformations: Iterable[TransformationTechnology],
+            array_length_size: int | None = None,
             *args, **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self._ws = data_element.root_ws()
         self._transformations = transformations
+        # Bytes of the SOME/IP length field of dynamic arrays, None if the ISignal does not configure it
+        self.array_length_size = array_length_size
         self._logger.debug(f'Extracting {data_element.name}')
         self.root_type = self._ws.find(data_element.type_ref)
         self.elements = {}
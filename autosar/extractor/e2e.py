@@ -1,5 +1,7 @@
 from autosar.extractor.common import ScalableDataType
 
+# Header fields of every supported E2E profile in the order they are transmitted, the CRC of profile 5 is sent
+# low byte first
 e2e_profiles = {
     'PROFILE_04': {
         'E2E_length': ScalableDataType('UINT16', '>u2', 1),
@@ -8,7 +10,7 @@ e2e_profiles = {
         'E2E_crc': ScalableDataType('UINT32', '>u4', 1),
     },
     'PROFILE_05': {
-        'E2E_crc': ScalableDataType('UINT16', '>u2', 1),
+        'E2E_crc': ScalableDataType('UINT16', '<u2', 1),
         'E2E_counter': ScalableDataType('UINT8', '>u1', 1),
     },
     'PROFILE_07': {
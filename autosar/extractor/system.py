@@ -12,12 +12,14 @@ from autosar.extractor.conversion import (
     NumericAndMapConversion,
     BitfieldConversion,
 )
-from autosar.extractor.topology import Ecu, CanFrame, CanChannel
+from autosar.extractor import topology
+from autosar.extractor.topology import Ecu
 from autosar.model.ar_object import AnyArObject
 from autosar.model.can_cluster import CanClusterVariants, CanCluster, CanPhysicalChannel, CanFrameTriggering
 from autosar.model.compu import CompuScaleRationalFormula, CompuScaleConstantContents
 from autosar.model.datatype import SwBaseType, CompuMethod
-from autosar.model.ecu import EcuInstance
+from autosar.model.ecu import EcuInstance, FramePort
+from autosar.model.frame import Frame
 from autosar.misc import HasLogger
 from autosar.model.signal import ISignal, SystemSignal
 from autosar.model.system import System
@@ -61,6 +63,7 @@ class ExtractedSystem(HasLogger):
                 Ecu(identifier=ecu.ref, name=ecu.name)
                 for ecu in self.fibex_elements[EcuInstance]
             )
+            self._ecu_refs = frozenset(ecu.ref for ecu in self.fibex_elements[EcuInstance])
         except KeyError:
             raise ArxmlExtractionError('No ECU instances found')
 
@@ -225,6 +228,7 @@ class ExtractedSystem(HasLogger):
                 return None
 
     def _extract_topology(self):
+        self.can_clusters: list[topology.CanCluster] = []
         clusters = chain.from_iterable(
             c for cls in self._comm_clusters
             if (c := self.fibex_elements.get(cls, None)) is not None
@@ -240,6 +244,7 @@ class ExtractedSystem(HasLogger):
                 self._logger.warning(f'Cluster {cluster.name}: Cluster extraction for type {cluster.__class__.__name__} is not supported')
 
     def _extract_can_cluster(self, cluster: CanCluster):
+        channels = []
         for channel in cluster.physical_channels:
             if not isinstance(channel, CanPhysicalChannel):
                 self._logger.error(f'Channel {channel.name}: Unexpected channel type: '
@@ -251,14 +256,41 @@ class ExtractedSystem(HasLogger):
                     self._logger.error(f'Triggering {frame_trig.name}: Unexpected triggering type: '
                                        f'Expected {CanFrameTriggering.__name__}, got {frame_trig.__class__.__name__}')
                     continue
-                CanFrame(
+                ports = [p for p in map(self._find, frame_trig.frame_ports_refs) if isinstance(p, FramePort)]
+                topology.CanFrame(
                     identifier=frame_trig.ref,
                     name=frame_trig.name,
                     frame_id=frame_trig.identifier,
-                    pdu=None,
-                    providers=(p.parent.parent.ref for p in map(self._find, frame_trig.frame_ports_refs) if p.communication_direction == 'OUT'),
-                    consumers=(p.parent.parent.ref for p in map(self._find, frame_trig.frame_ports_refs) if p.communication_direction == 'IN'),
+                    pdu=self._frame_pdu(frame_trig),
+                    providers=self._port_ecus(ports, 'OUT'),
+                    consumers=self._port_ecus(ports, 'IN'),
                 )
                 frames.append(frame_trig.ref)
-            cn = CanChannel(identifier=channel.ref, name=channel.name, frames=frames)
-            raise RuntimeError  # dummy
+            topology.CanChannel(identifier=channel.ref, name=channel.name, frames=frames)
+            channels.append(channel.ref)
+        self.can_clusters.append(topology.CanCluster(identifier=cluster.ref, name=cluster.name, channels=channels))
+
+    def _frame_pdu(self, frame_trig: CanFrameTriggering) -> str | None:
+        frame = self._find(frame_trig.frame_ref)
+        if not isinstance(frame, Frame):
+            self._logger.warning(f'Triggering {frame_trig.name}: Cannot find frame {frame_trig.frame_ref}')
+            return None
+        if len(frame.pdu_to_frame_mappings) == 0:
+            return None
+        if len(frame.pdu_to_frame_mappings) > 1:
+            self._logger.warning(f'Frame {frame.name}: Only the first of {len(frame.pdu_to_frame_mappings)} PDUs is extracted')
+        return frame.pdu_to_frame_mappings[0].pdu_ref
+
+    def _port_ecus(self, ports: list[FramePort], direction: str) -> list[str]:
+        """
+        Returns the references of the ECU instances owning the ports of the given direction, ECUs that are not
+        part of the system are left out
+        """
+        ecus = []
+        for port in ports:
+            if port.communication_direction != direction:
+                continue
+            ecu = port.parent.parent
+            if ecu.ref in self._ecu_refs:
+                ecus.append(ecu.ref)
+        return ecus
@@ -1,5 +1,5 @@
 import itertools
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Iterable
 
 from autosar.model.base import AdminData
@@ -13,7 +13,7 @@ from autosar.misc import HasLogger
 from autosar.model.pdu import SoConIPduIdentifier, ISignalIPdu, GeneralPurposeIPdu
 from autosar.model.portinterface import Operation, Trigger
 from autosar.model.service_instance_collection import ServiceInstanceCollectionSet, ProvidedServiceInstance, EventHandler
-from autosar.model.signal import SystemSignal, ISignal
+from autosar.model.signal import SystemSignal, ISignal, SomeIpTransformationISignalPropsVariants
 from autosar.model.some_ip_tp import SomeIpConfig, SomeIpConnection
 from autosar.model.system import (
     System,
@@ -30,6 +30,7 @@ class ExtractedSystem:
     fibex_elements: tuple
     some_ip_mapping: dict[SomeIpFeature, tuple[str, DataElement, tuple[TransformationTechnology, ...]]]
     ecu_mapping: dict[str, EcuInstance]
+    some_ip_tp_mapping: dict[int, SomeIpConnection] = field(default_factory=dict)
 
 
 class SystemExtractor(HasLogger):
@@ -54,6 +55,7 @@ class SystemExtractor(HasLogger):
             fibex_elements=self.fibex_elements,
             some_ip_mapping=self.combined_mapping,
             ecu_mapping=self.source_mapping,
+            some_ip_tp_mapping=self.tp_mapping,
         )
         return extracted
 
@@ -74,6 +76,8 @@ class SystemExtractor(HasLogger):
             map(lambda x: x.tp_connections, filter(lambda x: isinstance(x, SomeIpConfig), self.fibex_elements))
         ))
         self.transport_mapping = {x.transport_pdu_ref: x for x in self.transport_configs}
+        # SOME/IP message ID of every event sent segmented with SOME/IP-TP
+        self.tp_mapping: dict[int, SomeIpConnection] = {}
 
     def _get_service_interfaces(self):
         if 'SO_SERVICE_INTERFACE' in self.ws.role_elements:
@@ -91,6 +95,8 @@ class SystemExtractor(HasLogger):
         signal_mapping: dict[str, SomeIpFeature] = {}
         transform_mapping: dict[SomeIpFeature, tuple[TransformationTechnology, ...]] = {}
         source_mapping: dict[str, EcuInstance] = {}
+        # Configured size of the array length fields by system signal
+        self.array_length_sizes: dict[str, int] = {}
         service_instances: Iterable[ProvidedServiceInstance] = filter(
             lambda i: isinstance(i, ProvidedServiceInstance),
             itertools.chain.from_iterable(map(
@@ -147,6 +153,7 @@ class SystemExtractor(HasLogger):
             if pdu_triggering.ref not in self.transport_mapping:
                 return None
             transport_config: SomeIpConnection = self.transport_mapping[pdu_triggering.ref]
+            self.tp_mapping[pdu_identifier.header_id] = transport_config
             pdu_triggering: PduTriggering = self.ws.find(transport_config.tp_sdu_ref)
             i_pdu: ISignalIPdu | GeneralPurposeIPdu = self.ws.find(pdu_triggering.i_signal_ref)
         signal: ISignal = self.ws.find(i_pdu.i_signal_to_pdu_mappings[0].i_signal_ref)
@@ -154,9 +161,21 @@ class SystemExtractor(HasLogger):
             map(lambda x: x.transformer_chain_refs, map(self.ws.find, signal.data_transformation_refs)),
         )))
         system_signal: SystemSignal = self.ws.find(signal.system_signal_ref)
+        array_length_size = self._get_array_length_size(signal)
+        if array_length_size is not None:
+            self.array_length_sizes[system_signal.ref] = array_length_size
         event_id = pdu_identifier.header_id & 0xffff
         return system_signal, transformations, event_id
 
+    @staticmethod
+    def _get_array_length_size(signal: ISignal) -> int | None:
+        for props in signal.transformation_i_signal_props:
+            if not isinstance(props, SomeIpTransformationISignalPropsVariants) or props.single is None:
+                continue
+            if props.single.size_of_array_length_fields is not None:
+                return props.single.size_of_array_length_fields
+        return None
+
     def _scan_data_mappings(self):
         mappings: Iterable[AnyDataMapping] = itertools.chain.from_iterable(
             x.data_mappings
@@ -186,7 +205,7 @@ class SystemExtractor(HasLogger):
             e: (self._get_name_from_data_element(x), y)
             for s, e in self.signal_mapping.items()
             if (isinstance((x := self.data_mapping[s]), DataElement)
-                and (y := ExtractedDataType(x, self.transform_mapping[e])).elements is not None)
+                and (y := ExtractedDataType(x, self.transform_mapping[e], self.array_length_sizes.get(s))).elements is not None)
         }
 
     def _get_name_from_data_element(self, data_element: DataElement) -> str:
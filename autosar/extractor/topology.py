@@ -18,19 +18,20 @@ class CanFrame(SystemElement):
     ):
         super().__init__(*args, **kwargs)
         self.frame_id = frame_id
+        self.pdu = pdu
         self.providers = tuple(map(Ecu.get, providers))
         self.consumers = tuple(map(Ecu.get, consumers))
 
     @property
     def sender(self) -> str:
-        match self.providers:
+        match len(self.providers):
             case 0: return 'UnknownECU'
             case 1: return self.providers[0].name
         return '_or_'.join(p.name for p in self.providers)
 
     @property
     def receiver(self) -> str:
-        match self.consumers:
+        match len(self.consumers):
             case 0: return 'UnknownECU'
             case 1: return self.consumers[0].name
         return '_or_'.join(c.name for c in self.consumers)
@@ -53,4 +54,4 @@ class CanCluster(SystemElement):
             *args, **kwargs,
     ):
         super().__init__(*args, **kwargs)
-        self.channels = tuple(map(..., channels))
+        self.channels = tuple(map(CanChannel.get, channels))
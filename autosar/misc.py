@@ -21,9 +21,13 @@ class HasRepr(ABC):
 
 
 class HasLogger(ABC):
-    def __init__(self, *args, **kwargs):
-        self._logger = logging.getLogger(name=self.__class__.__name__)
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
+    # Resolved once per class in __init_subclass__, named after the class like before
+    _logger: logging.Logger
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._logger = logging.getLogger(name=cls.__name__)
 
 
 def setup_logger(
@@ -1,5 +1,6 @@
 from abc import ABC
-from typing import TYPE_CHECKING, TypeVar, TypeAlias
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TypeVar, TypeAlias
 
 from autosar.misc import HasLogger
 
@@ -7,12 +8,65 @@ if TYPE_CHECKING:
     from autosar.workspace import Workspace
 
 
+# Slot descriptors of every class in the MRO of a class, see instance_attributes()
+_slot_descriptors: dict[type, tuple] = {}
+
+
+def instance_attributes(obj: object) -> Iterator[tuple[str, Any]]:
+    """
+    Yields the name and value of every instance attribute of obj, the ones stored in __slots__ first.
+    Works like vars(obj).items() for classes with and without __slots__, unset slots are skipped.
+    """
+    cls = type(obj)
+    descriptors = _slot_descriptors.get(cls)
+    if descriptors is None:
+        descriptors = _slot_descriptors[cls] = tuple(
+            (name, klass.__dict__[name])
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get('__slots__', ())
+            if name not in ('__dict__', '__weakref__')
+        )
+    for name, descriptor in descriptors:
+        try:
+            yield name, descriptor.__get__(obj, cls)
+        except AttributeError:
+            continue
+    instance_dict = getattr(obj, '__dict__', None)
+    if instance_dict is not None:
+        yield from instance_dict.items()
+
+
 class ArObject(HasLogger, ABC):
     """Base class for all Autosar objects"""
+    __slots__ = ()
     _repr_exclude = ('parent', 'package_parser', 'package_writer')
+    # Properties listed ahead of the public instance attributes in repr()
+    _repr_properties = ()
+    # Cached ref of classes that track changes of their name and parent, None if not cached.
+    # Children only cache their ref while their parent has one cached, see _drop_ref_cache()
+    _ref_cache = None
     ref = None
     name = None
 
+    def _ref_children(self) -> Iterable['ArObject']:
+        """
+        Returns the objects whose ref is derived from the ref of this object
+        """
+        return ()
+
+    def _drop_ref_cache(self):
+        """
+        Drops the cached ref of this object and of the objects below it. As a ref is only cached below an object
+        with a cached ref, objects without one end the walk.
+        """
+        pending = [self]
+        while pending:
+            obj = pending.pop()
+            if obj._ref_cache is None:
+                continue
+            obj._ref_cache = None
+            pending.extend(obj._ref_children())
+
     def root_ws(self) -> 'Workspace':
         raise NotImplementedError
 
@@ -20,9 +74,10 @@ class ArObject(HasLogger, ABC):
         raise NotImplementedError
 
     def __repr__(self):
+        properties = ((n, getattr(self, n)) for n in self._repr_properties)
         params_str = ', '.join(
             f'{n}={v!r}'
-            for n, v in vars(self).items()
+            for n, v in chain(properties, instance_attributes(self))
             if not callable(v)
             and not n.startswith('_')
             and n not in self._repr_exclude
@@ -6,6 +6,9 @@ T = TypeVar('T', bound=ArObject)
 
 
 class Variants(Generic[T]):
+    # Subclasses declare the _variants slot, so they can also derive from a base with non-empty slots like Element
+    __slots__ = ()
+
     def __init__(self, variants: Iterable[T], *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._variants = tuple(variants)
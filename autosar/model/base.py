@@ -3,8 +3,8 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, TYPE_CHECKING, TypeVar
-from xml.etree.ElementTree import ElementTree, Element
+from typing import Iterable, Iterator, TYPE_CHECKING, TypeVar
+from xml.etree.ElementTree import ElementTree, Element, TreeBuilder, XMLParser
 
 from autosar.model.ar_object import ArObject
 from autosar.model.atp_variation import Variants
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from autosar.model.element import Element as ArElement
 
 p_version = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+p_default_namespace = re.compile(rb'\sxmlns\s*=\s*["\']([^"\']*)["\']')
 
 
 class Limit:
@@ -28,6 +29,8 @@ class IntLimit(int, Limit):
 
 
 class AdminData(ArObject):
+    __slots__ = ('special_data_groups',)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.special_data_groups: list[SpecialDataGroup] = []
@@ -60,6 +63,8 @@ class AdminData(ArObject):
 
 
 class SpecialDataGroup(ArObject):
+    __slots__ = ('sdg_gid', 'sdg', 'sd')
+
     def __init__(self, sdg_gid: str, sd: str | None = None, sd_gid: str | None = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.sdg_gid = sdg_gid
@@ -105,6 +110,8 @@ class SpecialDataGroup(ArObject):
 
 
 class SpecialData(ArObject):
+    __slots__ = ('text', 'gid')
+
     def __init__(self, text: str, gid: str, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.text = text
@@ -148,6 +155,68 @@ def get_xml_namespace(element: Element):
     return m.group(1) if m else None
 
 
+class NamespaceFreeReader:
+    """
+    Reads an XML file in chunks with the default namespace declaration of the root element removed.
+    The parser fed with these chunks emits tags without the '{namespace}' prefix,
+    so no separate pass over the parsed tree is needed to strip it.
+    The removed namespace is available in the namespace attribute once the first chunk has been read.
+    """
+
+    def __init__(self, filename: Path, chunk_size: int = 1 << 20):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.namespace: str | None = None
+
+    def __iter__(self) -> Iterator[bytes]:
+        with open(self.filename, 'rb') as fh:
+            head = fh.read(self.chunk_size)
+            root_start = self._find_root_start(head)
+            while (root_end := head.find(b'>', root_start)) < 0:
+                chunk = fh.read(self.chunk_size)
+                if not chunk:
+                    break
+                head += chunk
+                root_start = self._find_root_start(head)
+            if root_start >= 0 and root_end >= 0:
+                m = p_default_namespace.search(head, root_start, root_end)
+                if m is not None:
+                    self.namespace = m.group(1).decode()
+                    head = head[:m.start()] + head[m.end():]
+            yield head
+            while chunk := fh.read(self.chunk_size):
+                yield chunk
+
+    @staticmethod
+    def _find_root_start(head: bytes) -> int:
+        """Returns position of the first start tag which is not a declaration, comment or processing instruction"""
+        pos = 0
+        while (pos := head.find(b'<', pos)) >= 0:
+            if head[pos + 1:pos + 2] not in (b'?', b'!', b''):
+                return pos
+            pos += 1
+        return -1
+
+
+def parse_xml_file_without_namespace(filename: Path) -> tuple[Element, str | None]:
+    """
+    Parses XML file emitting namespace-free tags directly.
+    Returns root element and the stripped namespace
+    """
+    reader = NamespaceFreeReader(filename)
+    parser = XMLParser(target=TreeBuilder())
+    for chunk in reader:
+        parser.feed(chunk)
+    xml_root = parser.close()
+    namespace = reader.namespace
+    if namespace is None:
+        # Root element uses prefixed namespace, fall back to stripping after parsing
+        namespace = get_xml_namespace(xml_root)
+        if namespace is not None:
+            remove_namespace(xml_root, namespace)
+    return xml_root, namespace
+
+
 def split_ref(ref: str):
     """splits an autosar url string into an array"""
     if isinstance(ref, str):
@@ -343,6 +412,20 @@ def find_unique_name_in_list(element_list: list[ArElement], base_name: str):
 
 
 class SwDataDefProps(ArObject):
+    __slots__ = (
+        'base_type_ref',
+        'sw_calibration_access',
+        'sw_address_method_ref',
+        'sw_record_layout_ref',
+        'compu_method_ref',
+        'data_constraint_ref',
+        'implementation_type_ref',
+        'sw_pointer_target_props',
+        'unit_ref',
+        '_sw_impl_policy',
+        'parent',
+    )
+
     @staticmethod
     def tag(*_):
         return 'SW-DATA-DEF-PROPS-CONDITIONAL'
@@ -416,7 +499,7 @@ class SwDataDefProps(ArObject):
 
 
 class SwDataDefPropsVariants(Variants[SwDataDefProps]):
-    pass
+    __slots__ = ('_variants',)
 
 
 class SwPointerTargetProps:
@@ -26,6 +26,8 @@ from autosar.model.portinterface import SenderReceiverInterface, ParameterInterf
 
 # --------------------------------------- Events --------------------------------------- #
 class Event(Element):
+    __slots__ = ('start_on_event_ref', 'mode_dependency', 'disabled_in_modes')
+
     parent: InternalBehaviorCommon
 
     def __init__(
@@ -69,6 +71,8 @@ class ModeSwitchEvent(Event):
 
 
 class TimingEvent(Event):
+    __slots__ = ('period',)
+
     def __init__(
             self,
             name: str,
@@ -310,6 +314,8 @@ class PortAPIOption:
 
 
 class DataReceivePoint:
+    __slots__ = ('port_ref', 'data_elem_ref', 'name', 'parent')
+
     def __init__(
             self,
             port_ref: str,
@@ -328,6 +334,8 @@ class DataReceivePoint:
 
 
 class DataSendPoint:
+    __slots__ = ('port_ref', 'data_elem_ref', 'name', 'parent')
+
     def __init__(
             self,
             port_ref: str,
@@ -345,6 +353,19 @@ class DataSendPoint:
 
 
 class RunnableEntity(Element):
+    __slots__ = (
+        'invoke_concurrently',
+        'min_start_interval',
+        'symbol',
+        'data_receive_points',
+        'data_send_points',
+        'server_call_points',
+        'exclusive_area_refs',
+        'mode_access_points',
+        'mode_switch_points',
+        'parameter_access_points',
+    )
+
     def __init__(
             self,
             name: str,
@@ -458,13 +479,6 @@ class RunnableEntity(Element):
             return None
         return self.parent.root_ws()
 
-    @property
-    def ref(self):
-        if self.parent is not None:
-            return self.parent.ref + '/%s' % self.name
-        else:
-            return None
-
 
 class DataElementInstanceRef:
     """
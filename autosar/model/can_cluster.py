@@ -16,6 +16,19 @@ class RxIdentifierRange(ArObject):
 
 
 class CanFrameTriggering(FrameTriggering):
+    __slots__ = (
+        'can_addressing_mode',
+        'identifier',
+        'can_frame_rx_behavior',
+        'can_frame_tx_behavior',
+        'rx_mask',
+        'tx_mask',
+        'j1939_requestable',
+        'rx_identifier_range',
+        'can_xl_frame_triggering_props',
+        'absolutely_scheduled_timing',
+    )
+
     def __init__(
             self,
             can_addressing_mode: str,
@@ -62,4 +75,4 @@ class CanCluster(CommunicationCluster):
 
 
 class CanClusterVariants(ElementVariants[CanCluster]):
-    pass
+    __slots__ = ()
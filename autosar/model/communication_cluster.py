@@ -1,4 +1,3 @@
-from itertools import chain
 from typing import Iterable
 
 from autosar.model.ar_object import ArObject
@@ -6,6 +5,8 @@ from autosar.model.element import Element
 
 
 class FrameTriggering(Element):
+    __slots__ = ('frame_ref', 'frame_ports_refs', 'pdu_triggerings_refs')
+
     def __init__(
             self,
             frame_ref: str,
@@ -50,6 +51,14 @@ class TriggerIPduSendCondition(ArObject):
 
 
 class PduTriggering(Element):
+    __slots__ = (
+        'i_pdu_ref',
+        'i_pdu_port_refs',
+        'i_signal_triggering_refs',
+        'sec_oc_crypto_mapping_ref',
+        'trigger_i_pdu_send_conditions',
+    )
+
     def __init__(
             self,
             i_pdu_ref: str,
@@ -89,17 +98,16 @@ class PhysicalChannel(Element):
         self.i_signal_triggerings = self._set_parent(i_signal_triggerings)
         self.pdu_triggerings = self._set_parent(pdu_triggerings)
         self.managed_physical_channels_refs = managed_physical_channels_refs
+        self._find_sets = (self.frame_triggerings, self.i_signal_triggerings, self.pdu_triggerings)
 
     def find(self, ref: str, role: str | None = None) -> Element | None:
         name, _, more = ref.partition('/')
-        # noinspection PyTypeChecker
-        referrables = chain(self.frame_triggerings, self.i_signal_triggerings, self.pdu_triggerings)
-        for element in referrables:
-            if element.name == name:
-                if more == '':
-                    return element
-                return element.find(more, role)
-        return None
+        element = self._find_child(name)
+        if element is None:
+            return None
+        if more == '':
+            return element
+        return element.find(more, role)
 
 
 class CommunicationCluster(Element):
@@ -116,12 +124,13 @@ class CommunicationCluster(Element):
         self.protocol_name = protocol_name
         self.protocol_version = protocol_version
         self.physical_channels = self._set_parent(physical_channels)
+        self._find_sets = (self.physical_channels,)
 
     def find(self, ref: str, role: str | None = None) -> Element | None:
         name, _, more = ref.partition('/')
-        for channel in self.physical_channels:
-            if channel.name == name:
-                if more == '':
-                    return channel
-                return channel.find(more, role)
-        return None
+        channel = self._find_child(name)
+        if channel is None:
+            return None
+        if more == '':
+            return channel
+        return channel.find(more, role)
@@ -6,20 +6,20 @@ from autosar.model.base import Limit
 
 
 class CompuConstContent(ArObject):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuConstFormulaContent(CompuConstContent):
     vfs: list[int | float]
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuConstNumericContent(CompuConstContent):
     v: int | float | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuConstTextContent(CompuConstContent):
     vt: str | None = None
 
@@ -27,32 +27,32 @@ class CompuConstTextContent(CompuConstContent):
 AnyCompuConstContent = TypeVar('AnyCompuConstContent', bound=CompuConstContent)
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuConst(ArObject):
     compu_const_content_type: AnyCompuConstContent | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuNumeratorDenominator(ArObject):
     vs: list[int | float] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuRationalCoeffs(ArObject):
     compu_numerator: CompuNumeratorDenominator | None = None
     compu_denominator: CompuNumeratorDenominator | None = None
 
 
 class CompuScaleContents(ArObject):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuScaleConstantContents(CompuScaleContents):
     compu_const: CompuConst | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CompuScaleRationalFormula(CompuScaleContents):
     compu_rational_coeffs: CompuRationalCoeffs | None = None
 
@@ -61,6 +61,18 @@ AnyCompuScaleContents = TypeVar('AnyCompuScaleContents', bound=CompuScaleContent
 
 
 class CompuScale(ArObject):
+    __slots__ = (
+        'lower_limit',
+        'upper_limit',
+        'short_label',
+        'symbol',
+        'mask',
+        'desc',
+        'compu_inverse_value',
+        'compu_scale_contents',
+        'a2l_display_text',
+    )
+
     def __init__(
             self,
             lower_limit: Limit | None = None,
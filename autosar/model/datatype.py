@@ -431,6 +431,7 @@ class CompuMethod(Element):
     """
     CompuMethod class
     """
+    __slots__ = ('unit_ref', 'int_to_phys', 'phys_to_int')
 
     @staticmethod
     def tag(*_):
@@ -511,6 +512,8 @@ class PhysicalConstraint(ConstraintBase):
 
 
 class DataConstraint(Element):
+    __slots__ = ('level', 'rules')
+
     @staticmethod
     def tag(*_):
         return 'DATA-CONSTR'
@@ -596,6 +599,9 @@ class DataConstraint(Element):
 
 
 class ImplementationDataTypeBase:
+    # Mixed into Element subclasses, which declare the variant_props slot themselves
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.variant_props: list[SwDataDefProps | SwPointerTargetProps] = []
@@ -632,6 +638,8 @@ class ImplementationDataTypeBase:
 
 
 class ImplementationDataType(Element, ImplementationDataTypeBase):
+    __slots__ = ('dynamic_array_size_profile', 'type_emitter', 'sub_elements', 'symbol_props', 'variant_props')
+
     @staticmethod
     def tag(*_):
         return 'IMPLEMENTATION-DATA-TYPE'
@@ -708,6 +716,8 @@ class SwBaseType(Element):
 
 
 class ImplementationDataTypeElement(Element, ImplementationDataTypeBase):
+    __slots__ = ('array_size', 'array_size_semantics', 'variant_props')
+
     @staticmethod
     def tag(*_):
         return 'IMPLEMENTATION-DATA-TYPE-ELEMENT'
@@ -758,6 +768,7 @@ class ApplicationDataType(Element):
     parent: parent object instance (usually the package it will belong to), (object)
     adminData: <ADMIN-DATA> (instance of autosar.base.AdminData or dict)
     """
+    __slots__ = ('variant_props',)
 
     def __init__(
             self,
@@ -801,6 +812,7 @@ class ApplicationPrimitiveDataType(ApplicationDataType):
     Arguments:
     (see base class)
     """
+    __slots__ = ()
 
     @staticmethod
     def tag(*_):
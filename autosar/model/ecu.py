@@ -24,6 +24,8 @@ class EcuPartition(Element):
 
 
 class CommPort(Element):
+    __slots__ = ('communication_direction',)
+
     def __init__(
             self,
             communication_direction: str,
@@ -37,10 +39,17 @@ AnyCommPort = TypeVar('AnyCommPort', bound=CommPort)
 
 
 class FramePort(CommPort):
-    pass
+    __slots__ = ()
 
 
 class IPduPort(CommPort):
+    __slots__ = (
+        'i_pdu_signal_processing',
+        'timestamp_rx_acceptance_window',
+        'rx_security_verification',
+        'use_auth_data_freshness',
+    )
+
     def __init__(
             self,
             i_pdu_signal_processing: str | None = None,
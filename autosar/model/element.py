@@ -6,6 +6,23 @@ from autosar.model.base import AdminData, SwDataDefProps, create_admin_data
 
 
 class Element(ArObject):
+    _repr_properties = ('name',)
+    # desc_attr and long_name_attr stay unset unless a parser applies a DESC or LONG-NAME
+    __slots__ = (
+        '_name',
+        '_parent',
+        '_ref_cache',
+        '_find_sets',
+        '_find_index',
+        'desc',
+        'desc_attr',
+        'long_name',
+        'long_name_attr',
+        'admin_data',
+        'category',
+        'uuid',
+    )
+
     def __init__(
             self,
             name: str | None,
@@ -18,20 +35,39 @@ class Element(ArObject):
             *args, **kwargs,
     ):
         super().__init__(*args, **kwargs)
-        if isinstance(admin_data, dict):
-            admin_data_obj = create_admin_data(admin_data)
-        else:
-            admin_data_obj = admin_data
-        if (admin_data_obj is not None) and not isinstance(admin_data_obj, AdminData):
-            raise ValueError('adminData must be of type dict or autosar.base.AdminData')
-        self.name = name
+        if admin_data is not None and type(admin_data) is not AdminData:
+            # Parsers pass None or a ready AdminData, only other callers need the conversion
+            admin_data = self._convert_admin_data(admin_data)
+        self._name = name
+        self._parent = parent
+        self._ref_cache: str | None = None
+        self._find_sets: Sequence[list[Element] | Element | None] = ()
+        self._find_index: tuple[Sequence, dict[str, tuple[Element, int, int]]] | None = None
         self.desc = desc
         self.long_name = long_name
-        self.admin_data = admin_data_obj
+        self.admin_data = admin_data
         self.category = category
         self.uuid = uuid
-        self._parent = parent
-        self._find_sets: Sequence[list[Element] | Element | None] = ()
+
+    @staticmethod
+    def _convert_admin_data(admin_data: AdminData | dict) -> AdminData:
+        if isinstance(admin_data, dict):
+            return create_admin_data(admin_data)
+        if not isinstance(admin_data, AdminData):
+            raise ValueError('adminData must be of type dict or autosar.base.AdminData')
+        return admin_data
+
+    @property
+    def name(self) -> str | None:
+        return self._name
+
+    @name.setter
+    def name(self, value: str | None):
+        if value != self._name:
+            self._drop_ref_cache()
+            if isinstance(self._parent, Element):
+                self._parent._find_index = None
+        self._name = value
 
     @property
     def parent(self):
@@ -39,34 +75,86 @@ class Element(ArObject):
 
     @parent.setter
     def parent(self, obj: ArObject):
+        if obj is not self._parent:
+            self._drop_ref_cache()
         self._parent = obj
         self._set_children_parent()
 
     def _set_children_parent(self):
         pass
 
-    def find(self, ref: str, role: str | None = None):
-        name, _, tail = ref.partition('/')
-        for subset in self._find_sets:
+    def _ref_children(self) -> Iterable[ArObject]:
+        from autosar.model.index import iter_child_elements
+        return iter_child_elements(self)
+
+    def _find_child(self, name: str) -> 'Element | None':
+        """
+        Returns the first child named name from self._find_sets.
+        The name map records where each child was found. A hit is trusted only while that position still holds the
+        child under the same name, a stale hit or a miss rebuilds the map and looks again, so replacing, inserting,
+        removing or sorting children needs no explicit invalidation.
+        """
+        find_sets = self._find_sets
+        cached = self._find_index
+        rebuilt = cached is None or cached[0] is not find_sets
+        if rebuilt:
+            cached = self._find_index = (find_sets, self._build_find_index(find_sets))
+        while True:
+            entry = cached[1].get(name)
+            if entry is not None:
+                element, subset, position = entry
+                if element.name == name and self._child_at(find_sets[subset], position) is element:
+                    return element
+            if rebuilt:
+                return None
+            rebuilt = True
+            cached = self._find_index = (find_sets, self._build_find_index(find_sets))
+
+    @staticmethod
+    def _child_at(subset: 'list[Element] | Element | None', position: int) -> 'Element | None':
+        if position < 0:
+            return subset
+        if position < len(subset):
+            return subset[position]
+        return None
+
+    @staticmethod
+    def _build_find_index(find_sets: Sequence) -> dict[str, tuple['Element', int, int]]:
+        index = {}
+        for i, subset in enumerate(find_sets):
             if subset is None:
                 continue
-            if not isinstance(subset, list) and subset.name == name:
-                if len(tail) > 0:
-                    return subset.find(tail)
-                return subset
-            for element in subset:
-                if element.name == name:
-                    if len(tail) > 0:
-                        return element.find(tail)
-                    return element
+            if not isinstance(subset, list):
+                index.setdefault(subset.name, (subset, i, -1))
+                continue
+            for position, element in enumerate(subset):
+                index.setdefault(element.name, (element, i, position))
+        return index
+
+    def find(self, ref: str, role: str | None = None):
+        name, _, tail = ref.partition('/')
+        element = self._find_child(name)
+        if element is not None:
+            if len(tail) > 0:
+                return element.find(tail)
+            return element
         ws = self.root_ws()
         return ws.find(ref, role)
 
     @property
     def ref(self):
-        if self.parent is not None and self.name is not None:
-            return f'{self.parent.ref}/{self.name}'
-        return None
+        cache = self._ref_cache
+        if cache is not None:
+            return cache
+        parent = self._parent
+        name = self.name
+        if parent is None or name is None:
+            return None
+        parent_ref = parent.ref
+        ref = f'{parent_ref}/{name}'
+        if parent._ref_cache is not None:
+            self._ref_cache = ref
+        return ref
 
     def root_ws(self):
         if self.parent is None:
@@ -76,6 +164,13 @@ class Element(ArObject):
     def __deepcopy__(self, memo):
         raise NotImplementedError(type(self))
 
+    def __getstate__(self):
+        # Cached refs are only valid within the process that computed them
+        state, slot_state = super().__getstate__()
+        slot_state['_ref_cache'] = None
+        slot_state['_find_index'] = None
+        return state, slot_state
+
     def _set_parent(self, sub_elements: Iterable[T] | None, parent: ArObject | None = None) -> list[T]:
         if sub_elements is None:
             return []
@@ -229,6 +324,8 @@ class SoftwareAddressMethod(Element):
 
 
 class ElementVariants(Element, Variants[T]):
+    __slots__ = ('_variants',)
+
     def find(self, ref: str, role: str | None = None) -> Element | None:
         for element_variant in self._variants:
             elem = element_variant.find(ref)
@@ -152,6 +152,8 @@ class ISignalTriggeringRefConditional(ArObject):
 
 
 class PduTriggering(Element):
+    __slots__ = ('i_signal_port_refs', 'i_signal_ref', 'i_signal_triggerings')
+
     def __init__(
             self,
             i_pdu_port_refs: list[str] | None = None,
@@ -4,6 +4,8 @@ from autosar.model.element import Element
 
 
 class PduToFrameMapping(Element):
+    __slots__ = ('packing_byte_order', 'pdu_ref', 'start_position', 'update_indication_bit_position')
+
     def __init__(
             self,
             packing_byte_order: str,
@@ -20,6 +22,8 @@ class PduToFrameMapping(Element):
 
 
 class Frame(Element):
+    __slots__ = ('frame_length', 'pdu_to_frame_mappings')
+
     def __init__(
             self,
             frame_length: int,
@@ -33,7 +37,7 @@ class Frame(Element):
 
 
 class CanFrame(Frame):
-    pass
+    __slots__ = ()
 
 
 class FlexrayFrame(Frame):
@@ -0,0 +1,182 @@
+from typing import Iterator
+
+from autosar.model.ar_object import ArObject, instance_attributes
+from autosar.model.atp_variation import Variants
+from autosar.model.element import Element
+from autosar.model.package import Package
+
+# Back references and caches that would lead out of an element or visit its children twice
+_skipped_attributes = frozenset(('parent', '_parent', '_find_sets', '_find_index', '_ref_cache'))
+
+
+def iter_references(element: Element) -> Iterator[tuple[str, Element]]:
+    """
+    Yields (ref, referrer) for every string held in a *_ref attribute or in the list of a *_refs attribute
+    of element or of any object nested in it. The referrer is the innermost element holding the reference,
+    e.g. the ISignalToIPduMapping for the i_signal_ref below an ISignalIPdu, or the element itself for
+    the refs of its SwDataDefProps. Other elements of a package are not entered when element points at them
+    through an object reference, their references belong to themselves.
+    """
+    ws = element.root_ws()
+    seen = {id(element)}
+    pending: list[tuple[object, Element]] = [(element, element)]
+    while pending:
+        obj, owner = pending.pop()
+        nested = []
+        for name, value in instance_attributes(obj):
+            if name in _skipped_attributes or value is None:
+                continue
+            if isinstance(value, str):
+                if name.endswith('_ref'):
+                    yield value, owner
+                continue
+            if name.endswith('_refs') and isinstance(value, (list, tuple)):
+                for item in value:
+                    if isinstance(item, str):
+                        yield item, owner
+                    else:
+                        nested.extend(_nested_objects(item))
+                continue
+            nested.extend(_nested_objects(value))
+        children = []
+        for item in nested:
+            if id(item) in seen or item is ws or isinstance(item, Package) or _is_package_element(item):
+                continue
+            seen.add(id(item))
+            children.append((item, item if isinstance(item, Element) else owner))
+        # Pushed in reverse so that nested objects are visited in attribute order
+        pending.extend(reversed(children))
+
+
+def iter_child_elements(element: Element) -> Iterator[Element]:
+    """
+    Yields the named elements nested in element that are not nested in another named element below it,
+    e.g. the ports and the internal behavior of a component. Package elements element holds an object
+    reference to are left out.
+    """
+    ws = element.root_ws()
+    seen = {id(element)}
+    pending: list[object] = [element]
+    while pending:
+        obj = pending.pop()
+        nested = []
+        for name, value in instance_attributes(obj):
+            if name in _skipped_attributes or value is None or isinstance(value, str):
+                continue
+            nested.extend(_nested_objects(value))
+        containers = []
+        for item in nested:
+            if id(item) in seen or item is ws or isinstance(item, Package) or _is_package_element(item):
+                continue
+            seen.add(id(item))
+            # The alternatives of ElementVariants share name and parent with it, their children are looked at instead
+            if isinstance(item, Element) and item.name is not None and (item.name != element.name or item.parent is not element.parent):
+                yield item
+            else:
+                containers.append(item)
+        pending.extend(reversed(containers))
+
+
+def _is_package_element(obj: object) -> bool:
+    if not isinstance(obj, Element):
+        return False
+    parent = obj.parent
+    return isinstance(parent, Package) and parent.map['elements'].get(obj.name) is obj
+
+
+def _nested_objects(value: object) -> Iterator[object]:
+    """
+    Yields the model objects in value, which is either a model object or a container of model objects
+    """
+    if isinstance(value, (list, tuple, set, frozenset, Variants)):
+        for item in value:
+            yield from _nested_objects(item)
+    elif isinstance(value, ArObject) or type(value).__module__.startswith('autosar.'):
+        yield value
+
+
+class ReferrerIndex:
+    """
+    Inverted index from a reference to the elements referring to it, see Workspace.referrers().
+    Elements are added and removed as a whole, together with everything nested in them.
+    """
+
+    def __init__(self):
+        self._referrers: dict[str, list[Element]] = {}
+        # id of every added element -> (element, (ref, referrer) pairs found by iter_references)
+        self._sources: dict[int, tuple[Element, list[tuple[str, Element]]]] = {}
+
+    def __len__(self):
+        return len(self._referrers)
+
+    def get(self, ref: str) -> list[Element]:
+        return list(self._referrers.get(ref, ()))
+
+    def add(self, element: Element):
+        if id(element) in self._sources:
+            self.remove(element)
+        pairs = list({(ref, id(referrer)): (ref, referrer) for ref, referrer in iter_references(element)}.values())
+        self._sources[id(element)] = (element, pairs)
+        for ref, referrer in pairs:
+            self._referrers.setdefault(ref, []).append(referrer)
+
+    def add_package(self, package: Package):
+        for element in package.elements:
+            self.add(element)
+        for sub_package in package.sub_packages:
+            self.add_package(sub_package)
+
+    def remove(self, element: Element):
+        source = self._sources.pop(id(element), None)
+        if source is None:
+            return
+        for ref, referrer in source[1]:
+            referrers = self._referrers[ref]
+            for i, candidate in enumerate(referrers):
+                if candidate is referrer:
+                    del referrers[i]
+                    break
+            if len(referrers) == 0:
+                del self._referrers[ref]
+
+    def remove_package(self, package: Package):
+        # Elements still pending in the lazy XML of a package were never added
+        for element in package._elements:
+            self.remove(element)
+        for sub_package in package.sub_packages:
+            self.remove_package(sub_package)
+
+
+class TypeIndex:
+    """
+    Registry of package elements per class, see Workspace.instances_of().
+    """
+
+    def __init__(self):
+        # class -> {id of element: element}, in the order the elements were added
+        self._instances: dict[type, dict[int, Element]] = {}
+
+    def __len__(self):
+        return sum(len(instances) for instances in self._instances.values())
+
+    def add(self, element: Element):
+        self._instances.setdefault(type(element), {})[id(element)] = element
+
+    def remove(self, element: Element):
+        instances = self._instances.get(type(element))
+        if instances is not None and instances.pop(id(element), None) is not None and len(instances) == 0:
+            del self._instances[type(element)]
+
+    def iter(self, cls: type, include_subclasses: bool = True) -> Iterator[Element]:
+        """
+        Yields the elements of class cls, or of cls and its subclasses. Every class is copied before its
+        elements are yielded, elements may therefore be added or deleted while iterating.
+        """
+        if include_subclasses:
+            classes = [registered for registered in self._instances if issubclass(registered, cls)]
+        else:
+            classes = [cls]
+        for registered in classes:
+            instances = self._instances.get(registered)
+            if instances is not None:
+                yield from tuple(instances.values())
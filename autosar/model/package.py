@@ -1,8 +1,8 @@
 import copy
 import decimal
-import re
 from fractions import Fraction
-from typing import Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, Sequence
+from xml.etree.ElementTree import Element as XmlElement
 
 from autosar.model.ar_object import ArObject
 from autosar.model.base import (
@@ -72,32 +72,124 @@ from autosar.model.portinterface import (
 )
 
 
+if TYPE_CHECKING:
+    from autosar.parser.package_parser import PackageParser, TagFilter
+
 class Package(ArObject):
     package_name = None
+    _repr_properties = ('name',)
 
     def __init__(self, name: str, parent: ArObject | None = None, role: str | None = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.name = name
-        self.elements: list[Element] = []
+        self._name = name
+        self._parent = parent
+        self._ref_cache: str | None = None
+        self._elements: list[Element] = []
+        # AR-PACKAGE nodes whose elements are parsed on first access, see materialize()
+        self._lazy_xml: list[tuple['PackageParser', XmlElement, 'TagFilter | None']] = []
         self.sub_packages: list[Package] = []
-        self.parent = parent
         self.role = role
         self.map = {'elements': {}, 'packages': {}}
         self.unhandled_parser = set()  # [PackageParser] unhandled
+        self.skipped_tags = set()  # [PackageParser] excluded by the tag filter of load_xml()
         self.unhandled_writer = set()  # [PackageWriter] Unhandled
 
+    def __getstate__(self):
+        # Cached refs are only valid within the process that computed them
+        state = self.__dict__.copy()
+        state['_ref_cache'] = None
+        return state
+
     def __getitem__(self, key):
         if isinstance(key, str):
             return self.find(key)
         else:
             raise ValueError('Expected string')
 
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        if value != self._name:
+            self._drop_ref_cache()
+        self._name = value
+
+    @property
+    def parent(self) -> ArObject | None:
+        return self._parent
+
+    @parent.setter
+    def parent(self, obj: ArObject | None):
+        if obj is not self._parent:
+            self._drop_ref_cache()
+        self._parent = obj
+
+    def _ref_children(self) -> Iterable[ArObject]:
+        # Elements still pending in _lazy_xml have not been created, let alone cached their ref
+        return [*self._elements, *self.sub_packages]
+
+    @property
+    def elements(self) -> list[Element]:
+        if self._lazy_xml:
+            self.materialize()
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements: list[Element]):
+        self._lazy_xml = []
+        self._elements = elements
+
+    def add_lazy_xml(self, package_parser: 'PackageParser', xml_package: XmlElement, tag_filter: 'TagFilter | None' = None):
+        """
+        Records an AR-PACKAGE node whose elements are parsed the first time the elements of this package are needed
+        """
+        self._lazy_xml.append((package_parser, xml_package, tag_filter))
+
+    def materialize(self):
+        """
+        Parses the elements of all AR-PACKAGE nodes recorded with add_lazy_xml()
+        """
+        if not self._lazy_xml:
+            return
+        lazy_xml, self._lazy_xml = self._lazy_xml, []
+        for package_parser, xml_package, tag_filter in lazy_xml:
+            package_parser.load_elements(self, xml_package, tag_filter)
+        ws = self.root_ws()
+        if ws is not None:
+            ws.unhandled_parser = ws.unhandled_parser.union(self.unhandled_parser)
+            ws.skipped_tags = ws.skipped_tags.union(self.skipped_tags)
+
+    def _element_names(self) -> list[str]:
+        """
+        Returns the element names without parsing pending AR-PACKAGE nodes
+        """
+        names = [x.name for x in self._elements]
+        for package_parser, xml_package, tag_filter in self._lazy_xml:
+            for xml_element in xml_package.findall('./ELEMENTS/*'):
+                if xml_element.tag not in package_parser.switcher:
+                    continue
+                if tag_filter is not None and xml_element.tag not in tag_filter:
+                    continue
+                name = xml_element.findtext('SHORT-NAME')
+                if name is not None and name not in names:
+                    names.append(name)
+        return names
+
     @property
     def ref(self):
-        if self.parent is not None:
-            return f'{self.parent.ref}/{self.name}'
-        else:
+        cache = self._ref_cache
+        if cache is not None:
+            return cache
+        parent = self._parent
+        if parent is None:
             return None
+        parent_ref = parent.ref
+        ref = f'{parent_ref}/{self.name}'
+        if parent._ref_cache is not None:
+            self._ref_cache = ref
+        return ref
 
     def find(self, ref: str):
         if ref.startswith('/'):
@@ -110,6 +202,8 @@ class Package(ArObject):
                 return package.find(ref[2])
             else:
                 return package
+        if self._lazy_xml:
+            self.materialize()
         if name in self.map['elements']:
             elem: Element = self.map['elements'][name]
             if len(ref[2]) > 0:
@@ -118,40 +212,28 @@ class Package(ArObject):
                 return elem
         return None
 
-    def findall(self, ref: str):
+    def findall(self, ref: str, cls: type | None = None):
         """
-        experimental find-method that has some rudimentary support for globs.
+        Returns the list of objects whose reference relative to this package matches the pattern ref,
+        see Workspace.iterfind()
         """
         if ref is None:
             return None
-        if ref[0] == '/':
-            ref = ref[1:]  # removes initial '/' if it exists
-        ref = ref.partition('/')
-        if ref[0] == '*' and len(ref[2]) == 0:
-            result = list(self.elements)
-            result.extend(self.sub_packages)
-        else:
-            result = []
-            for item in (self.elements + self.sub_packages):
-                if item.name == ref[0] or ref[0] == '*':
-                    if len(ref[2]) > 0:
-                        result.extend(item.findall(ref[2]))
-                    else:
-                        result.append(item)
-            if (len(result) == 0) and ('*' in ref[0]):
-                p = re.compile(ref[0].replace('*', '.*'))
-                for item in (self.elements + self.sub_packages):
-                    m = p.match(item.name)
-                    if m is not None:
-                        if len(ref[2]) > 0:
-                            result.extend(item.findall(ref[2]))
-                        else:
-                            result.append(item)
-        return result
+        return list(self.iterfind(ref, cls))
+
+    def iterfind(self, ref: str, cls: type | None = None) -> Iterator:
+        """
+        Yields the packages and elements whose reference relative to this package matches the pattern ref,
+        see Workspace.iterfind()
+        """
+        # Imported here, the query module depends on this one
+        from autosar.model.query import compile_pattern, iter_matches
+        ws = self.root_ws()
+        return iter_matches(self, compile_pattern(ref), cls, None if ws is None else ws.type_index)
 
     def dir(self, ref: str | None = None, prefix: str = ''):
         if ref is None:
-            return [prefix + x.name for x in self.sub_packages] + [prefix + x.name for x in self.elements]
+            return [prefix + x.name for x in self.sub_packages] + [prefix + name for name in self._element_names()]
         else:
             ref = ref.partition('/')
             result = self.find(ref[0])
@@ -166,13 +248,28 @@ class Package(ArObject):
         if ref[0] == '/':
             ref = ref[1:]  # removes initial '/' if it exists
         ref = ref.partition('/')
+        if ref[0] in self.map['packages']:
+            package: Package = self.map['packages'][ref[0]]
+            if len(ref[2]) > 0:
+                return package.delete(ref[2])
+            ws = self.root_ws()
+            if ws is not None:
+                ws.unindex_ref(package)
+            self.sub_packages.remove(package)
+            del self.map['packages'][ref[0]]
+            package.parent = None
+            return
         for i, element in enumerate(self.elements):
             if element.name == ref[0]:
                 if len(ref[2]) > 0:
                     return element.delete(ref[2])
                 else:
+                    ws = self.root_ws()
+                    if ws is not None:
+                        ws.unindex_ref(element)
                     del self.elements[i]
                     del self.map['elements'][ref[0]]
+                    element.parent = None
                     break
 
     def create_sender_receiver_interface(
@@ -356,6 +453,8 @@ class Package(ArObject):
 
     def append(self, elem: 'Element | Package'):
         """appends elem to the self.elements list"""
+        if self._lazy_xml and isinstance(elem, Element):
+            self.materialize()
         is_new_element = True
         if elem.name in self.map['elements']:
             is_new_element = False
@@ -378,6 +477,9 @@ class Package(ArObject):
                 self.map['packages'][elem.name] = elem
             else:
                 raise ValueError(f'Unexpected value type {type(elem)}')
+            ws = self.root_ws()
+            if ws is not None:
+                ws.index_ref(elem)
 
     def update(self, other: 'Package'):
         """copies/clones each element from other into self.elements"""
@@ -385,14 +487,19 @@ class Package(ArObject):
             for other_elem in other.elements:
                 new_elem = copy.deepcopy(other_elem)
                 assert (new_elem is not None)
+                ws = self.root_ws()
                 try:
                     i = self.index('elements', other_elem.name)
                     old_elem = self.elements[i]
+                    if ws is not None:
+                        ws.unindex_ref(old_elem)
                     self.elements[i] = new_elem
                     old_elem.parent = None
                 except ValueError:
                     self.elements.append(new_elem)
                 new_elem.parent = self
+                if ws is not None:
+                    ws.index_ref(new_elem)
         else:
             raise ValueError('Cannot update from object of different type')
 
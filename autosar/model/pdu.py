@@ -159,6 +159,15 @@ class IPduTiming(Describable):
 
 
 class ISignalToIPduMapping(Element):
+    __slots__ = (
+        'i_signal_ref',
+        'i_signal_group_ref',
+        'packing_byte_order',
+        'start_position',
+        'transfer_property',
+        'update_indication_bit_position',
+    )
+
     def __init__(
             self,
             i_signal_ref: str | None = None,
@@ -182,6 +191,8 @@ class ISignalToIPduMapping(Element):
 
 # Abstract
 class Pdu(Element):
+    __slots__ = ('length', 'has_dynamic_length')
+
     def __init__(
             self,
             length: int | None = None,
@@ -226,6 +237,8 @@ class UserDefinedPdu(Pdu):
 
 # Abstract
 class IPdu(Pdu):
+    __slots__ = ('contained_i_pdu_props',)
+
     def __init__(
             self,
             contained_i_pdu_props: ContainedIPduProps | None = None,
@@ -282,6 +295,8 @@ class GeneralPurposeIPdu(IPdu):
 
 
 class ISignalIPdu(IPdu):
+    __slots__ = ('unused_bit_pattern', 'i_pdu_timing_specifications', 'i_signal_to_pdu_mappings')
+
     def __init__(
             self,
             unused_bit_pattern: int,
@@ -399,6 +414,8 @@ class ISignalIPduGroup(Element):
 
 
 class SoConIPduIdentifier(Element):
+    __slots__ = ('header_id', 'pdu_triggering_ref')
+
     def __init__(
             self,
             header_id: int | None = None,
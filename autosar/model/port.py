@@ -38,6 +38,8 @@ valid_com_spec_arguments_ar3 = set().union(sender_receiver_com_spec_arguments_ar
 
 
 class Port(Element):
+    __slots__ = ('com_spec', 'port_interface_ref')
+
     parent: ComponentType
 
     def __init__(
@@ -344,6 +346,8 @@ class Port(Element):
 
 
 class RequirePort(Port):
+    __slots__ = ()
+
     @staticmethod
     def tag(*_):
         return "R-PORT-PROTOTYPE"
@@ -381,6 +385,8 @@ class RequirePort(Port):
 
 
 class ProvidePort(Port):
+    __slots__ = ()
+
     @staticmethod
     def tag(*_):
         return "P-PORT-PROTOTYPE"
@@ -0,0 +1,209 @@
+import re
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Iterator
+
+from autosar.model.element import Element
+from autosar.model.index import TypeIndex, iter_child_elements
+from autosar.model.package import Package
+
+_glob_characters = frozenset('*?[')
+
+
+class _AnyDepth:
+    """
+    Segment standing for '**', zero or more package levels
+    """
+
+    def __repr__(self):
+        return '**'
+
+
+ANY_DEPTH = _AnyDepth()
+# Segment standing for '*', any name
+ANY_NAME = re.compile('[^/]*')
+
+
+def _translate(glob: str) -> str:
+    """
+    Translates a glob for one path segment into a regular expression.
+    Supports '*', '?' and character classes like [0-9] or [!_], an unterminated '[' is taken literally.
+    """
+    parts = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        c = glob[i]
+        i += 1
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and glob[j] in '!^':
+                j += 1
+            if j < n and glob[j] == ']':
+                j += 1
+            j = glob.find(']', j)
+            if j < 0:
+                parts.append(re.escape(c))
+                continue
+            body = glob[i:j].replace('\\', '\\\\')
+            i = j + 1
+            if body[0] == '!':
+                body = f'^{body[1:]}'
+            parts.append(f'[{body}]')
+        else:
+            parts.append(re.escape(c))
+    return ''.join(parts)
+
+
+class PathPattern:
+    """
+    A findall() pattern compiled into one matcher per path segment.
+    A segment is either a name, a glob with '*', '?' and character classes, or '**' for zero or more package levels.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        segments = []
+        for part in pattern.strip('/').split('/'):
+            if part == '**':
+                if len(segments) == 0 or segments[-1] is not ANY_DEPTH:
+                    segments.append(ANY_DEPTH)
+            elif part == '*':
+                segments.append(ANY_NAME)
+            elif _glob_characters.isdisjoint(part):
+                segments.append(part)
+            else:
+                segments.append(re.compile(_translate(part)))
+        self.segments: tuple[str | re.Pattern | _AnyDepth, ...] = tuple(segments)
+        self.any_depth_count = segments.count(ANY_DEPTH)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.pattern!r})'
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> PathPattern:
+    return PathPattern(pattern)
+
+
+def iter_matches(root, pattern: PathPattern, cls: type | None = None, type_index: TypeIndex | None = None) -> Iterator:
+    """
+    Yields the objects below root, a workspace, package or element, whose path relative to root matches pattern.
+    With cls only instances of cls are yielded. Given a type_index, a pattern ending with '**/<name>' and a cls
+    derived from Element takes its candidates from type_index instead of walking all packages below,
+    these are yielded in the order they were added to the workspace.
+    """
+    if cls is None or not issubclass(cls, Element):
+        type_index = None
+    matches = _walk(root, pattern.segments, 0, cls, type_index)
+    if pattern.any_depth_count == 0:
+        return matches
+    return _unique(matches, root)
+
+
+def _unique(matches: Iterable, root) -> Iterator:
+    """
+    Leaves out root, matched by a trailing '**', and objects matched more than once through several '**'
+    """
+    seen = {id(root)}
+    for item in matches:
+        if id(item) not in seen:
+            seen.add(id(item))
+            yield item
+
+
+def _walk(node, segments: tuple, i: int, cls: type | None, type_index: TypeIndex | None) -> Iterator:
+    if i == len(segments):
+        if cls is None or isinstance(node, cls):
+            yield node
+        return
+    segment = segments[i]
+    if segment is ANY_DEPTH:
+        if type_index is not None and i == len(segments) - 2 and not isinstance(node, Element):
+            node_ref = node.ref
+            if node_ref is not None:
+                yield from _indexed(node, node_ref, segments[-1], cls, type_index)
+                return
+        yield from _walk(node, segments, i + 1, cls, type_index)
+        for package in _sub_packages(node):
+            yield from _walk(package, segments, i, cls, type_index)
+        return
+    if isinstance(segment, str):
+        children = _named_children(node, segment)
+    elif segment is ANY_NAME:
+        children = _children(node)
+    else:
+        match = segment.fullmatch
+        children = (child for child in _children(node) if match(child.name) is not None)
+    if i == len(segments) - 1:
+        if cls is None:
+            yield from children
+        else:
+            yield from (child for child in children if isinstance(child, cls))
+        return
+    for child in children:
+        yield from _walk(child, segments, i + 1, cls, type_index)
+
+
+def _indexed(node, node_ref: str, segment: str | re.Pattern, cls: type, type_index: TypeIndex) -> Iterator[Element]:
+    """
+    Yields the package elements of class cls anywhere below node whose name matches segment
+    """
+    pending = list(_sub_packages(node))
+    if isinstance(node, Package):
+        pending.append(node)
+    while pending:
+        package = pending.pop()
+        package.materialize()
+        pending.extend(package.sub_packages)
+    candidates = type_index.iter(cls)
+    if isinstance(segment, str):
+        candidates = (element for element in candidates if element.name == segment)
+    elif segment is not ANY_NAME:
+        match = segment.fullmatch
+        candidates = (element for element in candidates if match(element.name) is not None)
+    if isinstance(node, Package):
+        prefix = f'{node_ref}/'
+        candidates = (element for element in candidates if element.ref.startswith(prefix))
+    return candidates
+
+
+def _sub_packages(node) -> list[Package]:
+    if isinstance(node, Package):
+        return node.sub_packages
+    if isinstance(node, Element):
+        return []
+    return node.packages
+
+
+def _children(node) -> Iterable:
+    if isinstance(node, Package):
+        return chain(node.elements, node.sub_packages)
+    if isinstance(node, Element):
+        return iter_child_elements(node)
+    return node.packages
+
+
+def _named_children(node, name: str) -> list:
+    if isinstance(node, Package):
+        node.materialize()
+        children = []
+        element = node.map['elements'].get(name)
+        if element is not None:
+            children.append(element)
+        package = node.map['packages'].get(name)
+        if package is not None:
+            children.append(package)
+        return children
+    if isinstance(node, Element):
+        # Element.find() falls back to the workspace for names it does not know
+        child = node.find(name)
+        if isinstance(child, Element) and child is not node and child.name == name and child.root_ws() is node.root_ws():
+            return [child]
+        return []
+    package = node.map['packages'].get(name)
+    return [] if package is None else [package]
@@ -51,7 +51,7 @@ class EndToEndTransformationISignalProps(TransformationISignalProps):
 
 
 class EndToEndTransformationISignalPropsVariants(Variants[EndToEndTransformationISignalProps]):
-    pass
+    __slots__ = ('_variants',)
 
 
 class SomeIpTransformationISignalProps(TransformationISignalProps):
@@ -85,7 +85,7 @@ class SomeIpTransformationISignalProps(TransformationISignalProps):
 
 
 class SomeIpTransformationISignalPropsVariants(Variants[SomeIpTransformationISignalProps]):
-    pass
+    __slots__ = ('_variants',)
 
 
 class UserDefinedTransformationISignalProps(TransformationISignalProps):
@@ -93,7 +93,7 @@ class UserDefinedTransformationISignalProps(TransformationISignalProps):
 
 
 class UserDefinedTransformationISignalPropsVariants(Variants[UserDefinedTransformationISignalProps]):
-    pass
+    __slots__ = ('_variants',)
 
 
 TransformationISignalPropsVariants: TypeAlias = (
@@ -104,6 +104,8 @@ TransformationISignalPropsVariants: TypeAlias = (
 
 
 class SystemSignal(Element):
+    __slots__ = ('dynamic_length', 'physical_props')
+
     def __init__(
             self,
             dynamic_length: bool | None = None,
@@ -130,6 +132,19 @@ class SystemSignalGroup(Element):
 
 
 class ISignal(Element):
+    __slots__ = (
+        'system_signal_ref',
+        'data_type_policy',
+        'length',
+        'i_signal_type',
+        'i_signal_props',
+        'data_transformation_refs',
+        'init_value',
+        'network_representation_props',
+        'timeout_substitution_value',
+        'transformation_i_signal_props',
+    )
+
     def __init__(
             self,
             system_signal_ref: str,
@@ -34,6 +34,7 @@ class SomeIpConfig(Element):
         super().__init__(*args, **kwargs)
         self.communication_cluster_ref = communication_cluster_ref
         self.tp_channels = self._set_parent(tp_channels)
+        self._find_sets = (self.tp_channels,)
         if tp_connections is None:
             tp_connections = []
         self.tp_connections = tp_connections
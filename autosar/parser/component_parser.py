@@ -156,7 +156,7 @@ class ComponentTypeParser(ElementParser):
                 if len(behaviors) > 1:
                     self._logger.error(f'{component_type}: an SWC cannot have multiple internal behaviors')
                     continue
-                elif len(behaviors) == 1:
+                elif len(behaviors) == 1 and not self.is_excluded(behaviors[0], parent):
                     component_type.behavior = self.behavior_parser.parse_swc_internal_behavior(behaviors[0], component_type)
             elif xml_elem.tag == 'NV-BLOCK-DESCRIPTORS' and isinstance(component_type, NvBlockComponent):
                 for descriptor_xml in xml_elem.findall('./NV-BLOCK-DESCRIPTOR'):
@@ -1,4 +1,5 @@
 import traceback
+from typing import Iterable
 
 from autosar.model.base import parse_text_node
 from autosar.model.element import Element
@@ -7,6 +8,29 @@ from autosar.model.package import Package
 from autosar.parser.parser_base import ElementParser
 
 
+class TagFilter:
+    """
+    Selects which children of ELEMENTS are passed to the element parsers, see Workspace.load_xml()
+    Nested elements that element parsers check with ElementParser.is_excluded() are only matched against exclude_tags
+    """
+
+    def __init__(self, include_tags: str | Iterable[str] | None = None, exclude_tags: str | Iterable[str] | None = None):
+        if isinstance(include_tags, str):
+            include_tags = [include_tags]
+        if isinstance(exclude_tags, str):
+            exclude_tags = [exclude_tags]
+        self.include_tags = None if include_tags is None else frozenset(include_tags)
+        self.exclude_tags = frozenset() if exclude_tags is None else frozenset(exclude_tags)
+
+    def __contains__(self, tag: str) -> bool:
+        if self.include_tags is not None and tag not in self.include_tags:
+            return False
+        return tag not in self.exclude_tags
+
+    def excludes(self, tag: str) -> bool:
+        return tag in self.exclude_tags
+
+
 class PackageParser(HasLogger):
     def __init__(self, version: float, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -26,37 +50,17 @@ class PackageParser(HasLogger):
                 self.switcher[tag_name] = element_parser
             self.registered_parsers[name] = element_parser
 
-    def load_xml(self, package: Package, xml_root):
+    def load_xml(self, package: Package, xml_root, lazy: bool = False, tag_filter: TagFilter | None = None):
         """
         Loads an XML package by repeatedly invoking its registered element parsers
+        With lazy=True only the package structure is created, elements are parsed by Package.materialize()
+        Elements whose tag is not in tag_filter are skipped before any parser runs
         """
         assert (self.switcher is not None)
-        if xml_root.find('ELEMENTS'):
-            element_names = set([x.name for x in package.elements])
-            for xml_element in xml_root.findall('./ELEMENTS/*'):
-                try:
-                    parser_object = self.switcher.get(xml_element.tag)
-                    if parser_object is not None:
-                        element = parser_object.parse_element(xml_element, package)
-                        if element is None:
-                            self._logger.warning(f'No return value: {xml_element.tag}')
-                            continue
-                        element.parent = package
-                        if isinstance(element, Element):
-                            if element.name not in element_names:
-                                # ignore duplicated items
-                                package.append(element)
-                                element_names.add(element.name)
-                        else:
-                            raise ValueError(f'Parse error: {xml_element.tag}')
-                    else:
-                        package.unhandled_parser.add(xml_element.tag)
-                except Exception as e:
-                    self._logger.error(f'Error parsing element: {xml_element.tag}: {e!r}')
-                    self._logger.debug(traceback.format_exc())
-        if len(package.unhandled_parser) > 0:
-            unhandled_tags = ', '.join(package.unhandled_parser)
-            self._logger.warning(f'Unhandled elements of package {package.ref}: {unhandled_tags}')
+        if lazy:
+            package.add_lazy_xml(self, xml_root, tag_filter)
+        else:
+            self.load_elements(package, xml_root, tag_filter)
 
         if 3.0 <= self.version < 4.0:
             if xml_root.find('SUB-PACKAGES'):
@@ -64,12 +68,58 @@ class PackageParser(HasLogger):
                     name = xml_package.find("./SHORT-NAME").text
                     sub_package = Package(name)
                     package.append(sub_package)
-                    self.load_xml(sub_package, xml_package)
+                    self.load_xml(sub_package, xml_package, lazy, tag_filter)
         elif self.version >= 4.0:
             for sub_package_xml in xml_root.findall('./AR-PACKAGES/AR-PACKAGE'):
                 name = parse_text_node(sub_package_xml.find("./SHORT-NAME"))
-                sub_package = package.find(name)
+                sub_package = package.map['packages'].get(name)
                 if sub_package is None:
                     sub_package = Package(name)
                     package.append(sub_package)
-                self.load_xml(sub_package, sub_package_xml)
+                self.load_xml(sub_package, sub_package_xml, lazy, tag_filter)
+
+    def load_elements(self, package: Package, xml_root, tag_filter: TagFilter | None = None):
+        """
+        Parses all children of the ELEMENTS node of an AR-PACKAGE
+        """
+        package.materialize()
+        if xml_root.find('ELEMENTS'):
+            for xml_element in xml_root.findall('./ELEMENTS/*'):
+                self.load_element(package, xml_element, tag_filter)
+        self.log_unhandled(package)
+
+    def load_element(self, package: Package, xml_element, tag_filter: TagFilter | None = None):
+        """
+        Parses a single child of the ELEMENTS node and appends the result to the package
+        """
+        if tag_filter is not None and xml_element.tag not in tag_filter:
+            package.skipped_tags.add(xml_element.tag)
+            return
+        try:
+            parser_object = self.switcher.get(xml_element.tag)
+            if parser_object is not None:
+                parser_object.tag_filter = tag_filter
+                element = parser_object.parse_element(xml_element, package)
+                if element is None:
+                    self._logger.warning(f'No return value: {xml_element.tag}')
+                    return
+                element.parent = package
+                if isinstance(element, Element):
+                    if element.name not in package.map['elements']:
+                        # ignore duplicated items
+                        package.append(element)
+                else:
+                    raise ValueError(f'Parse error: {xml_element.tag}')
+            else:
+                package.unhandled_parser.add(xml_element.tag)
+        except Exception as e:
+            self._logger.error(f'Error parsing element: {xml_element.tag}: {e!r}')
+            self._logger.debug(traceback.format_exc())
+
+    def log_unhandled(self, package: Package):
+        if len(package.unhandled_parser) > 0:
+            unhandled_tags = ', '.join(package.unhandled_parser)
+            self._logger.warning(f'Unhandled elements of package {package.ref}: {unhandled_tags}')
+        if len(package.skipped_tags) > 0:
+            skipped_tags = ', '.join(package.skipped_tags)
+            self._logger.debug(f'Skipped elements of package {package.ref}: {skipped_tags}')
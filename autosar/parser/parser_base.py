@@ -1,6 +1,6 @@
 import abc
 from collections import deque
-from typing import Callable, TypeVar, Generator
+from typing import TYPE_CHECKING, Callable, TypeVar, Generator
 from xml.etree.ElementTree import Element
 
 from autosar.model.ar_object import ArObject
@@ -21,8 +21,12 @@ from autosar.model.base import (
     FloatLimit,
 )
 from autosar.model.element import DataElement
+from autosar.model.package import Package
 from autosar.misc import HasLogger
 
+if TYPE_CHECKING:
+    from autosar.parser.package_parser import TagFilter
+
 T = TypeVar('T', bound=ArObject)
 
 
@@ -517,6 +521,19 @@ class BaseParser(HasLogger):
 
 class ElementParser(BaseParser, abc.ABC):
     common_tags = ('SHORT-NAME', 'DESC', 'LONG-NAME', 'CATEGORY', 'ADMIN-DATA')
+    # Tag filter of the element being parsed, set by PackageParser.load_element()
+    tag_filter: 'TagFilter | None' = None
+
+    def is_excluded(self, xml_elem: Element, package: ArObject | None) -> bool:
+        """
+        Returns True if the nested element xml_elem is excluded by the tag filter of Workspace.load_xml(),
+        its tag is then added to skipped_tags of package
+        """
+        if self.tag_filter is None or not self.tag_filter.excludes(xml_elem.tag):
+            return False
+        if isinstance(package, Package):
+            package.skipped_tags.add(xml_elem.tag)
+        return True
 
     def parse_common_tags(self, xml_elem: Element):
         desc, _ = self.parse_desc_direct(xml_elem.find('DESC'))
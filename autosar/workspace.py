@@ -1,19 +1,30 @@
+import hashlib
+import os
+import pickle
 from collections import UserDict, deque
-from collections.abc import Mapping
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from importlib import metadata
+from itertools import chain, repeat
 from pathlib import Path
 from typing import Any
-from xml.etree.ElementTree import Element
+from sys import intern
+from xml.etree.ElementTree import Element, XMLPullParser
 
 from autosar.model.ar_object import ArObject
 from autosar.model.base import (
-    parse_xml_file,
+    NamespaceFreeReader,
     get_xml_namespace,
-    remove_namespace,
+    parse_xml_file_without_namespace,
     parse_autosar_version_and_schema,
     parse_version_string,
     create_admin_data,
 )
+from autosar.model.element import Element as ArElement
+from autosar.model.index import ReferrerIndex, TypeIndex
 from autosar.model.package import Package
+from autosar.model.query import compile_pattern, iter_matches
 from autosar.parser.behavior_parser import BehaviorParser
 from autosar.parser.collection_parser import CollectionParser
 from autosar.parser.component_parser import ComponentTypeParser
@@ -26,7 +37,7 @@ from autosar.parser.ecu_parser import EcuParser
 from autosar.parser.can_cluster_parser import CanClusterParser
 from autosar.parser.ethernet_cluster_parser import EthernetClusterParser
 from autosar.parser.mode_parser import ModeDeclarationParser
-from autosar.parser.package_parser import PackageParser
+from autosar.parser.package_parser import PackageParser, TagFilter
 from autosar.parser.parser_base import ElementParser
 from autosar.parser.pdu_parser import PduParser, SoConSetParser
 from autosar.parser.portinterface_parser import PortInterfacePackageParser, SoftwareAddressMethodParser
@@ -49,6 +60,32 @@ _valid_ws_roles = [
     'DataConstraint',
 ]
 
+_default_element_parsers = (
+    DataTypeParser,
+    DataTypeSemanticsParser,
+    DataTypeUnitsParser,
+    PortInterfacePackageParser,
+    SoftwareAddressMethodParser,
+    ModeDeclarationParser,
+    ConstantParser,
+    ComponentTypeParser,
+    BehaviorParser,
+    SystemParser,
+    SignalParser,
+    SwcImplementationParser,
+    ServiceInstanceCollectionParser,
+    CanClusterParser,
+    EthernetClusterParser,
+    TransformationParser,
+    PduParser,
+    SoConSetParser,
+    EcuParser,
+    CollectionParser,
+    SomeIpTpParser,
+    TransportProtocolParser,
+    FrameParser,
+)
+
 
 class PackageRoles(UserDict):
     def __init__(self, data: Mapping | None = None):
@@ -89,6 +126,8 @@ class Workspace(ArObject):
     """
     An autosar workspace
     """
+    # The ref of the workspace is always '', packages directly below it cache theirs
+    _ref_cache = ''
     autosar_platform_types = {
         '/AUTOSAR_Platform/BaseTypes/uint8': '>u1',
         '/AUTOSAR_Platform/BaseTypes/uint16': '>u2',
@@ -141,8 +180,13 @@ class Workspace(ArObject):
         self.roles = PackageRoles()
         self.role_stack = deque()  # stack of PackageRoles
         self.map = {'packages': {}}
+        self.ref_index: dict[str, ArObject] = {}  # full reference to object, see find()
+        self._ref_children: dict[str, set[str]] = {}  # reference -> references in ref_index directly below it
+        self._referrer_index: ReferrerIndex | None = None  # built on first use, see referrers()
+        self.type_index = TypeIndex()  # package elements per class, see instances_of()
         self.profile = WorkspaceProfile()
         self.unhandled_parser = set()  # [PackageParser] Unhandled
+        self.skipped_tags = set()  # [PackageParser] excluded by the tag filter of load_xml()
         self.unhandled_writer = set()  # [PackageWriter] Unhandled
 
     @property
@@ -221,36 +265,270 @@ class Workspace(ArObject):
         self.type_references[name] = self.autosar_platform_types[type_ref]
 
     def open_xml(self, filename: Path):
-        xml_root = parse_xml_file(filename)
-        namespace = get_xml_namespace(xml_root)
+        xml_root, namespace = parse_xml_file_without_namespace(filename)
+        if namespace is None:
+            raise ValueError(f'{filename}: Root element {xml_root.tag} has no XML namespace')
+        self._apply_xml_header(xml_root)
+        self.xml_root = xml_root
 
-        assert (namespace is not None)
-        major, minor, patch, release, schema = parse_autosar_version_and_schema(xml_root)
-        remove_namespace(xml_root, namespace)
+    def _apply_xml_header(self, xml_root: Element):
+        self._apply_version(*parse_autosar_version_and_schema(xml_root))
+
+    def _apply_version(self, major: int, minor: int, patch: int | None, release: int | None, schema: str | None):
         self.version = float(f'{major}.{minor}')
         self.major = major
         self.minor = minor
         self.patch = patch
         self.release = release
         self.schema = schema
-        self.xml_root = xml_root
         if self.version < 3.0:
             raise NotImplementedError('Version below 3.0 is not supported')
         if self.package_parser is None:
             self.package_parser = PackageParser(self.version)
         self._register_default_element_parsers(self.package_parser)
 
-    def load_xml(self, filename: Path, roles: Mapping | None = None):
+    def load_xml(
+            self,
+            filename: Path,
+            roles: Mapping | None = None,
+            streaming: bool = False,
+            cache_dir: Path | str | None = None,
+            lazy: bool = False,
+            include_tags: str | Iterable[str] | None = None,
+            exclude_tags: str | Iterable[str] | None = None,
+    ):
+        """
+        Loads all packages of an ARXML file into the workspace
+
+        With streaming=True the file is read with iterparse and every element is dropped as soon as it is parsed,
+        so the XML tree is never held in memory as a whole. xml_root stays None in this mode.
+
+        With cache_dir the parsed packages are stored in a snapshot file below cache_dir, keyed by the content of
+        the file, the package version and the registered element parsers. A later call with the same key restores
+        the packages, systems, role elements and type references from the snapshot instead of parsing the file.
+        xml_root stays None in this mode, streaming and lazy are ignored and lazy=True logs a warning.
+
+        With lazy=True all packages are created but their elements are only parsed the first time a package's
+        elements are accessed, e.g. when find() resolves a reference into it. list_packages() and dir() do not
+        parse anything. Lazy loading keeps xml_root alive and cannot be combined with streaming.
+
+        include_tags and exclude_tags select the children of ELEMENTS by XML tag, e.g. include_tags=['I-SIGNAL-I-PDU'].
+        Elements that are not selected are skipped before any element parser runs, their tags are collected in
+        skipped_tags of the workspace and of the package instead of unhandled_parser. exclude_tags also applies to
+        the SWC-INTERNAL-BEHAVIOR nested in AR4 component types, e.g. exclude_tags=['SWC-INTERNAL-BEHAVIOR'].
+        """
         global _valid_ws_roles
-        self.open_xml(filename)
-        self.load_package('*')
+        if streaming and lazy:
+            raise ValueError('streaming and lazy loading cannot be combined')
+        tag_filter = None
+        if include_tags is not None or exclude_tags is not None:
+            tag_filter = TagFilter(include_tags, exclude_tags)
+        if cache_dir is not None:
+            if lazy:
+                self._logger.warning(f'{filename}: lazy loading is ignored when loading through cache_dir')
+            self._load_cached(Path(filename), Path(cache_dir), tag_filter)
+        elif streaming:
+            self._stream_xml(filename, tag_filter)
+        else:
+            self.open_xml(filename)
+            self.load_package('*', lazy=lazy, tag_filter=tag_filter)
+        if roles is not None:
+            if not isinstance(roles, Mapping):
+                raise ValueError('Roles parameter must be a dictionary or Mapping')
+            for ref, role in roles.items():
+                self.set_role(ref, role)
+
+    def load_files(self, filenames: Iterable[Path], jobs: int | None = None, roles: Mapping | None = None):
+        """
+        Loads all packages of several ARXML files into the workspace, parsing up to jobs files in parallel
+
+        Each file is parsed in a worker process into its own package trees. The trees are merged in the order
+        of filenames, so the result does not depend on which worker finishes first: new packages are appended,
+        packages that already exist are merged and elements whose name already exists in the package are skipped,
+        the same way load_xml() handles duplicates. Systems and role elements of skipped duplicates are left out.
+        jobs defaults to the number of CPUs, with jobs=1 or a single file the files are loaded and merged the same way
+        in this process.
+        Custom element parsers are passed to the workers and must be picklable. xml_root stays None.
+        """
+        filenames = list(filenames)
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        element_parsers = self._custom_element_parsers()
+        if jobs == 1 or len(filenames) < 2:
+            for filename in filenames:
+                self._merge_workspace(_load_file_detached(filename, element_parsers))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                for loaded in executor.map(_load_file_detached, filenames, repeat(element_parsers)):
+                    self._merge_workspace(loaded)
+        self._log_unhandled()
+        self.xml_root = None
         if roles is not None:
             if not isinstance(roles, Mapping):
                 raise ValueError('Roles parameter must be a dictionary or Mapping')
             for ref, role in roles.items():
                 self.set_role(ref, role)
 
-    def load_package(self, package_name: str, role: str | None = None) -> list[Package]:
+    def _load_cached(self, filename: Path, cache_dir: Path, tag_filter: TagFilter | None = None):
+        element_parsers = self._custom_element_parsers()
+        cache_file = cache_dir / f'{_cache_key(filename, element_parsers, tag_filter)}.pickle'
+        loaded = None
+        if cache_file.is_file():
+            try:
+                with open(cache_file, 'rb') as fh:
+                    loaded = pickle.load(fh)
+            except Exception as e:
+                self._logger.warning(f'Ignoring unreadable cache file {cache_file}: {e!r}')
+        if loaded is None:
+            loaded = _load_file_detached(filename, element_parsers, tag_filter)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Written under a temporary name first so that concurrent readers never see a partial snapshot
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'wb') as fh:
+                pickle.dump(loaded, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        self._merge_workspace(loaded)
+        self.xml_root = None
+        self._log_unhandled()
+
+    def _log_unhandled(self):
+        if self.unhandled_parser:
+            unhandled = ', '.join(self.unhandled_parser)
+            self._logger.warning(f'Unhandled: {unhandled}')
+        if self.skipped_tags:
+            skipped = ', '.join(self.skipped_tags)
+            self._logger.info(f'Skipped: {skipped}')
+
+    def _custom_element_parsers(self) -> list[ElementParser]:
+        """
+        Returns the registered element parsers that are not registered by default
+        """
+        if self.package_parser is None:
+            return []
+        default_names = {parser_class.__name__ for parser_class in _default_element_parsers}
+        return [p for name, p in self.package_parser.registered_parsers.items() if name not in default_names]
+
+    def _merge_workspace(self, other: 'Workspace'):
+        """
+        Moves the packages of a workspace returned by _load_file_detached into self
+        """
+        self._apply_version(other.major, other.minor, other.patch, other.release, other.schema)
+        for package in other.packages:
+            existing = self.map['packages'].get(package.name)
+            if existing is None:
+                self.append(package)
+            else:
+                self._merge_package(existing, package)
+        # Only objects that made it into this workspace are registered, skipped duplicates are not
+        self.systems.extend(system for system in other.systems if system.root_ws() is self)
+        for role, elements in other.role_elements.items():
+            merged = [element for element in elements if element.root_ws() is self]
+            if len(merged) > 0:
+                self.role_elements.setdefault(role, []).extend(merged)
+        self.type_references.update(other.type_references)
+        self.unhandled_parser = self.unhandled_parser.union(other.unhandled_parser)
+        self.skipped_tags = self.skipped_tags.union(other.skipped_tags)
+
+    def _merge_package(self, package: Package, other: Package):
+        package.materialize()
+        for element in list(other.elements):
+            if element.name not in package.map['elements']:
+                # ignore duplicated items
+                package.append(element)
+        for sub_package in list(other.sub_packages):
+            existing = package.map['packages'].get(sub_package.name)
+            if existing is None:
+                package.append(sub_package)
+            else:
+                self._merge_package(existing, sub_package)
+        package.unhandled_parser = package.unhandled_parser.union(other.unhandled_parser)
+        package.skipped_tags = package.skipped_tags.union(other.skipped_tags)
+
+    def _stream_xml(self, filename: Path, tag_filter: TagFilter | None = None):
+        self.xml_root = None
+        reader = NamespaceFreeReader(filename)
+        parser = XMLPullParser(events=('start', 'end'))
+        tags: list[str] = []  # tags of currently open XML elements
+        nodes: list[Element] = []  # currently open XML elements
+        packages: list[Package | None] = []  # one entry per open AR-PACKAGE, None until SHORT-NAME is read
+        prefix: str | None = None  # '{namespace}' stripped from every tag, None until the root element is read
+        for chunk in reader:
+            parser.feed(chunk)
+            prefix = self._stream_events(parser.read_events(), tags, nodes, packages, prefix, tag_filter)
+            if reader.namespace is None and prefix == '':
+                raise ValueError(f'{filename}: Root element has no XML namespace')
+        parser.close()
+        self._log_unhandled()
+
+    def _stream_events(
+            self,
+            events,
+            tags: list[str],
+            nodes: list[Element],
+            packages: list[Package | None],
+            prefix: str | None,
+            tag_filter: TagFilter | None = None,
+    ) -> str | None:
+        """
+        Parses the package elements completed by events and returns the namespace prefix of the root element
+        """
+        package_containers = ('AR-PACKAGES', 'TOP-LEVEL-PACKAGES', 'SUB-PACKAGES')
+        for event, xml_elem in events:
+            if event == 'start':
+                if not nodes:
+                    # Like parse_xml_file_without_namespace(), a namespace the reader could not remove is stripped here
+                    namespace = get_xml_namespace(xml_elem)
+                    prefix = '' if namespace is None else f'{{{namespace}}}'
+                    self._apply_xml_header(xml_elem)
+                tag = xml_elem.tag
+                if prefix and tag.startswith(prefix):
+                    tag = tag[len(prefix):]
+                tag = intern(tag)
+                tags.append(tag)
+                nodes.append(xml_elem)
+                if tag == 'AR-PACKAGE':
+                    packages.append(None)
+                continue
+            xml_elem.tag = tag = tags.pop()
+            nodes.pop()
+            if len(tags) < 2:
+                continue
+            parent_tag = tags[-1]
+            if tag == 'SHORT-NAME' and parent_tag == 'AR-PACKAGE':
+                packages[-1] = self._stream_package(xml_elem.text, packages[-2] if len(packages) > 1 else None)
+            elif parent_tag == 'ELEMENTS' and tags[-2] == 'AR-PACKAGE':
+                if packages[-1] is not None:
+                    self.package_parser.load_element(packages[-1], xml_elem, tag_filter)
+                nodes[-1].remove(xml_elem)
+            elif tag == 'AR-PACKAGE' and parent_tag in package_containers:
+                package = packages.pop()
+                if package is not None:
+                    self.package_parser.log_unhandled(package)
+                    self.unhandled_parser = self.unhandled_parser.union(package.unhandled_parser)
+                    self.skipped_tags = self.skipped_tags.union(package.skipped_tags)
+                nodes[-1].remove(xml_elem)
+        return prefix
+
+    def _stream_package(self, name: str, parent: Package | None) -> Package:
+        if parent is None:
+            package = self.find(name)
+            if package is None:
+                package = Package(name)
+                self.append(package)
+            return package
+        package = parent.find(name)
+        if package is None:
+            package = Package(name)
+            parent.append(package)
+        return package
+
+    def load_package(
+            self,
+            package_name: str,
+            role: str | None = None,
+            lazy: bool = False,
+            tag_filter: TagFilter | None = None,
+    ) -> list[Package]:
         found = False
         result = []
         if self.xml_root is None:
@@ -258,13 +536,13 @@ class Workspace(ArObject):
         if 3.0 <= self.version < 4.0:
             if self.xml_root.find('TOP-LEVEL-PACKAGES'):
                 for xml_package in self.xml_root.findall('./TOP-LEVEL-PACKAGES/AR-PACKAGE'):
-                    if self._load_package_internal(result, xml_package, package_name, role):
+                    if self._load_package_internal(result, xml_package, package_name, role, lazy, tag_filter):
                         found = True
 
         elif self.version >= 4.0:
             if self.xml_root.find('AR-PACKAGES'):
                 for xml_package in self.xml_root.findall('.AR-PACKAGES/AR-PACKAGE'):
-                    if self._load_package_internal(result, xml_package, package_name, role):
+                    if self._load_package_internal(result, xml_package, package_name, role, lazy, tag_filter):
                         found = True
 
         else:
@@ -272,24 +550,30 @@ class Workspace(ArObject):
         if not found and package_name != '*':
             raise KeyError(f'Package not found: {package_name}')
 
-        if self.unhandled_parser:
-            unhandled = ', '.join(self.unhandled_parser)
-            self._logger.warning(f'Unhandled: {unhandled}')
+        self._log_unhandled()
         return result
 
-    def _load_package_internal(self, result: list[Package], xml_package: Element, package_name: str, role: str) -> bool:
+    def _load_package_internal(
+            self,
+            result: list[Package],
+            xml_package: Element,
+            package_name: str,
+            role: str,
+            lazy: bool = False,
+            tag_filter: TagFilter | None = None,
+    ) -> bool:
         name = xml_package.find("./SHORT-NAME").text
         found = False
         if package_name == '*' or package_name == name:
             found = True
             package = self.find(name)
             if package is None:
-                package = Package(name, parent=self)
-                self.packages.append(package)
+                package = Package(name)
+                self.append(package)
                 result.append(package)
-                self.map['packages'][name] = package
-            self.package_parser.load_xml(package, xml_package)
+            self.package_parser.load_xml(package, xml_package, lazy, tag_filter)
             self.unhandled_parser = self.unhandled_parser.union(package.unhandled_parser)
+            self.skipped_tags = self.skipped_tags.union(package.skipped_tags)
             if (package_name == name) and (role is not None):
                 self.set_role(package.ref, role)
         return found
@@ -304,8 +588,17 @@ class Workspace(ArObject):
             if self.roles[role] is not None:
                 ref = f'{self.roles[role]}/{ref}'  # appends the role packet name in front of ref
 
-        if ref[0] == '/':
-            ref = ref[1:]  # removes initial '/' if it exists
+        if ref[0] != '/':
+            ref = f'/{ref}'
+        elem = self.ref_index.get(ref)
+        if elem is not None and elem.ref == ref:
+            return elem
+        elem = self._find_by_traversal(ref[1:])
+        if elem is not None and elem.ref == ref:
+            self._add_ref(ref, elem)
+        return elem
+
+    def _find_by_traversal(self, ref: str):
         ref = ref.partition('/')
         if ref[0] in self.map['packages']:
             pkg: Package = self.map['packages'][ref[0]]
@@ -314,26 +607,102 @@ class Workspace(ArObject):
             return pkg
         return None
 
-    def findall(self, ref: str):
+    def index_ref(self, elem: ArObject):
+        """
+        Adds elem to the reference index, packages are added together with their content.
+        Nested elements are added to the index the first time find() resolves them.
+        """
+        ref = elem.ref
+        if ref is None:
+            return
+        self._add_ref(ref, elem)
+        if isinstance(elem, ArElement):
+            self.type_index.add(elem)
+            if self._referrer_index is not None:
+                self._referrer_index.add(elem)
+        if isinstance(elem, Package):
+            for child in elem.elements:
+                self.index_ref(child)
+            for sub_package in elem.sub_packages:
+                self.index_ref(sub_package)
+
+    def _add_ref(self, ref: str, elem: ArObject):
+        self.ref_index[ref] = elem
+        self._ref_children.setdefault(ref.rpartition('/')[0], set()).add(ref)
+
+    def unindex_ref(self, elem: ArObject):
+        """
+        Removes elem and everything below it from the reference index, packages are removed together with their content
+        """
+        if self._referrer_index is not None:
+            if isinstance(elem, Package):
+                self._referrer_index.remove_package(elem)
+            elif isinstance(elem, ArElement):
+                self._referrer_index.remove(elem)
+        ref = elem.ref
+        if ref is None:
+            return
+        siblings = self._ref_children.get(ref.rpartition('/')[0])
+        if siblings is not None:
+            siblings.discard(ref)
+        pending = [ref]
+        while pending:
+            key = pending.pop()
+            indexed = self.ref_index.pop(key, None)
+            if isinstance(indexed, ArElement):
+                self.type_index.remove(indexed)
+            pending.extend(self._ref_children.pop(key, ()))
+
+    def referrers(self, ref: str, rebuild: bool = False) -> list[ArElement]:
+        """
+        Returns the elements holding ref in a *_ref attribute or in a *_refs list, including the ones nested
+        in other elements, e.g. the ISignalToIPduMapping and ISignalTriggering objects that point at an ISignal.
+
+        The index behind it is built by one pass over the whole workspace on the first call, which parses
+        all lazily loaded packages. From then on it follows append() and delete() of packages and package
+        elements. References changed inside an already added element are not tracked, rebuild=True builds
+        the index again.
+        """
+        if ref[0] != '/':
+            ref = f'/{ref}'
+        if self._referrer_index is None or rebuild:
+            self._referrer_index = ReferrerIndex()
+            for package in self.packages:
+                self._referrer_index.add_package(package)
+        return self._referrer_index.get(ref)
+
+    def instances_of(self, cls: type, include_subclasses: bool = True) -> Iterator[ArElement]:
+        """
+        Returns an iterator over the package elements of class cls, e.g. instances_of(ISignalIPdu),
+        in the order they were added to the workspace. With include_subclasses=False elements of
+        subclasses of cls are left out.
+
+        Elements nested in other elements, like the runnables of an internal behavior, are not part of the result.
+        Lazily loaded packages are parsed before the iterator is returned.
         """
-        experimental find-method that has some rudimentary support for globs.
+        pending = list(self.packages)
+        while pending:
+            package = pending.pop()
+            package.materialize()
+            pending.extend(package.sub_packages)
+        return self.type_index.iter(cls, include_subclasses)
+
+    def findall(self, ref: str, cls: type | None = None):
+        """
+        Returns the list of objects whose reference matches the pattern ref, see iterfind()
         """
         if ref is None:
             return None
-        if ref[0] == '/':
-            ref = ref[1:]  # removes initial '/' if it exists
-        ref = ref.partition('/')
-        if ref[0] == '*' and len(ref[2]) == 0:
-            result = list(self.packages)
-        else:
-            result = []
-            for pkg in self.packages:
-                if pkg.name == ref[0] or ref[0] == '*':
-                    if len(ref[2]) > 0:
-                        result.extend(pkg.findall(ref[2]))
-                    else:
-                        result.append(pkg)
-        return result
+        return list(self.iterfind(ref, cls))
+
+    def iterfind(self, ref: str, cls: type | None = None) -> Iterator:
+        """
+        Yields the packages and elements whose reference matches the pattern ref, e.g. '/Communication/**/ISignal*'.
+        A path segment of ref is a name, a glob using '*', '?' and character classes like [0-9] or [!_],
+        or '**' which matches zero or more package levels. With cls only instances of cls are yielded,
+        for a pattern ending with '**/<name>' the candidates are then taken from the per-class element registry.
+        """
+        return iter_matches(self, compile_pattern(ref), cls, self.type_index)
 
     def find_role_package(self, role_name: str):
         """
@@ -352,9 +721,8 @@ class Workspace(ArObject):
 
     def create_package(self, name: str, role: str | None = None):
         if name not in self.map['packages']:
-            package = Package(name, self)
-            self.packages.append(package)
-            self.map['packages'][name] = package
+            package = Package(name)
+            self.append(package)
             if role is not None:
                 self.set_role(package.ref, role)
             return package
@@ -385,6 +753,7 @@ class Workspace(ArObject):
             self.packages.append(elem)
             elem.parent = self
             self.map['packages'][elem.name] = elem
+            self.index_ref(elem)
         else:
             raise ValueError(type(elem))
 
@@ -420,8 +789,10 @@ class Workspace(ArObject):
                 if len(ref[2]) > 0:
                     return pkg.delete(ref[2])
                 else:
+                    self.unindex_ref(pkg)
                     del self.packages[i]
                     del self.map['packages'][ref[0]]
+                    pkg.parent = None
                     break
 
     @staticmethod
@@ -448,26 +819,49 @@ class Workspace(ArObject):
         self.package_parser.register_element_parser(element_parser)
 
     def _register_default_element_parsers(self, parser: PackageParser):
-        parser.register_element_parser(DataTypeParser(self.version))
-        parser.register_element_parser(DataTypeSemanticsParser(self.version))
-        parser.register_element_parser(DataTypeUnitsParser(self.version))
-        parser.register_element_parser(PortInterfacePackageParser(self.version))
-        parser.register_element_parser(SoftwareAddressMethodParser(self.version))
-        parser.register_element_parser(ModeDeclarationParser(self.version))
-        parser.register_element_parser(ConstantParser(self.version))
-        parser.register_element_parser(ComponentTypeParser(self.version))
-        parser.register_element_parser(BehaviorParser(self.version))
-        parser.register_element_parser(SystemParser(self.version))
-        parser.register_element_parser(SignalParser(self.version))
-        parser.register_element_parser(SwcImplementationParser(self.version))
-        parser.register_element_parser(ServiceInstanceCollectionParser(self.version))
-        parser.register_element_parser(CanClusterParser(self.version))
-        parser.register_element_parser(EthernetClusterParser(self.version))
-        parser.register_element_parser(TransformationParser(self.version))
-        parser.register_element_parser(PduParser(self.version))
-        parser.register_element_parser(SoConSetParser(self.version))
-        parser.register_element_parser(EcuParser(self.version))
-        parser.register_element_parser(CollectionParser(self.version))
-        parser.register_element_parser(SomeIpTpParser(self.version))
-        parser.register_element_parser(TransportProtocolParser(self.version))
-        parser.register_element_parser(FrameParser(self.version))
+        for parser_class in _default_element_parsers:
+            parser.register_element_parser(parser_class(self.version))
+
+
+@cache
+def _package_version() -> str:
+    """
+    Returns the installed package version, or a digest of the sources when running from a source tree
+    """
+    try:
+        return metadata.version('arxml')
+    except metadata.PackageNotFoundError:
+        digest = hashlib.sha256()
+        for source_file in sorted(Path(__file__).parent.rglob('*.py')):
+            digest.update(source_file.read_bytes())
+        return f'src-{digest.hexdigest()}'
+
+
+def _cache_key(filename: Path, element_parsers: list[ElementParser], tag_filter: TagFilter | None = None) -> str:
+    with open(filename, 'rb') as fh:
+        digest = hashlib.file_digest(fh, 'sha256')
+    digest.update(_package_version().encode())
+    parser_classes = chain(_default_element_parsers, (type(element_parser) for element_parser in element_parsers))
+    for parser_name in sorted(f'{c.__module__}.{c.__qualname__}' for c in parser_classes):
+        digest.update(parser_name.encode())
+    if tag_filter is not None:
+        include_tags = None if tag_filter.include_tags is None else sorted(tag_filter.include_tags)
+        digest.update(repr((include_tags, sorted(tag_filter.exclude_tags))).encode())
+    return digest.hexdigest()
+
+
+def _load_file_detached(filename: Path, element_parsers: list[ElementParser], tag_filter: TagFilter | None = None) -> Workspace:
+    """
+    Loads a single ARXML file into a new workspace, see Workspace.load_files()
+    """
+    ws = Workspace(3.0, None, None)
+    ws.open_xml(filename)
+    for element_parser in element_parsers:
+        ws.package_parser.register_element_parser(element_parser)
+    ws.load_package('*', tag_filter=tag_filter)
+    # None of these are needed by the receiving workspace, the default parsers cannot be pickled
+    ws.xml_root = None
+    ws.package_parser = None
+    ws.ref_index = {}
+    ws._ref_children = {}
+    return ws
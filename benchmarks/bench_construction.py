@@ -0,0 +1,84 @@
+"""
+Measures model object construction throughput and the resulting per-object memory.
+
+Usage: python -m benchmarks.bench_construction [--count N] [--repeat R] [--size NAME]
+Constructs N objects of a few hot model classes directly, then loads a synthetic file of the given size
+(see benchmarks.generator) to show the effect on Workspace.load_xml.
+"""
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable
+
+import autosar
+from autosar.model.base import AdminData, SpecialData
+from autosar.model.compu import CompuScale
+from autosar.model.element import Element
+from autosar.model.signal import ISignal
+from benchmarks.generator import sizes, write_arxml
+
+
+def make_elements(count: int, admin_data: AdminData | None) -> list:
+    return [Element(f'Element{i}', None, admin_data) for i in range(count)]
+
+
+def make_signals(count: int) -> list:
+    return [ISignal(name=f'Sig{i}', system_signal_ref='/Signals/SysSig', data_type_policy='LEGACY', length=8) for i in range(count)]
+
+
+def make_compu_scales(count: int) -> list:
+    return [CompuScale(lower_limit=i, upper_limit=i, short_label='Label') for i in range(count)]
+
+
+def make_special_data(count: int) -> list:
+    return [SpecialData('text', 'Gid') for _ in range(count)]
+
+
+def measure(func: Callable[[], list], count: int, repeat: int) -> tuple[float, float]:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        objects = func()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objects
+    return count / best, size / count
+
+
+def run(count: int, repeat: int, size: str):
+    admin_data = AdminData()
+    cases = {
+        'Element': lambda: make_elements(count, None),
+        'Element + AdminData': lambda: make_elements(count, admin_data),
+        'ISignal': lambda: make_signals(count),
+        'CompuScale': lambda: make_compu_scales(count),
+        'SpecialData': lambda: make_special_data(count),
+    }
+    for name, func in cases.items():
+        rate, per_object = measure(func, count, repeat)
+        print(f'{name:<20} {rate / 1e3:9.0f} k objects/s {per_object:7.0f} B/object')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        arxml_path = Path(tmp_dir) / 'synthetic.arxml'
+        write_arxml(arxml_path, sizes[size])
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            autosar.workspace().load_xml(arxml_path)
+            best = min(best, time.perf_counter() - start)
+        print(f'Workspace.load_xml ({size}) {best:8.3f} s')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--count', type=int, default=200000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--size', choices=sizes.keys(), default='medium')
+    parsed_args = arg_parser.parse_args()
+    run(parsed_args.count, parsed_args.repeat, parsed_args.size)
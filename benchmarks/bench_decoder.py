@@ -0,0 +1,331 @@
+"""
+Measures the throughput of the vectorized PDU signal decoder.
+
+Usage: python -m benchmarks.bench_decoder [--size NAME] [--rows N] [--repeat R]
+Loads a synthetic file of the given size (see benchmarks.generator), compiles a PduDecoder for every
+I-Signal I-PDU and decodes N random payloads with each of the PDUs holding the most signals.
+Decodes N SOME/IP messages of random events of the extracted system with SomeIpDecoder,
+and a tenth of them sent over UDP from a pcap file with CapturePipeline.
+Reassembles N / 10 SOME/IP-TP segments of interleaved 1 kB events with SomeIpTpReassembler.
+Writes N / 10 frames of random CAN IDs of the first CAN channel to a candump log and decodes it with CanLogDecoder,
+and resolves N random CAN IDs with its CanIdIndex.
+Reassembles N / 10 ISO-TP frames of 4096 interleaved CanTp connections with CanTpReassembler.
+Splits N / 10 short header containers of 4 PDUs of the file each with ContainerDemultiplexer and decodes them.
+Checks N E2E profile 4 and profile 5 protected messages of 32 bytes with E2EChecker.
+Then applies conversions of every kind in autosar.extractor.conversion to N raw values.
+Requires numpy.
+"""
+import struct
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+
+import autosar
+from autosar.decoder.can import CanIdFilter, CanLogDecoder, iter_can_log
+from autosar.decoder.can_tp import CanTpLayout, CanTpReassembler
+from autosar.decoder.capture import CapturePipeline
+from autosar.decoder.container import SHORT_HEADER, ContainedPduLayout, ContainerDemultiplexer
+from autosar.decoder.e2e import E2EChecker
+from autosar.decoder.pdu import PduDecoder
+from autosar.decoder.someip import HEADER_DTYPE, TP_FLAG, SomeIpDecoder
+from autosar.decoder.someip_tp import SomeIpTpReassembler, TpConnection
+from autosar.extractor.conversion import (
+    ConstantConversion,
+    ConversionInterval,
+    Conversion,
+    LinearConversion,
+    MapConversion,
+    NumericConversion,
+    RationalConversion,
+)
+from autosar.extractor.system_extractor import SystemExtractor
+from autosar.model.can_cluster import CanClusterVariants, CanPhysicalChannel
+from autosar.model.pdu import ISignalIPdu
+from benchmarks.generator import sizes, write_arxml
+
+
+def conversions() -> dict[str, Conversion]:
+    return {
+        'LINEAR': LinearConversion(0.1, -40),
+        'RAT_FUNC': RationalConversion((1, 2, 0.5), (1, 0.01)),
+        'SCALE_LINEAR': NumericConversion(
+            ConversionInterval(i * 32, i * 32 + 31, LinearConversion(0.5 * i + 1, i)) for i in range(8)
+        ),
+        'TEXTTABLE': MapConversion(
+            ConversionInterval(i, i, ConstantConversion(f'STATE_{i % 5}')) for i in range(0, 256, 4)
+        ),
+    }
+
+
+def run_conversions(rows: int, repeat: int):
+    raw = np.random.default_rng(0).integers(0, 256, size=rows)
+    for name, conversion in conversions().items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conversion.apply(raw)
+            best = min(best, time.perf_counter() - start)
+        print(f'  {name:<12} {rows / best / 1e6:8.1f} M values/s')
+
+
+def run_file(arxml_path: Path, rows: int, repeat: int):
+    ws = autosar.workspace()
+    ws.load_xml(arxml_path)
+    start = time.perf_counter()
+    decoders = [PduDecoder.from_i_signal_i_pdu(pdu) for pdu in ws.instances_of(ISignalIPdu)]
+    print(f'compiled {len(decoders)} PDU decoders in {time.perf_counter() - start:.3f} s')
+    rng = np.random.default_rng(0)
+    for decoder in sorted(decoders, key=lambda d: len(d.signals), reverse=True)[:3]:
+        payloads = rng.integers(0, 256, size=(rows, decoder.length), dtype=np.uint8)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decoder.decode(payloads)
+            best = min(best, time.perf_counter() - start)
+        print(f'  {decoder.name:<12} {len(decoder.signals):3d} signals {rows / best / 1e6:8.1f} M payloads/s '
+              f'{rows * len(decoder.signals) / best / 1e6:8.1f} M values/s')
+    run_some_ip(ws, rows, repeat)
+    run_capture(ws, rows // 10, repeat)
+    run_some_ip_tp(rows // 10, repeat)
+    run_can(ws, rows // 10, repeat)
+    run_can_tp(rows // 10, repeat)
+    run_container(decoders, rows // 10, repeat)
+
+
+def some_ip_messages(decoder: SomeIpDecoder, rows: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns a buffer of rows SOME/IP notifications of random events with random payloads and their start offsets
+    """
+    rng = np.random.default_rng(0)
+    layouts = list(decoder.layouts.values())
+    choice = rng.integers(0, len(layouts), size=rows)
+    payload_sizes = np.array([layout.minimum_size for layout in layouts], dtype=np.int64)[choice]
+    ends = np.cumsum(payload_sizes + 16)
+    starts = ends - payload_sizes - 16
+    buffer = rng.integers(0, 256, size=int(ends[-1]), dtype=np.uint8)
+    header = np.zeros(rows, dtype=HEADER_DTYPE)
+    keys = np.array([layout.key for layout in layouts], dtype=np.int64)[choice]
+    header['service_id'] = keys[:, 0]
+    header['method_id'] = keys[:, 1]
+    header['interface_version'] = keys[:, 2]
+    header['length'] = payload_sizes + 8
+    header['protocol_version'] = 1
+    header['message_type'] = 2
+    buffer[starts[:, np.newaxis] + np.arange(16)] = header.view(np.uint8).reshape(rows, 16)
+    return buffer, starts
+
+
+def run_some_ip(ws, rows: int, repeat: int):
+    start = time.perf_counter()
+    decoder = SomeIpDecoder(SystemExtractor(ws.systems[0]).extract().some_ip_mapping)
+    print(f'compiled {len(decoder.layouts)} SOME/IP layouts in {time.perf_counter() - start:.3f} s')
+    if len(decoder.layouts) == 0:
+        return
+    buffer, starts = some_ip_messages(decoder, rows)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decoder.decode(buffer, starts)
+        best = min(best, time.perf_counter() - start)
+    print(f'  SOME/IP      {rows / best / 1e6:8.1f} M messages/s')
+
+
+def write_pcap(path: Path, buffer: np.ndarray, starts: np.ndarray):
+    """
+    Writes every SOME/IP message in an Ethernet frame with IPv4 and UDP headers, one microsecond apart
+    """
+    ends = np.append(starts[1:], len(buffer))
+    with open(path, 'wb') as file:
+        file.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1))
+        for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+            udp = struct.pack('>HHHH', 30501, 30501, end - start + 8, 0)
+            ip = struct.pack('>BBHHHBBH4s4s', 0x45, 0, end - start + 28, 0, 0, 64, 17, 0,
+                             b'\x0a\x00\x00\x01', b'\x0a\x00\x00\x02')
+            frame = b'\x02' * 12 + b'\x08\x00' + ip + udp + buffer[start:end].tobytes()
+            file.write(struct.pack('<IIII', i // 1000000, i % 1000000, len(frame), len(frame)) + frame)
+
+
+def run_capture(ws, rows: int, repeat: int):
+    extracted_system = SystemExtractor(ws.systems[0]).extract()
+    pipeline = CapturePipeline.from_extracted_system(extracted_system)
+    if len(pipeline.decoder.layouts) == 0:
+        return
+    buffer, starts = some_ip_messages(pipeline.decoder, rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'capture.pcap'
+        write_pcap(path, buffer, starts)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in pipeline.iter_chunks(path):
+                pass
+            best = min(best, time.perf_counter() - start)
+    print(f'  pcap         {rows / best / 1e6:8.1f} M packets/s')
+
+
+def run_can(ws, rows: int, repeat: int):
+    channels = [
+        channel
+        for cluster in ws.instances_of(CanClusterVariants)
+        for variant in cluster
+        for channel in variant.physical_channels
+        if isinstance(channel, CanPhysicalChannel)
+    ]
+    if len(channels) == 0:
+        return
+    channel = channels[0]
+    decoder = CanLogDecoder.from_physical_channel(channel)
+    rng = np.random.default_rng(0)
+    can_ids = [frame.id_filter.can_id for frame in decoder.frames]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'can.log'
+        with open(path, 'w') as file:
+            for i, can_id in enumerate(rng.choice(can_ids, size=rows).tolist()):
+                file.write(f'({i / 1000:.6f}) can0 {can_id:03X}##1{rng.bytes(64).hex().upper()}\n')
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in decoder.iter_decode(path):
+                pass
+            best = min(best, time.perf_counter() - start)
+    print(f'  candump      {rows / best / 1e6:8.1f} M frames/s')
+    can_ids = rng.integers(0, 0x800, size=rows * 10)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decoder.index.lookup_array(can_ids)
+        best = min(best, time.perf_counter() - start)
+    print(f'  CAN ID index {rows * 10 / best / 1e6:8.1f} M IDs/s')
+
+
+def run_can_tp(rows: int, repeat: int):
+    """
+    Sends messages of 62 bytes, one first and 8 consecutive frames each, on 4096 connections with extended CAN IDs.
+    The frames of 4096 messages are interleaved, the 1st frames of all connections first, then the 2nd frames.
+    """
+    connections = 4096
+    reassembler = CanTpReassembler(
+        CanTpLayout(f'Tp{i}', CanIdFilter(f'Tp{i}', 0x18da0000 | i, extended=True)) for i in range(connections)
+    )
+    rounds = max(rows // 9 // connections, 1)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'can_tp.log'
+        with open(path, 'w') as file:
+            for r in range(rounds):
+                for k in range(9):
+                    data = '103E' + 'AA' * 6 if k == 0 else f'{0x20 | k & 0xf:02X}' + 'BB' * 7
+                    for i in range(connections):
+                        timestamp = (r * 9 + k) * 0.01 + i * 1e-6
+                        file.write(f'({timestamp:.6f}) can0 {0x18da0000 | i:08X}#{data}\n')
+        chunks = list(iter_can_log(path))
+    frames = sum(len(chunk) for chunk in chunks)
+    best = float('inf')
+    for _ in range(repeat):
+        reassembler.reset()
+        start = time.perf_counter()
+        for chunk in chunks:
+            reassembler.feed(chunk)
+        best = min(best, time.perf_counter() - start)
+    print(f'  ISO-TP       {frames / best / 1e6:8.1f} M frames/s')
+
+
+def run_container(decoders: list[PduDecoder], rows: int, repeat: int):
+    """
+    Packs 4 random PDUs of the 8 longest decoders with short headers into every container, in random order
+    """
+    # Short headers give the length in a single byte
+    decoders = [d for d in decoders if 0 < d.required_length and d.length <= 0xff]
+    decoders = sorted(decoders, key=lambda d: d.length, reverse=True)[:8]
+    if len(decoders) == 0:
+        return
+    demultiplexer = ContainerDemultiplexer('Container', SHORT_HEADER, (
+        ContainedPduLayout(d.name, header_id=i + 1, length=d.length, decoder=d) for i, d in enumerate(decoders)
+    ))
+    rng = np.random.default_rng(0)
+    choice = rng.integers(0, len(decoders), size=(rows, 4))
+    lengths = np.array([d.length for d in decoders], dtype=np.int64)[choice].reshape(-1)
+    ends = np.cumsum(lengths + 4)
+    starts = ends - lengths - 4
+    buffer = rng.integers(0, 256, size=int(ends[-1]), dtype=np.uint8)
+    header = (choice.reshape(-1) + 1) << 8 | lengths
+    buffer[starts[:, np.newaxis] + np.arange(4)] = header.astype('>u4').view(np.uint8).reshape(-1, 4)
+    container_starts = starts[::4]
+    container_ends = ends[3::4]
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        demultiplexer.split(buffer, container_starts, container_ends)
+        best = min(best, time.perf_counter() - start)
+    print(f'  container    {rows / best / 1e6:8.1f} M containers/s split', end='')
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        demultiplexer.decode(buffer, container_starts, container_ends)
+        best = min(best, time.perf_counter() - start)
+    print(f' {rows / best / 1e6:8.1f} M containers/s decoded')
+
+
+def run_some_ip_tp(rows: int, repeat: int):
+    """
+    Splits events of 1024 bytes into 4 segments, the segments of 64 sessions at a time are interleaved
+    """
+    segment_size = 256
+    sessions = max(rows // 4 // 64, 1) * 64
+    session = np.arange(sessions).reshape(-1, 64)
+    # Segment j of every session of a group of 64 sessions, then segment j + 1
+    session = np.repeat(session[:, np.newaxis, :], 4, axis=1).reshape(-1)
+    segment = np.tile(np.repeat(np.arange(4), 64), sessions // 64)
+    count = len(session)
+    header = np.zeros(count, dtype=HEADER_DTYPE.descr + [('tp_header', '>u4')])
+    header['service_id'] = 0x1234
+    header['method_id'] = 0x8001
+    header['session_id'] = session & 0xffff
+    header['length'] = 8 + 4 + segment_size
+    header['message_type'] = 2 | TP_FLAG
+    header['tp_header'] = segment * segment_size | (segment < 3)
+    stride = header.itemsize + segment_size
+    buffer = np.random.default_rng(0).integers(0, 256, size=(count, stride), dtype=np.uint8)
+    buffer[:, :header.itemsize] = header.view(np.uint8).reshape(count, -1)
+    starts = np.arange(count, dtype=np.int64) * stride
+    timestamps = np.arange(count, dtype=np.int64) * 1000
+    reassembler = SomeIpTpReassembler({(0x1234, 0x8001): TpConnection(4 * segment_size, 10 ** 9)})
+    best = float('inf')
+    for _ in range(repeat):
+        reassembler.reset()
+        start = time.perf_counter()
+        reassembler.feed(buffer.reshape(-1), starts, starts + stride, timestamps)
+        best = min(best, time.perf_counter() - start)
+    print(f'  SOME/IP-TP   {count / best / 1e6:8.1f} M segments/s')
+
+
+def run_e2e(rows: int, repeat: int):
+    rng = np.random.default_rng(0)
+    for checker in E2EChecker('PROFILE_04', 0x1234), E2EChecker('PROFILE_05', 0x1234, min_length=32, max_length=32):
+        messages = rng.integers(0, 256, size=(rows, 32), dtype=np.uint8)
+        if checker.profile.length_position is not None:
+            messages[:, :2] = np.frombuffer(np.uint16(32).astype('>u2').tobytes(), dtype=np.uint8)
+            messages[:, 4:8] = np.frombuffer(np.uint32(0x1234).astype('>u4').tobytes(), dtype=np.uint8)
+        best = float('inf')
+        for _ in range(repeat):
+            checker.reset()
+            start = time.perf_counter()
+            checker.check_rows(messages)
+            best = min(best, time.perf_counter() - start)
+        print(f'  E2E {checker.profile.name:<8} {rows / best / 1e6:8.1f} M messages/s')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--size', choices=sizes.keys(), default='small')
+    arg_parser.add_argument('--rows', type=int, default=1000000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    parsed_args = arg_parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / f'synthetic_{parsed_args.size}.arxml'
+        write_arxml(path, sizes[parsed_args.size])
+        run_file(path, parsed_args.rows, parsed_args.repeat)
+    run_e2e(parsed_args.rows, parsed_args.repeat)
+    run_conversions(parsed_args.rows, parsed_args.repeat)
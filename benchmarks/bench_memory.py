@@ -0,0 +1,78 @@
+"""
+Measures the memory held by a loaded workspace.
+
+Usage: python -m benchmarks.bench_memory [--size NAME] [--top N] [--arxml PATH] [--keep-tree]
+Loads a synthetic file of the given size (see benchmarks.generator), or the file given by --arxml,
+and reports the memory traced by tracemalloc once loading finished and its peak during loading.
+The file is loaded with streaming=True so that only the model stays in memory,
+--keep-tree loads it the default way which keeps the XML tree in xml_root.
+The model objects still alive are then counted per class together with their shallow size
+(the object plus its __dict__, if it has one), the N most frequent classes are listed.
+"""
+import gc
+import sys
+import tempfile
+import tracemalloc
+from argparse import ArgumentParser
+from collections import Counter
+from pathlib import Path
+
+import autosar
+from autosar.model.ar_object import ArObject
+from benchmarks.generator import sizes, write_arxml
+
+
+def shallow_size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    instance_dict = getattr(obj, '__dict__', None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
+
+
+def run_file(arxml_path: Path, top: int, streaming: bool):
+    print(f'{arxml_path} ({arxml_path.stat().st_size / 2 ** 20:.1f} MiB)')
+    gc.collect()
+    tracemalloc.start()
+    try:
+        ws = autosar.workspace()
+        ws.load_xml(arxml_path, streaming=streaming)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print(f'  traced after load {current / 2 ** 20:10.1f} MiB')
+    print(f'  traced peak       {peak / 2 ** 20:10.1f} MiB')
+    counts = Counter()
+    totals = Counter()
+    with_dict = set()
+    for obj in gc.get_objects():
+        if isinstance(obj, ArObject):
+            cls = type(obj)
+            counts[cls] += 1
+            totals[cls] += shallow_size(obj)
+            if hasattr(obj, '__dict__'):
+                with_dict.add(cls)
+    total_count = sum(counts.values())
+    dict_count = sum(counts[cls] for cls in with_dict)
+    print(f'  model objects     {total_count:10d} ({dict_count} with __dict__)')
+    print(f'  shallow size      {sum(totals.values()) / 2 ** 20:10.1f} MiB')
+    for cls, count in counts.most_common(top):
+        kind = '__dict__' if cls in with_dict else '__slots__'
+        print(f'    {cls.__name__:<40} {count:8d} {totals[cls] / count:6.0f} B/object  {kind}')
+    del ws
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--size', choices=sizes.keys(), default='large')
+    arg_parser.add_argument('--top', type=int, default=20)
+    arg_parser.add_argument('--arxml')
+    arg_parser.add_argument('--keep-tree', action='store_true')
+    parsed_args = arg_parser.parse_args()
+    if parsed_args.arxml is not None:
+        run_file(Path(parsed_args.arxml), parsed_args.top, not parsed_args.keep_tree)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / f'synthetic_{parsed_args.size}.arxml'
+            write_arxml(path, sizes[parsed_args.size])
+            run_file(path, parsed_args.top, not parsed_args.keep_tree)
@@ -0,0 +1,81 @@
+"""
+Compares namespace stripping after parsing (remove_namespace) with namespace-free parsing.
+
+Usage: python -m benchmarks.bench_namespace [arxml_path] [--signals N] [--repeat R]
+Without arxml_path a synthetic file with N I-SIGNAL/SYSTEM-SIGNAL pairs is generated.
+"""
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable
+
+import autosar
+from autosar.model.base import parse_xml_file, get_xml_namespace, remove_namespace, parse_xml_file_without_namespace
+
+_header = '''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://autosar.org/schema/r4.0 AUTOSAR_4-2-2.xsd">
+<AR-PACKAGES><AR-PACKAGE><SHORT-NAME>Signals</SHORT-NAME><ELEMENTS>
+'''
+_footer = '</ELEMENTS></AR-PACKAGE></AR-PACKAGES></AUTOSAR>\n'
+_signal = '''<I-SIGNAL><SHORT-NAME>Sig{i}</SHORT-NAME><DATA-TYPE-POLICY>LEGACY</DATA-TYPE-POLICY><LENGTH>8</LENGTH>
+<SYSTEM-SIGNAL-REF DEST="SYSTEM-SIGNAL">/Signals/SysSig{i}</SYSTEM-SIGNAL-REF></I-SIGNAL>
+<SYSTEM-SIGNAL><SHORT-NAME>SysSig{i}</SHORT-NAME><DESC><L-2 L="EN">Signal {i}</L-2></DESC></SYSTEM-SIGNAL>
+'''
+
+
+def write_signals_file(path: Path, count: int):
+    with open(path, 'w') as fh:
+        fh.write(_header)
+        for i in range(count):
+            fh.write(_signal.format(i=i))
+        fh.write(_footer)
+
+
+def parse_then_strip(path: Path):
+    xml_root = parse_xml_file(path)
+    remove_namespace(xml_root, get_xml_namespace(xml_root))
+    return xml_root
+
+
+def load_workspace(path: Path):
+    ws = autosar.workspace()
+    ws.load_xml(path)
+    return ws
+
+
+def best_of(func: Callable, path: Path, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(path: Path, repeat: int):
+    parse_only = best_of(parse_xml_file, path, repeat)
+    old = best_of(parse_then_strip, path, repeat)
+    new = best_of(parse_xml_file_without_namespace, path, repeat)
+    load = best_of(load_workspace, path, repeat)
+    print(f'File: {path} ({path.stat().st_size / 2 ** 20:.1f} MiB)')
+    print(f'parse only:                    {parse_only:8.3f} s')
+    print(f'parse + remove_namespace:      {old:8.3f} s')
+    print(f'namespace-free parse:          {new:8.3f} s')
+    print(f'Workspace.load_xml:            {load:8.3f} s')
+    print(f'Saved per load: {old - new:.3f} s ({(old - new) / (load + old - new):.1%} of the previous load time)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('arxml_path', nargs='?')
+    arg_parser.add_argument('--signals', type=int, default=50000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    parsed_args = arg_parser.parse_args()
+    if parsed_args.arxml_path is not None:
+        run(Path(parsed_args.arxml_path), parsed_args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            arxml_path = Path(tmp_dir) / 'signals.arxml'
+            write_signals_file(arxml_path, parsed_args.signals)
+            run(arxml_path, parsed_args.repeat)
@@ -0,0 +1,59 @@
+"""
+Measures repeated Element.ref access on runnables and exclusive areas of deeply nested SwcInternalBehavior trees.
+
+Usage: python -m benchmarks.bench_ref [--depth D] [--components C] [--runnables N] [--repeat R]
+Each component lives D packages deep and owns N runnables and N exclusive areas.
+"""
+import time
+from argparse import ArgumentParser
+
+import autosar
+from autosar.model.element import Element
+
+
+def build_workspace(depth: int, components: int, runnables: int) -> tuple[autosar.workspace, list[Element]]:
+    ws = autosar.workspace()
+    package = ws.create_package('Level0')
+    for level in range(1, depth):
+        package = package.create_sub_package(f'Level{level}')
+    elements = []
+    for i in range(components):
+        swc = package.create_application_software_component(f'Swc{i}')
+        for j in range(runnables):
+            elements.append(swc.behavior.create_runnable(f'Swc{i}_Run{j}'))
+            elements.append(swc.behavior.create_exclusive_area(f'Swc{i}_Area{j}'))
+    return ws, elements
+
+
+def read_refs(ws: autosar.workspace, elements: list[Element], repeat: int, invalidate: bool) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        if invalidate:
+            for package in ws.packages:
+                package._drop_ref_cache()
+        start = time.perf_counter()
+        for element in elements:
+            _ = element.ref
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def run(depth: int, components: int, runnables: int, repeat: int):
+    ws, elements = build_workspace(depth, components, runnables)
+    read_refs(ws, elements, 1, False)
+    cold = read_refs(ws, elements, repeat, True)
+    warm = read_refs(ws, elements, repeat, False)
+    reads = len(elements) * repeat
+    print(f'{len(elements)} elements, ref depth {elements[0].ref.count("/")}: {elements[0].ref}')
+    print(f'rebuilt ref:   {cold:8.3f} s ({cold / reads * 1e9:6.0f} ns/read)')
+    print(f'cached ref:    {warm:8.3f} s ({warm / reads * 1e9:6.0f} ns/read)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--depth', type=int, default=6)
+    arg_parser.add_argument('--components', type=int, default=50)
+    arg_parser.add_argument('--runnables', type=int, default=100)
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    parsed_args = arg_parser.parse_args()
+    run(parsed_args.depth, parsed_args.components, parsed_args.runnables, parsed_args.repeat)
@@ -0,0 +1,148 @@
+"""
+Benchmarks loading, lookups and extraction on synthetic ARXML files of several sizes.
+
+Usage: python -m benchmarks.bench_workspace [--sizes small medium ...] [--repeat R] [--output-dir DIR]
+Files are written by benchmarks.generator; with --output-dir they are kept instead of being temporary.
+Every benchmark reports the best wall time of R runs and the peak traced memory of one extra run under tracemalloc.
+A benchmark that raises is reported as failed instead of aborting the suite.
+"""
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable
+
+import autosar
+from autosar.extractor.parse_arxml import parse_arxml
+from autosar.extractor.system_extractor import SystemExtractor
+from autosar.model.ecu import EcuInstance
+from autosar.model.element import Element
+from autosar.model.pdu import ISignalIPdu
+from autosar.model.signal import ISignal
+from benchmarks.generator import ArxmlGenerator, Scale, sizes, write_arxml
+
+_findall_patterns = (
+    '/*/*',
+    '/Signals/*',
+    '/Signals/Sig1*',
+    '/DataTypes/*/*',
+    '/Components/Swc*',
+)
+_typed_findall_patterns = (
+    ('/**/Sig1*', ISignal),
+    ('/**/*', ISignalIPdu),
+    ('/Ecus/**/*', EcuInstance),
+)
+_instance_classes = (ISignal, ISignalIPdu, EcuInstance, Element)
+
+
+def load_workspace(path: Path):
+    ws = autosar.workspace()
+    ws.load_xml(path)
+    return ws
+
+
+def lookup_refs(scale: Scale) -> list[str]:
+    """
+    Returns references of elements on several nesting levels of a file generated for scale.
+    """
+    refs = [ref for _, ref in ArxmlGenerator(scale).fibex_refs()]
+    for i in range(scale.components):
+        refs.extend((f'/Components/Swc{i}', f'/Components/Swc{i}/Out', f'/Components/Swc{i}/Behavior'))
+        refs.extend(f'/Components/Swc{i}/Behavior/Timer{j}' for j in range(scale.runnables))
+    for i in range(scale.frames):
+        refs.append(f'/Clusters/CanCluster{i % scale.can_clusters}/CanChannel/FrameTrig{i}')
+    for i in range(scale.data_types):
+        refs.extend((f'/DataTypes/CompuMethods/Cm{i}', f'/DataTypes/ApplicationDataTypes/Adt{i}'))
+    return refs
+
+
+def find_all(ws: autosar.workspace, refs: list[str]):
+    find = ws.find
+    for ref in refs:
+        if find(ref) is None:
+            raise LookupError(f'Cannot find {ref}')
+
+
+def findall_patterns(ws: autosar.workspace):
+    for pattern in _findall_patterns:
+        ws.findall(pattern)
+
+
+def referrers_of(ws: autosar.workspace, refs: list[str]):
+    ws.referrers(refs[0], rebuild=True)
+    for ref in refs:
+        ws.referrers(ref)
+
+
+def findall_typed_patterns(ws: autosar.workspace):
+    for pattern, cls in _typed_findall_patterns:
+        ws.findall(pattern, cls)
+
+
+def count_instances(ws: autosar.workspace):
+    for cls in _instance_classes:
+        sum(1 for _ in ws.instances_of(cls))
+
+
+def extract_systems(ws: autosar.workspace):
+    for system in ws.systems:
+        SystemExtractor(system).extract()
+
+
+def measure(func: Callable[[], object], repeat: int) -> tuple[float, int]:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def report(name: str, func: Callable[[], object], repeat: int):
+    try:
+        elapsed, peak = measure(func, repeat)
+    except Exception as e:
+        print(f'  {name:<24} failed: {e.__class__.__name__}: {e}')
+        return
+    print(f'  {name:<24} {elapsed:9.3f} s {peak / 2 ** 20:10.1f} MiB')
+
+
+def run_size(name: str, scale: Scale, arxml_path: Path, repeat: int):
+    write_arxml(arxml_path, scale)
+    print(f'{name}: {arxml_path} ({arxml_path.stat().st_size / 2 ** 20:.1f} MiB), {scale}')
+    report('Workspace.load_xml', lambda: load_workspace(arxml_path), repeat)
+    ws = load_workspace(arxml_path)
+    refs = lookup_refs(scale)
+    report(f'find ({len(refs)} refs)', lambda: find_all(ws, refs), repeat)
+    report(f'findall ({len(_findall_patterns)} globs)', lambda: findall_patterns(ws), repeat)
+    report(f'findall ({len(_typed_findall_patterns)} typed globs)', lambda: findall_typed_patterns(ws), repeat)
+    report(f'instances_of ({len(_instance_classes)} classes)', lambda: count_instances(ws), repeat)
+    report(f'referrers ({len(refs)} refs)', lambda: referrers_of(ws, refs), repeat)
+    report('SystemExtractor.extract', lambda: extract_systems(ws), repeat)
+    report('parse_arxml', lambda: parse_arxml(arxml_path), repeat)
+
+
+def run(size_names: list[str], repeat: int, output_dir: Path):
+    for name in size_names:
+        run_size(name, sizes[name], output_dir / f'synthetic_{name}.arxml', repeat)
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('--sizes', nargs='+', choices=sizes.keys(), default=['small', 'medium'])
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--output-dir')
+    parsed_args = arg_parser.parse_args()
+    if parsed_args.output_dir is not None:
+        run(parsed_args.sizes, parsed_args.repeat, Path(parsed_args.output_dir))
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run(parsed_args.sizes, parsed_args.repeat, Path(tmp_dir))
@@ -0,0 +1,534 @@
+"""
+Generates synthetic AUTOSAR 4.2.2 ARXML files of configurable size for the benchmarks.
+
+Usage: python -m benchmarks.generator arxml_path [--size NAME] [--ecus N] [--can-clusters N] ...
+Any count given on the command line overrides the one of the selected size.
+
+The generated model is self-consistent: every reference resolves, so it can be used to benchmark loading,
+reference lookups, SystemExtractor and parse_arxml. It contains
+ - SW base types and, per data type, a LINEAR compu method, a data constraint, an application primitive
+   data type and an implementation data type,
+ - one sender-receiver interface per SOME/IP service instance (at least one),
+ - application SWCs with a sender port, an internal behavior and periodic runnables sending data,
+ - I-Signals with their system signals, packed into I-Signal I-PDUs,
+ - CAN frames carrying the PDUs, triggered round-robin on the CAN clusters,
+ - Ethernet clusters with one network endpoint and UDP socket per ECU,
+ - one provided SOME/IP service instance per service, each with an event group, a PDU identifier and a
+   sender-receiver to signal mapping of its event signal,
+ - ECU instances with CAN and Ethernet connectors and frame ports for every frame they send or receive,
+ - a SYSTEM referencing all of the above as fibex elements.
+"""
+from argparse import ArgumentParser
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import TextIO
+
+_header = '''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://autosar.org/schema/r4.0 AUTOSAR_4-2-2.xsd">
+<AR-PACKAGES>
+'''
+_footer = '</AR-PACKAGES>\n</AUTOSAR>\n'
+
+_base_types = (
+    ('uint8', 8, 'NONE'),
+    ('uint16', 16, 'NONE'),
+    ('uint32', 32, 'NONE'),
+    ('sint16', 16, '2C'),
+)
+
+
+@dataclass(frozen=True)
+class Scale:
+    ecus: int = 4
+    can_clusters: int = 1
+    ethernet_clusters: int = 1
+    frames: int = 50
+    pdus: int = 50
+    signals: int = 200
+    service_instances: int = 10
+    data_types: int = 20
+    components: int = 10
+    runnables: int = 5
+
+    def __post_init__(self):
+        if self.ecus < 1:
+            raise ValueError('At least one ECU is required')
+        if self.frames > 0 and (self.can_clusters < 1 or self.pdus < 1):
+            raise ValueError('Frames require at least one CAN cluster and one PDU')
+        if self.signals > 0 and self.pdus < 1:
+            raise ValueError('Signals require at least one PDU')
+        if self.service_instances > 0 and self.ethernet_clusters < 1:
+            raise ValueError('Service instances require at least one Ethernet cluster')
+        if self.data_types < 1:
+            raise ValueError('At least one data type is required')
+
+
+sizes = {
+    'small': Scale(),
+    'medium': Scale(
+        ecus=16, can_clusters=4, ethernet_clusters=2, frames=500, pdus=500, signals=4000,
+        service_instances=100, data_types=200, components=100, runnables=10,
+    ),
+    'large': Scale(
+        ecus=64, can_clusters=8, ethernet_clusters=4, frames=4000, pdus=4000, signals=40000,
+        service_instances=1000, data_types=2000, components=500, runnables=20,
+    ),
+}
+
+
+class ArxmlGenerator:
+    def __init__(self, scale: Scale):
+        self.scale = scale
+        self.interfaces = max(scale.service_instances, 1)
+
+    def write(self, fh: TextIO):
+        fh.write(_header)
+        self._write_data_types(fh)
+        self._write_port_interfaces(fh)
+        self._write_components(fh)
+        self._write_signals(fh)
+        self._write_pdus(fh)
+        self._write_frames(fh)
+        self._write_ecus(fh)
+        self._write_clusters(fh)
+        self._write_services(fh)
+        self._write_system(fh)
+        fh.write(_footer)
+
+    @staticmethod
+    def _open_package(fh: TextIO, name: str):
+        fh.write(f'<AR-PACKAGE><SHORT-NAME>{name}</SHORT-NAME>\n')
+
+    @staticmethod
+    def _close_package(fh: TextIO):
+        fh.write('</AR-PACKAGE>\n')
+
+    def _write_elements_package(self, fh: TextIO, name: str, elements):
+        self._open_package(fh, name)
+        fh.write('<ELEMENTS>\n')
+        fh.writelines(elements)
+        fh.write('</ELEMENTS>\n')
+        self._close_package(fh)
+
+    def _base_type(self, i: int) -> tuple[str, int, str]:
+        return _base_types[i % len(_base_types)]
+
+    def _write_data_types(self, fh: TextIO):
+        n = self.scale.data_types
+        self._open_package(fh, 'DataTypes')
+        fh.write('<AR-PACKAGES>\n')
+        self._write_elements_package(fh, 'BaseTypes', (
+            f'<SW-BASE-TYPE><SHORT-NAME>{name}</SHORT-NAME><CATEGORY>FIXED_LENGTH</CATEGORY>'
+            f'<BASE-TYPE-SIZE>{size}</BASE-TYPE-SIZE><BASE-TYPE-ENCODING>{encoding}</BASE-TYPE-ENCODING>'
+            f'<NATIVE-DECLARATION>{name}</NATIVE-DECLARATION></SW-BASE-TYPE>\n'
+            for name, size, encoding in _base_types
+        ))
+        self._write_elements_package(fh, 'CompuMethods', (
+            f'<COMPU-METHOD><SHORT-NAME>Cm{i}</SHORT-NAME><CATEGORY>LINEAR</CATEGORY>'
+            f'<COMPU-INTERNAL-TO-PHYS><COMPU-SCALES><COMPU-SCALE><COMPU-RATIONAL-COEFFS>'
+            f'<COMPU-NUMERATOR><V>{i % 7}</V><V>{i % 5 + 1}</V></COMPU-NUMERATOR>'
+            f'<COMPU-DENOMINATOR><V>{i % 3 + 1}</V></COMPU-DENOMINATOR>'
+            f'</COMPU-RATIONAL-COEFFS></COMPU-SCALE></COMPU-SCALES></COMPU-INTERNAL-TO-PHYS></COMPU-METHOD>\n'
+            for i in range(n)
+        ))
+        self._write_elements_package(fh, 'DataConstrs', (
+            f'<DATA-CONSTR><SHORT-NAME>Dc{i}</SHORT-NAME><DATA-CONSTR-RULES><DATA-CONSTR-RULE><INTERNAL-CONSTRS>'
+            f'<LOWER-LIMIT>0</LOWER-LIMIT><UPPER-LIMIT>{2 ** self._base_type(i)[1] - 1}</UPPER-LIMIT>'
+            f'</INTERNAL-CONSTRS></DATA-CONSTR-RULE></DATA-CONSTR-RULES></DATA-CONSTR>\n'
+            for i in range(n)
+        ))
+        self._write_elements_package(fh, 'ApplicationDataTypes', (
+            f'<APPLICATION-PRIMITIVE-DATA-TYPE><SHORT-NAME>Adt{i}</SHORT-NAME><CATEGORY>VALUE</CATEGORY>'
+            f'<SW-DATA-DEF-PROPS><SW-DATA-DEF-PROPS-VARIANTS><SW-DATA-DEF-PROPS-CONDITIONAL>'
+            f'<COMPU-METHOD-REF DEST="COMPU-METHOD">/DataTypes/CompuMethods/Cm{i}</COMPU-METHOD-REF>'
+            f'<DATA-CONSTR-REF DEST="DATA-CONSTR">/DataTypes/DataConstrs/Dc{i}</DATA-CONSTR-REF>'
+            f'</SW-DATA-DEF-PROPS-CONDITIONAL></SW-DATA-DEF-PROPS-VARIANTS></SW-DATA-DEF-PROPS>'
+            f'</APPLICATION-PRIMITIVE-DATA-TYPE>\n'
+            for i in range(n)
+        ))
+        self._write_elements_package(fh, 'ImplementationDataTypes', (
+            f'<IMPLEMENTATION-DATA-TYPE><SHORT-NAME>Idt{i}</SHORT-NAME><CATEGORY>VALUE</CATEGORY>'
+            f'<SW-DATA-DEF-PROPS><SW-DATA-DEF-PROPS-VARIANTS><SW-DATA-DEF-PROPS-CONDITIONAL>'
+            f'<BASE-TYPE-REF DEST="SW-BASE-TYPE">/DataTypes/BaseTypes/{self._base_type(i)[0]}</BASE-TYPE-REF>'
+            f'<COMPU-METHOD-REF DEST="COMPU-METHOD">/DataTypes/CompuMethods/Cm{i}</COMPU-METHOD-REF>'
+            f'</SW-DATA-DEF-PROPS-CONDITIONAL></SW-DATA-DEF-PROPS-VARIANTS></SW-DATA-DEF-PROPS>'
+            f'</IMPLEMENTATION-DATA-TYPE>\n'
+            for i in range(n)
+        ))
+        fh.write('</AR-PACKAGES>\n')
+        self._close_package(fh)
+
+    def _write_port_interfaces(self, fh: TextIO):
+        self._write_elements_package(fh, 'PortInterfaces', (
+            f'<SENDER-RECEIVER-INTERFACE><SHORT-NAME>Srv{i}_If</SHORT-NAME><IS-SERVICE>false</IS-SERVICE>'
+            f'<DATA-ELEMENTS><VARIABLE-DATA-PROTOTYPE><SHORT-NAME>Event{i}</SHORT-NAME>'
+            f'<TYPE-TREF DEST="APPLICATION-PRIMITIVE-DATA-TYPE">'
+            f'/DataTypes/ApplicationDataTypes/Adt{i % self.scale.data_types}</TYPE-TREF>'
+            f'</VARIABLE-DATA-PROTOTYPE></DATA-ELEMENTS></SENDER-RECEIVER-INTERFACE>\n'
+            for i in range(self.interfaces)
+        ))
+
+    def _component(self, i: int) -> str:
+        interface = i % self.interfaces
+        runnables = []
+        events = []
+        for j in range(self.scale.runnables):
+            runnables.append(
+                f'<RUNNABLE-ENTITY><SHORT-NAME>Run{j}</SHORT-NAME>'
+                f'<CAN-BE-INVOKED-CONCURRENTLY>false</CAN-BE-INVOKED-CONCURRENTLY>'
+                f'<DATA-SEND-POINTS><VARIABLE-ACCESS><SHORT-NAME>Send{j}</SHORT-NAME><ACCESSED-VARIABLE>'
+                f'<AUTOSAR-VARIABLE-IREF>'
+                f'<PORT-PROTOTYPE-REF DEST="P-PORT-PROTOTYPE">/Components/Swc{i}/Out</PORT-PROTOTYPE-REF>'
+                f'<TARGET-DATA-PROTOTYPE-REF DEST="VARIABLE-DATA-PROTOTYPE">'
+                f'/PortInterfaces/Srv{interface}_If/Event{interface}</TARGET-DATA-PROTOTYPE-REF>'
+                f'</AUTOSAR-VARIABLE-IREF></ACCESSED-VARIABLE></VARIABLE-ACCESS></DATA-SEND-POINTS>'
+                f'<SYMBOL>Swc{i}_Run{j}</SYMBOL></RUNNABLE-ENTITY>'
+            )
+            events.append(
+                f'<TIMING-EVENT><SHORT-NAME>Timer{j}</SHORT-NAME>'
+                f'<START-ON-EVENT-REF DEST="RUNNABLE-ENTITY">/Components/Swc{i}/Behavior/Run{j}</START-ON-EVENT-REF>'
+                f'<PERIOD>{0.01 * (j % 10 + 1):.2f}</PERIOD></TIMING-EVENT>'
+            )
+        return (
+            f'<APPLICATION-SW-COMPONENT-TYPE><SHORT-NAME>Swc{i}</SHORT-NAME>'
+            f'<PORTS><P-PORT-PROTOTYPE><SHORT-NAME>Out</SHORT-NAME>'
+            f'<PROVIDED-INTERFACE-TREF DEST="SENDER-RECEIVER-INTERFACE">/PortInterfaces/Srv{interface}_If'
+            f'</PROVIDED-INTERFACE-TREF></P-PORT-PROTOTYPE></PORTS>'
+            f'<INTERNAL-BEHAVIORS><SWC-INTERNAL-BEHAVIOR><SHORT-NAME>Behavior</SHORT-NAME>'
+            f'<EVENTS>{"".join(events)}</EVENTS><RUNNABLES>{"".join(runnables)}</RUNNABLES>'
+            f'<SUPPORTS-MULTIPLE-INSTANTIATION>false</SUPPORTS-MULTIPLE-INSTANTIATION>'
+            f'</SWC-INTERNAL-BEHAVIOR></INTERNAL-BEHAVIORS></APPLICATION-SW-COMPONENT-TYPE>\n'
+        )
+
+    def _write_components(self, fh: TextIO):
+        self._write_elements_package(fh, 'Components', map(self._component, range(self.scale.components)))
+
+    def _i_signal(self, name: str, system_signal: str, i: int) -> str:
+        base_type, size, _ = self._base_type(i)
+        return (
+            f'<I-SIGNAL><SHORT-NAME>{name}</SHORT-NAME><DATA-TYPE-POLICY>LEGACY</DATA-TYPE-POLICY>'
+            f'<LENGTH>{size}</LENGTH><NETWORK-REPRESENTATION-PROPS><SW-DATA-DEF-PROPS-VARIANTS>'
+            f'<SW-DATA-DEF-PROPS-CONDITIONAL>'
+            f'<BASE-TYPE-REF DEST="SW-BASE-TYPE">/DataTypes/BaseTypes/{base_type}</BASE-TYPE-REF>'
+            f'<COMPU-METHOD-REF DEST="COMPU-METHOD">/DataTypes/CompuMethods/Cm{i % self.scale.data_types}'
+            f'</COMPU-METHOD-REF></SW-DATA-DEF-PROPS-CONDITIONAL></SW-DATA-DEF-PROPS-VARIANTS>'
+            f'</NETWORK-REPRESENTATION-PROPS>'
+            f'<SYSTEM-SIGNAL-REF DEST="SYSTEM-SIGNAL">/Signals/{system_signal}</SYSTEM-SIGNAL-REF></I-SIGNAL>\n'
+            f'<SYSTEM-SIGNAL><SHORT-NAME>{system_signal}</SHORT-NAME><DYNAMIC-LENGTH>false</DYNAMIC-LENGTH>'
+            f'</SYSTEM-SIGNAL>\n'
+        )
+
+    def _write_signals(self, fh: TextIO):
+        signals = (self._i_signal(f'Sig{i}', f'SysSig{i}', i) for i in range(self.scale.signals))
+        events = (self._i_signal(f'Event{i}', f'SysEvent{i}', i) for i in range(self.scale.service_instances))
+        self._open_package(fh, 'Signals')
+        fh.write('<ELEMENTS>\n')
+        fh.writelines(signals)
+        fh.writelines(events)
+        fh.write('</ELEMENTS>\n')
+        self._close_package(fh)
+
+    def _pdu_layout(self) -> list[list[tuple[int, int]]]:
+        """
+        Returns (signal index, start bit) pairs for every PDU; signals are distributed round-robin.
+        """
+        layout = [[] for _ in range(self.scale.pdus)]
+        for i in range(self.scale.signals):
+            layout[i % self.scale.pdus].append(i)
+        result = []
+        for signals in layout:
+            position = 0
+            pdu = []
+            for i in signals:
+                pdu.append((i, position))
+                position += self._base_type(i)[1]
+            result.append(pdu)
+        return result
+
+    @staticmethod
+    def _i_signal_i_pdu(name: str, mappings: list[tuple[str, int]], length: int) -> str:
+        mapping_xml = ''.join(
+            f'<I-SIGNAL-TO-I-PDU-MAPPING><SHORT-NAME>{signal}_Map</SHORT-NAME>'
+            f'<I-SIGNAL-REF DEST="I-SIGNAL">/Signals/{signal}</I-SIGNAL-REF>'
+            f'<PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</PACKING-BYTE-ORDER>'
+            f'<START-POSITION>{start}</START-POSITION><TRANSFER-PROPERTY>PENDING</TRANSFER-PROPERTY>'
+            f'</I-SIGNAL-TO-I-PDU-MAPPING>'
+            for signal, start in mappings
+        )
+        return (
+            f'<I-SIGNAL-I-PDU><SHORT-NAME>{name}</SHORT-NAME><LENGTH>{length}</LENGTH>'
+            f'<I-SIGNAL-TO-PDU-MAPPINGS>{mapping_xml}</I-SIGNAL-TO-PDU-MAPPINGS>'
+            f'<UNUSED-BIT-PATTERN>0</UNUSED-BIT-PATTERN></I-SIGNAL-I-PDU>\n'
+        )
+
+    def _write_pdus(self, fh: TextIO):
+        self._open_package(fh, 'Pdus')
+        fh.write('<ELEMENTS>\n')
+        for i, layout in enumerate(self._pdu_layout()):
+            length = sum(self._base_type(s)[1] for s, _ in layout) // 8
+            fh.write(self._i_signal_i_pdu(f'Pdu{i}', [(f'Sig{s}', start) for s, start in layout], max(length, 1)))
+        for i in range(self.scale.service_instances):
+            fh.write(self._i_signal_i_pdu(f'EventPdu{i}', [(f'Event{i}', 0)], self._base_type(i)[1] // 8))
+        if self.scale.service_instances > 0:
+            identifiers = ''.join(
+                f'<SO-CON-I-PDU-IDENTIFIER><SHORT-NAME>EventId{i}</SHORT-NAME>'
+                f'<HEADER-ID>{self._service_id(i) << 16 | 0x8001}</HEADER-ID>'
+                f'<PDU-TRIGGERING-REF DEST="PDU-TRIGGERING">'
+                f'/Clusters/EthCluster{self._service_cluster(i)}/EthChannel/EventPduTrig{i}</PDU-TRIGGERING-REF>'
+                f'</SO-CON-I-PDU-IDENTIFIER>'
+                for i in range(self.scale.service_instances)
+            )
+            fh.write(
+                f'<SOCKET-CONNECTION-IPDU-IDENTIFIER-SET><SHORT-NAME>PduIdentifiers</SHORT-NAME>'
+                f'<I-PDU-IDENTIFIERS>{identifiers}</I-PDU-IDENTIFIERS></SOCKET-CONNECTION-IPDU-IDENTIFIER-SET>\n'
+            )
+        fh.write('</ELEMENTS>\n')
+        self._close_package(fh)
+
+    def _write_frames(self, fh: TextIO):
+        self._write_elements_package(fh, 'Frames', (
+            f'<CAN-FRAME><SHORT-NAME>Frame{i}</SHORT-NAME><FRAME-LENGTH>64</FRAME-LENGTH>'
+            f'<PDU-TO-FRAME-MAPPINGS><PDU-TO-FRAME-MAPPING><SHORT-NAME>Frame{i}_Pdu</SHORT-NAME>'
+            f'<PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</PACKING-BYTE-ORDER>'
+            f'<PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/Pdu{i % self.scale.pdus}</PDU-REF>'
+            f'<START-POSITION>0</START-POSITION></PDU-TO-FRAME-MAPPING></PDU-TO-FRAME-MAPPINGS></CAN-FRAME>\n'
+            for i in range(self.scale.frames)
+        ))
+
+    def _frame_ecus(self, i: int) -> tuple[int, int]:
+        """
+        Returns the sending and receiving ECU of frame i.
+        """
+        return i % self.scale.ecus, (i + 1) % self.scale.ecus
+
+    def _service_id(self, i: int) -> int:
+        return 0x1000 + i
+
+    def _service_ecu(self, i: int) -> int:
+        return i % self.scale.ecus
+
+    def _service_cluster(self, i: int) -> int:
+        return i % self.scale.ethernet_clusters
+
+    def _ecu(self, e: int) -> str:
+        ports: list[list[str]] = [[] for _ in range(self.scale.can_clusters)]
+        for i in range(self.scale.frames):
+            tx, rx = self._frame_ecus(i)
+            for ecu, direction in ((tx, 'OUT'), (rx, 'IN')):
+                if ecu == e:
+                    ports[i % self.scale.can_clusters].append(
+                        f'<FRAME-PORT><SHORT-NAME>Frame{i}_{direction}</SHORT-NAME>'
+                        f'<COMMUNICATION-DIRECTION>{direction}</COMMUNICATION-DIRECTION></FRAME-PORT>'
+                    )
+        controllers = ''.join(
+            f'<CAN-COMMUNICATION-CONTROLLER><SHORT-NAME>CanCtrl{c}</SHORT-NAME></CAN-COMMUNICATION-CONTROLLER>'
+            for c in range(self.scale.can_clusters)
+        ) + ''.join(
+            f'<ETHERNET-COMMUNICATION-CONTROLLER><SHORT-NAME>EthCtrl{c}</SHORT-NAME>'
+            f'</ETHERNET-COMMUNICATION-CONTROLLER>'
+            for c in range(self.scale.ethernet_clusters)
+        )
+        connectors = ''.join(
+            f'<CAN-COMMUNICATION-CONNECTOR><SHORT-NAME>CanConn{c}</SHORT-NAME>'
+            f'<COMM-CONTROLLER-REF DEST="CAN-COMMUNICATION-CONTROLLER">/Ecus/Ecu{e}/CanCtrl{c}</COMM-CONTROLLER-REF>'
+            f'<ECU-COMM-PORT-INSTANCES>{"".join(ports[c])}</ECU-COMM-PORT-INSTANCES></CAN-COMMUNICATION-CONNECTOR>'
+            for c in range(self.scale.can_clusters)
+        ) + ''.join(
+            f'<ETHERNET-COMMUNICATION-CONNECTOR><SHORT-NAME>EthConn{c}</SHORT-NAME>'
+            f'<COMM-CONTROLLER-REF DEST="ETHERNET-COMMUNICATION-CONTROLLER">/Ecus/Ecu{e}/EthCtrl{c}'
+            f'</COMM-CONTROLLER-REF><ECU-COMM-PORT-INSTANCES></ECU-COMM-PORT-INSTANCES>'
+            f'<MAXIMUM-TRANSMISSION-UNIT>1500</MAXIMUM-TRANSMISSION-UNIT></ETHERNET-COMMUNICATION-CONNECTOR>'
+            for c in range(self.scale.ethernet_clusters)
+        )
+        return (
+            f'<ECU-INSTANCE><SHORT-NAME>Ecu{e}</SHORT-NAME><COMM-CONTROLLERS>{controllers}</COMM-CONTROLLERS>'
+            f'<CONNECTORS>{connectors}</CONNECTORS><SLEEP-MODE-SUPPORTED>false</SLEEP-MODE-SUPPORTED>'
+            f'</ECU-INSTANCE>\n'
+        )
+
+    def _write_ecus(self, fh: TextIO):
+        self._write_elements_package(fh, 'Ecus', map(self._ecu, range(self.scale.ecus)))
+
+    def _can_cluster(self, c: int) -> str:
+        triggerings = []
+        for i in range(c, self.scale.frames, self.scale.can_clusters):
+            tx, rx = self._frame_ecus(i)
+            triggerings.append(
+                f'<CAN-FRAME-TRIGGERING><SHORT-NAME>FrameTrig{i}</SHORT-NAME>'
+                f'<FRAME-PORT-REFS>'
+                f'<FRAME-PORT-REF DEST="FRAME-PORT">/Ecus/Ecu{tx}/CanConn{c}/Frame{i}_OUT</FRAME-PORT-REF>'
+                f'<FRAME-PORT-REF DEST="FRAME-PORT">/Ecus/Ecu{rx}/CanConn{c}/Frame{i}_IN</FRAME-PORT-REF>'
+                f'</FRAME-PORT-REFS><FRAME-REF DEST="CAN-FRAME">/Frames/Frame{i}</FRAME-REF>'
+                f'<PDU-TRIGGERINGS><PDU-TRIGGERING-REF-CONDITIONAL>'
+                f'<PDU-TRIGGERING-REF DEST="PDU-TRIGGERING">/Clusters/CanCluster{c}/CanChannel/PduTrig{i}'
+                f'</PDU-TRIGGERING-REF></PDU-TRIGGERING-REF-CONDITIONAL></PDU-TRIGGERINGS>'
+                f'<CAN-ADDRESSING-MODE>STANDARD</CAN-ADDRESSING-MODE>'
+                f'<IDENTIFIER>{i % 0x7ff}</IDENTIFIER></CAN-FRAME-TRIGGERING>'
+            )
+        pdu_triggerings = ''.join(
+            f'<PDU-TRIGGERING><SHORT-NAME>PduTrig{i}</SHORT-NAME>'
+            f'<I-PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/Pdu{i % self.scale.pdus}</I-PDU-REF></PDU-TRIGGERING>'
+            for i in range(c, self.scale.frames, self.scale.can_clusters)
+        )
+        connectors = ''.join(
+            f'<COMMUNICATION-CONNECTOR-REF-CONDITIONAL><COMMUNICATION-CONNECTOR-REF DEST="CAN-COMMUNICATION-CONNECTOR">'
+            f'/Ecus/Ecu{e}/CanConn{c}</COMMUNICATION-CONNECTOR-REF></COMMUNICATION-CONNECTOR-REF-CONDITIONAL>'
+            for e in range(self.scale.ecus)
+        )
+        return (
+            f'<CAN-CLUSTER><SHORT-NAME>CanCluster{c}</SHORT-NAME><CAN-CLUSTER-VARIANTS><CAN-CLUSTER-CONDITIONAL>'
+            f'<BAUDRATE>500000</BAUDRATE><PHYSICAL-CHANNELS><CAN-PHYSICAL-CHANNEL>'
+            f'<SHORT-NAME>CanChannel</SHORT-NAME><COMM-CONNECTORS>{connectors}</COMM-CONNECTORS>'
+            f'<FRAME-TRIGGERINGS>{"".join(triggerings)}</FRAME-TRIGGERINGS>'
+            f'<PDU-TRIGGERINGS>{pdu_triggerings}</PDU-TRIGGERINGS>'
+            f'</CAN-PHYSICAL-CHANNEL></PHYSICAL-CHANNELS><PROTOCOL-NAME>CAN</PROTOCOL-NAME>'
+            f'</CAN-CLUSTER-CONDITIONAL></CAN-CLUSTER-VARIANTS></CAN-CLUSTER>\n'
+        )
+
+    def _ethernet_cluster(self, c: int) -> str:
+        ecus = range(self.scale.ecus)
+        connectors = ''.join(
+            f'<COMMUNICATION-CONNECTOR-REF-CONDITIONAL>'
+            f'<COMMUNICATION-CONNECTOR-REF DEST="ETHERNET-COMMUNICATION-CONNECTOR">/Ecus/Ecu{e}/EthConn{c}'
+            f'</COMMUNICATION-CONNECTOR-REF></COMMUNICATION-CONNECTOR-REF-CONDITIONAL>'
+            for e in ecus
+        )
+        endpoints = ''.join(
+            f'<NETWORK-ENDPOINT><SHORT-NAME>Ecu{e}_Endpoint</SHORT-NAME><NETWORK-ENDPOINT-ADDRESSES>'
+            f'<IPV-4-CONFIGURATION><IPV-4-ADDRESS>10.{c}.{e // 250}.{e % 250 + 1}</IPV-4-ADDRESS>'
+            f'<IPV-4-ADDRESS-SOURCE>FIXED</IPV-4-ADDRESS-SOURCE><NETWORK-MASK>255.255.0.0</NETWORK-MASK>'
+            f'</IPV-4-CONFIGURATION></NETWORK-ENDPOINT-ADDRESSES></NETWORK-ENDPOINT>'
+            for e in ecus
+        )
+        sockets = ''.join(
+            f'<SOCKET-ADDRESS><SHORT-NAME>Ecu{e}_Socket</SHORT-NAME><APPLICATION-ENDPOINT>'
+            f'<SHORT-NAME>Ecu{e}_AppEndpoint</SHORT-NAME><MAX-NUMBER-OF-CONNECTIONS>1</MAX-NUMBER-OF-CONNECTIONS>'
+            f'<NETWORK-ENDPOINT-REF DEST="NETWORK-ENDPOINT">/Clusters/EthCluster{c}/EthChannel/Ecu{e}_Endpoint'
+            f'</NETWORK-ENDPOINT-REF><TP-CONFIGURATION><UDP-TP><UDP-TP-PORT><PORT-NUMBER>30501</PORT-NUMBER>'
+            f'</UDP-TP-PORT></UDP-TP></TP-CONFIGURATION></APPLICATION-ENDPOINT>'
+            f'<CONNECTOR-REF DEST="ETHERNET-COMMUNICATION-CONNECTOR">/Ecus/Ecu{e}/EthConn{c}</CONNECTOR-REF>'
+            f'</SOCKET-ADDRESS>'
+            for e in ecus
+        )
+        pdu_triggerings = ''.join(
+            f'<PDU-TRIGGERING><SHORT-NAME>EventPduTrig{i}</SHORT-NAME>'
+            f'<I-PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/EventPdu{i}</I-PDU-REF></PDU-TRIGGERING>'
+            for i in range(c, self.scale.service_instances, self.scale.ethernet_clusters)
+        )
+        return (
+            f'<ETHERNET-CLUSTER><SHORT-NAME>EthCluster{c}</SHORT-NAME><ETHERNET-CLUSTER-VARIANTS>'
+            f'<ETHERNET-CLUSTER-CONDITIONAL><BAUDRATE>100000000</BAUDRATE><PHYSICAL-CHANNELS>'
+            f'<ETHERNET-PHYSICAL-CHANNEL><SHORT-NAME>EthChannel</SHORT-NAME>'
+            f'<COMM-CONNECTORS>{connectors}</COMM-CONNECTORS><NETWORK-ENDPOINTS>{endpoints}</NETWORK-ENDPOINTS>'
+            f'<PDU-TRIGGERINGS>{pdu_triggerings}</PDU-TRIGGERINGS>'
+            f'<SO-AD-CONFIG><SOCKET-ADDRESSS>{sockets}</SOCKET-ADDRESSS></SO-AD-CONFIG>'
+            f'</ETHERNET-PHYSICAL-CHANNEL></PHYSICAL-CHANNELS><PROTOCOL-NAME>ETH</PROTOCOL-NAME>'
+            f'</ETHERNET-CLUSTER-CONDITIONAL></ETHERNET-CLUSTER-VARIANTS></ETHERNET-CLUSTER>\n'
+        )
+
+    def _write_clusters(self, fh: TextIO):
+        self._open_package(fh, 'Clusters')
+        fh.write('<ELEMENTS>\n')
+        fh.writelines(map(self._can_cluster, range(self.scale.can_clusters)))
+        fh.writelines(map(self._ethernet_cluster, range(self.scale.ethernet_clusters)))
+        fh.write('</ELEMENTS>\n')
+        self._close_package(fh)
+
+    def _service_instance(self, i: int) -> str:
+        return (
+            f'<PROVIDED-SERVICE-INSTANCE><SHORT-NAME>Srv{i}</SHORT-NAME>'
+            f'<SERVICE-IDENTIFIER>{self._service_id(i)}</SERVICE-IDENTIFIER>'
+            f'<INSTANCE-IDENTIFIER>1</INSTANCE-IDENTIFIER><MAJOR-VERSION>1</MAJOR-VERSION>'
+            f'<MINOR-VERSION>0</MINOR-VERSION><EVENT-HANDLERS><EVENT-HANDLER><SHORT-NAME>Srv{i}_Events</SHORT-NAME>'
+            f'<EVENT-GROUP-IDENTIFIER>1</EVENT-GROUP-IDENTIFIER><PDU-ACTIVATION-ROUTING-GROUPS>'
+            f'<PDU-ACTIVATION-ROUTING-GROUP><SHORT-NAME>Srv{i}_Udp</SHORT-NAME>'
+            f'<EVENT-GROUP-CONTROL-TYPE>ACTIVATION-UNICAST</EVENT-GROUP-CONTROL-TYPE><I-PDU-IDENTIFIER-UDP-REFS>'
+            f'<I-PDU-IDENTIFIER-UDP-REF DEST="SO-CON-I-PDU-IDENTIFIER">/Pdus/PduIdentifiers/EventId{i}'
+            f'</I-PDU-IDENTIFIER-UDP-REF></I-PDU-IDENTIFIER-UDP-REFS></PDU-ACTIVATION-ROUTING-GROUP>'
+            f'</PDU-ACTIVATION-ROUTING-GROUPS></EVENT-HANDLER></EVENT-HANDLERS>'
+            f'<LOCAL-UNICAST-ADDRESSS><APPLICATION-ENDPOINT-REF-CONDITIONAL>'
+            f'<APPLICATION-ENDPOINT-REF DEST="APPLICATION-ENDPOINT">'
+            f'/Clusters/EthCluster{self._service_cluster(i)}/EthChannel/'
+            f'Ecu{self._service_ecu(i)}_Socket/Ecu{self._service_ecu(i)}_AppEndpoint</APPLICATION-ENDPOINT-REF>'
+            f'</APPLICATION-ENDPOINT-REF-CONDITIONAL></LOCAL-UNICAST-ADDRESSS></PROVIDED-SERVICE-INSTANCE>'
+        )
+
+    def _write_services(self, fh: TextIO):
+        if self.scale.service_instances == 0:
+            return
+        instances = ''.join(map(self._service_instance, range(self.scale.service_instances)))
+        self._write_elements_package(fh, 'Services', (
+            f'<SERVICE-INSTANCE-COLLECTION-SET><SHORT-NAME>ServiceInstances</SHORT-NAME>'
+            f'<SERVICE-INSTANCES>{instances}</SERVICE-INSTANCES></SERVICE-INSTANCE-COLLECTION-SET>\n',
+        ))
+
+    def fibex_refs(self):
+        """
+        Yields (DEST, reference) of every fibex element referenced by the system.
+        """
+        scale = self.scale
+        yield from (('ECU-INSTANCE', f'/Ecus/Ecu{i}') for i in range(scale.ecus))
+        yield from (('CAN-CLUSTER', f'/Clusters/CanCluster{i}') for i in range(scale.can_clusters))
+        yield from (('ETHERNET-CLUSTER', f'/Clusters/EthCluster{i}') for i in range(scale.ethernet_clusters))
+        yield from (('CAN-FRAME', f'/Frames/Frame{i}') for i in range(scale.frames))
+        yield from (('I-SIGNAL-I-PDU', f'/Pdus/Pdu{i}') for i in range(scale.pdus))
+        yield from (('I-SIGNAL-I-PDU', f'/Pdus/EventPdu{i}') for i in range(scale.service_instances))
+        yield from (('I-SIGNAL', f'/Signals/Sig{i}') for i in range(scale.signals))
+        yield from (('I-SIGNAL', f'/Signals/Event{i}') for i in range(scale.service_instances))
+        if scale.service_instances > 0:
+            yield 'SOCKET-CONNECTION-IPDU-IDENTIFIER-SET', '/Pdus/PduIdentifiers'
+            yield 'SERVICE-INSTANCE-COLLECTION-SET', '/Services/ServiceInstances'
+
+    def _write_system(self, fh: TextIO):
+        fibex = ''.join(
+            f'<FIBEX-ELEMENT-REF-CONDITIONAL><FIBEX-ELEMENT-REF DEST="{dest}">{ref}</FIBEX-ELEMENT-REF>'
+            f'</FIBEX-ELEMENT-REF-CONDITIONAL>'
+            for dest, ref in self.fibex_refs()
+        )
+        data_mappings = ''.join(
+            f'<SENDER-RECEIVER-TO-SIGNAL-MAPPING><DATA-ELEMENT-IREF>'
+            f'<CONTEXT-PORT-REF DEST="P-PORT-PROTOTYPE">/Components/Swc{i % max(self.scale.components, 1)}/Out'
+            f'</CONTEXT-PORT-REF><TARGET-DATA-PROTOTYPE-REF DEST="VARIABLE-DATA-PROTOTYPE">'
+            f'/PortInterfaces/Srv{i}_If/Event{i}</TARGET-DATA-PROTOTYPE-REF></DATA-ELEMENT-IREF>'
+            f'<SYSTEM-SIGNAL-REF DEST="SYSTEM-SIGNAL">/Signals/SysEvent{i}</SYSTEM-SIGNAL-REF>'
+            f'</SENDER-RECEIVER-TO-SIGNAL-MAPPING>'
+            for i in range(self.scale.service_instances)
+        )
+        self._write_elements_package(fh, 'Systems', (
+            f'<SYSTEM><SHORT-NAME>System</SHORT-NAME><FIBEX-ELEMENTS>{fibex}</FIBEX-ELEMENTS>'
+            f'<MAPPINGS><SYSTEM-MAPPING><SHORT-NAME>Mapping</SHORT-NAME>'
+            f'<DATA-MAPPINGS>{data_mappings}</DATA-MAPPINGS></SYSTEM-MAPPING></MAPPINGS></SYSTEM>\n',
+        ))
+
+
+def write_arxml(path: Path, scale: Scale):
+    with open(path, 'w') as fh:
+        ArxmlGenerator(scale).write(fh)
+
+
+def add_scale_arguments(arg_parser: ArgumentParser):
+    """
+    Adds one --<count> option per Scale field; unset options keep the value of the selected size.
+    """
+    for field in fields(Scale):
+        arg_parser.add_argument(f'--{field.name.replace("_", "-")}', type=int, dest=field.name)
+
+
+def scale_from_arguments(base: Scale, parsed_args) -> Scale:
+    overrides = {
+        field.name: value
+        for field in fields(Scale)
+        if (value := getattr(parsed_args, field.name)) is not None
+    }
+    return replace(base, **overrides)
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument('arxml_path')
+    arg_parser.add_argument('--size', choices=sizes.keys(), default='small')
+    add_scale_arguments(arg_parser)
+    parsed_args = arg_parser.parse_args()
+    arxml_path = Path(parsed_args.arxml_path)
+    write_arxml(arxml_path, scale_from_arguments(sizes[parsed_args.size], parsed_args))
+    print(f'Wrote {arxml_path} ({arxml_path.stat().st_size / 2 ** 20:.1f} MiB)')
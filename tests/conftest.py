@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+import autosar
+from benchmarks.generator import Scale, write_arxml
+
+# Small enough to load in a few milliseconds, with every kind of element the generator writes
+TEST_SCALE = Scale(ecus=2, frames=8, pdus=8, signals=24, service_instances=3, data_types=6, components=3, runnables=2)
+
+
+@pytest.fixture(scope='session')
+def arxml_file(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp('arxml') / 'generated.arxml'
+    write_arxml(path, TEST_SCALE)
+    return path
+
+
+@pytest.fixture
+def ws(arxml_file):
+    ws = autosar.workspace()
+    ws.load_xml(arxml_file)
+    return ws
@@ -0,0 +1,94 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.can import CanIdFilter, CanIdIndex
+
+
+def accepts(id_filter: CanIdFilter, can_id: int, extended: bool) -> bool:
+    """
+    Checks one filter the way the triggering is specified, without any index
+    """
+    if id_filter.extended != extended:
+        return False
+    if id_filter.lower_can_id is not None and id_filter.upper_can_id is not None:
+        return id_filter.lower_can_id <= can_id <= id_filter.upper_can_id
+    if id_filter.can_id is None:
+        return False
+    mask = id_filter.id_mask if id_filter.rx_mask is None else id_filter.rx_mask & id_filter.id_mask
+    return can_id & mask == id_filter.can_id & mask
+
+
+def reference_resolve(filters: list[CanIdFilter], can_id: int, extended: bool) -> int | None:
+    matches = [i for i, f in enumerate(filters) if accepts(f, can_id, extended)]
+    exact = [i for i in matches if filters[i].rx_mask is None and filters[i].lower_can_id is None]
+    exact = [i for i in exact if filters[i].can_id == can_id]
+    if exact:
+        return exact[0]
+    return matches[0] if matches else None
+
+
+def random_filters(rng, count: int) -> list[CanIdFilter]:
+    filters = []
+    for i in range(count):
+        extended = bool(rng.random() < 0.3)
+        width = 29 if extended else 11
+        # Small IDs so that the filters overlap
+        can_id = int(rng.integers(0, 64))
+        kind = rng.integers(0, 4)
+        if kind == 0:
+            filters.append(CanIdFilter(f'Exact{i}', can_id, extended))
+        elif kind == 1:
+            low = int(rng.integers(1, 5))
+            mask = ((1 << width) - 1) & ~((1 << low) - 1)
+            filters.append(CanIdFilter(f'Low{i}', can_id, extended, rx_mask=mask))
+        elif kind == 2:
+            mask = ((1 << width) - 1) & ~int(rng.integers(1, 64))
+            filters.append(CanIdFilter(f'Mask{i}', can_id, extended, rx_mask=mask))
+        else:
+            upper = can_id + int(rng.integers(0, 16))
+            filters.append(CanIdFilter(f'Range{i}', None, extended, lower_can_id=can_id, upper_can_id=upper))
+    return filters
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_index_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    filters = random_filters(rng, 24)
+    index = CanIdIndex(filters)
+    can_ids = np.arange(128)
+    for extended in (False, True):
+        expected = [reference_resolve(filters, can_id, extended) for can_id in can_ids.tolist()]
+        assert [index.resolve(can_id, extended) for can_id in can_ids.tolist()] == expected
+        assert index.lookup_array(can_ids, extended).tolist() == [-1 if e is None else e for e in expected]
+        for can_id in can_ids.tolist():
+            assert index.lookup(can_id, extended) == tuple(
+                i for i, f in enumerate(filters) if accepts(f, can_id, extended)
+            )
+
+
+def test_mixed_extended_flags_in_one_array():
+    index = CanIdIndex([CanIdFilter('Standard', 0x100), CanIdFilter('Extended', 0x100, extended=True)])
+    can_ids = np.array([0x100, 0x100, 0x101])
+    extended = np.array([False, True, True])
+    assert index.lookup_array(can_ids, extended).tolist() == [0, 1, -1]
+
+
+def test_exact_match_takes_precedence():
+    index = CanIdIndex([
+        CanIdFilter('Range', None, lower_can_id=0x100, upper_can_id=0x1ff),
+        CanIdFilter('Masked', 0x120, rx_mask=0x7f0),
+        CanIdFilter('Exact', 0x123),
+    ])
+    assert index.lookup(0x123) == (0, 1, 2)
+    assert index.resolve(0x123) == 2
+    assert index.resolve(0x124) == 0
+    assert index.resolve(0x200) is None
+    assert index.lookup_array(np.array([0x123, 0x124, 0x200])).tolist() == [2, 0, -1]
+
+
+def test_empty_index():
+    index = CanIdIndex([])
+    assert len(index) == 0
+    assert index.resolve(0x123) is None
+    assert index.lookup_array(np.array([1, 2, 3])).tolist() == [-1, -1, -1]
@@ -0,0 +1,137 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.can import CanLogDecoder, iter_asc, iter_can_log, iter_candump
+
+CANDUMP_LOG = """\
+(1436509052.249713) can0 123#DEADBEEF
+(1436509052.250000) can0 1ABCDEF0#0102
+(1436509052.250100) can1 456#R
+(1436509052.250200) can0 20000080#0000000000000000
+(1436509052.250300) can1 7FF##1000102030405060708090A0B
+(1436509052.250400) can0 001#
+"""
+
+CANDUMP_SCREEN = """\
+ (1436509052.249713)  can0  123   [4]  DE AD BE EF
+ (1436509052.250000)  can0  1ABCDEF0   [2]  01 02
+ (1436509052.250100)  can1  456   [0]  remote request
+"""
+
+ASC_HEX = """\
+date Wed Jul 10 10:00:00.000 am 2024
+base hex  timestamps absolute
+internal events logged
+Begin Triggerblock Wed Jul 10 10:00:00.000 am 2024
+   0.000000 Start of measurement
+   0.001000 1  123             Rx   d 4 DE AD BE EF  Length = 0 BitCount = 0
+   0.002000 2  1ABCDEF0x       Tx   d 2 01 02
+   0.003000 1  456             Rx   r
+   0.004000 CANFD   1 Rx        7FF  1 0 9 12 00 01 02 03 04 05 06 07 08 09 0a 0b
+   0.005000 CANFD   2 Rx        100x  Message 1 0 2 2 aa bb
+   0.006000 1  ErrorFrame
+End TriggerBlock
+"""
+
+ASC_DECIMAL = """\
+base dec  timestamps absolute
+   0.001000 1  291             Rx   d 4 222 173 190 239
+"""
+
+
+def frames(chunks) -> list[tuple]:
+    result = []
+    for chunk in chunks:
+        for i in range(len(chunk)):
+            result.append((
+                round(float(chunk.timestamp[i]), 6),
+                str(chunk.channel[i]),
+                int(chunk.can_id[i]),
+                bool(chunk.extended[i]),
+                bytes(chunk.data[i, :chunk.length[i]]),
+            ))
+    return result
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 100])
+def test_candump_log(tmp_path, chunk_size):
+    path = tmp_path / 'candump.log'
+    path.write_text(CANDUMP_LOG)
+    chunks = list(iter_candump(path, chunk_size))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert [chunk.first_frame for chunk in chunks] == list(range(0, 4, chunk_size))
+    assert frames(chunks) == [
+        (1436509052.249713, 'can0', 0x123, False, bytes.fromhex('deadbeef')),
+        (1436509052.25, 'can0', 0x1abcdef0, True, b'\x01\x02'),
+        (1436509052.2503, 'can1', 0x7ff, False, bytes(range(12))),
+        (1436509052.2504, 'can0', 0x001, False, b''),
+    ]
+
+
+def test_candump_screen(tmp_path):
+    path = tmp_path / 'candump.txt'
+    path.write_text(CANDUMP_SCREEN)
+    assert frames(iter_can_log(path)) == [
+        (1436509052.249713, 'can0', 0x123, False, bytes.fromhex('deadbeef')),
+        (1436509052.25, 'can0', 0x1abcdef0, True, b'\x01\x02'),
+    ]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+def test_asc(tmp_path, chunk_size):
+    path = tmp_path / 'log.asc'
+    path.write_text(ASC_HEX)
+    assert frames(iter_can_log(path, chunk_size)) == [
+        (0.001, '1', 0x123, False, bytes.fromhex('deadbeef')),
+        (0.002, '2', 0x1abcdef0, True, b'\x01\x02'),
+        (0.004, '1', 0x7ff, False, bytes(range(12))),
+        (0.005, '2', 0x100, True, b'\xaa\xbb'),
+    ]
+
+
+def test_asc_decimal(tmp_path):
+    path = tmp_path / 'log.asc'
+    path.write_text(ASC_DECIMAL)
+    assert frames(iter_asc(path)) == [(0.001, '1', 0x123, False, bytes.fromhex('deadbeef'))]
+
+
+def test_decode_physical_channel(ws, tmp_path):
+    channel = ws.find('/Clusters/CanCluster0/CanChannel')
+    decoder = CanLogDecoder.from_physical_channel(channel)
+    pdu1 = dict(decoder.frames[1].pdus)[0]
+    pdu2 = dict(decoder.frames[2].pdus)[0]
+    rng = np.random.default_rng(0)
+    rows1 = rng.integers(0, 256, size=(3, 8), dtype=np.uint8)
+    rows2 = rng.integers(0, 256, size=(1, 12), dtype=np.uint8)
+    lines = [
+        f'(0.1) can0 001#{rows1[0].tobytes().hex()}',
+        f'(0.2) can0 002#{rows2[0].tobytes().hex()}',
+        '(0.3) can0 099#0102',
+        f'(0.4) can0 001#{rows1[1].tobytes().hex()}',
+        # Too short for Pdu2
+        '(0.5) can0 002#0102',
+        f'(0.6) can1 001#{rows1[2].tobytes().hex()}',
+    ]
+    path = tmp_path / 'candump.log'
+    path.write_text('\n'.join(lines) + '\n')
+    first, second = decoder.iter_decode(path, chunk_size=4)
+    first = {item.pdu: item for item in first}
+    assert first.keys() == {pdu1.name, pdu2.name}
+    assert first[pdu2.name].index.tolist() == [1]
+    assert first[pdu2.name].timestamp.tolist() == [0.2]
+    expected = pdu2.decode(rows2)
+    for name, values in first[pdu2.name].signals.items():
+        np.testing.assert_array_equal(values, expected[name])
+    # The short frame is left out, the frame on can1 is decoded without a channel restriction
+    second = {item.pdu: item.index.tolist() for item in second}
+    assert second == {pdu1.name: [1], pdu2.name: []}
+
+    # Restricted to can0 the frame on can1 is left out
+    can0 = CanLogDecoder(decoder.frames, channel='can0')
+    chunk = next(iter_can_log(path, chunk_size=100))
+    result = {item.pdu: item for item in can0.decode(chunk)}
+    assert result[pdu1.name].index.tolist() == [0, 3]
+    expected = pdu1.decode(rows1[:2, :pdu1.required_length])
+    for name, values in result[pdu1.name].signals.items():
+        np.testing.assert_array_equal(values, expected[name])
@@ -0,0 +1,154 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.can import CanFrameChunk, CanIdFilter, _ChunkBuilder
+from autosar.decoder.can_tp import DEFAULT_MAX_TRANSFER_SIZE, CanTpLayout, CanTpReassembler
+
+DATA_ID = 0x7e0
+FLOW_CONTROL_ID = 0x7e8
+
+
+def segment(sdu: bytes) -> list[bytes]:
+    """
+    Splits sdu into the frames of a classic CAN ISO-TP transfer
+    """
+    if len(sdu) <= 7:
+        return [bytes([len(sdu)]) + sdu]
+    if len(sdu) <= 0xfff:
+        frames = [bytes([0x10 | len(sdu) >> 8, len(sdu) & 0xff]) + sdu[:6]]
+        position = 6
+    else:
+        frames = [b'\x10\x00' + len(sdu).to_bytes(4, 'big') + sdu[:2]]
+        position = 2
+    sequence = 1
+    while position < len(sdu):
+        frames.append(bytes([0x20 | sequence]) + sdu[position:position + 7])
+        position += 7
+        sequence = (sequence + 1) & 0xf
+    return frames
+
+
+def chunks(frames: list[bytes | tuple[int, bytes]], chunk_size: int, period: float = 0.001) -> list[CanFrameChunk]:
+    """
+    Logs frames on DATA_ID, or on the ID given with a frame, period seconds apart in chunks of chunk_size frames
+    """
+    builder = _ChunkBuilder(chunk_size)
+    result = []
+    for i, frame in enumerate(frames):
+        can_id, data = frame if isinstance(frame, tuple) else (DATA_ID, frame)
+        builder.append(i * period, 'can0', can_id, False, data)
+        if builder.full:
+            result.append(builder.build())
+    if (chunk := builder.build()) is not None:
+        result.append(chunk)
+    return result
+
+
+def reassembler(**kwargs) -> CanTpReassembler:
+    layout = CanTpLayout(
+        'Tp',
+        CanIdFilter('Data', DATA_ID),
+        CanIdFilter('FlowControl', FLOW_CONTROL_ID),
+        max_size=kwargs.pop('max_size', None),
+    )
+    return CanTpReassembler([layout], **kwargs)
+
+
+def feed(tp: CanTpReassembler, frames: list, chunk_size: int = 4, period: float = 0.001) -> list[bytes]:
+    return [bytes(message.data) for chunk in chunks(frames, chunk_size, period) for message in tp.feed(chunk)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 64])
+def test_reassembly_across_chunks(chunk_size):
+    sdus = [bytes(range(5)), bytes(range(100)), bytes(range(7)), bytes(i & 0xff for i in range(300))]
+    frames = [frame for sdu in sdus for frame in segment(sdu)]
+    tp = reassembler()
+    assert feed(tp, frames, chunk_size) == sdus
+    assert tp.dropped == 0
+    assert len(tp.sessions) == 0
+
+
+def test_message_index_and_timestamp():
+    tp = reassembler()
+    frames = segment(bytes(range(20)))
+    messages = [message for chunk in chunks(frames, 2) for message in tp.feed(chunk)]
+    assert len(messages) == 1
+    # The third frame completes the message, it is the first frame of the second chunk
+    assert messages[0].index == 0
+    assert messages[0].timestamp == pytest.approx(0.002)
+
+
+def test_dropped_consecutive_frame():
+    tp = reassembler()
+    first, second = bytes(range(30)), bytes(range(40))
+    frames = segment(first)
+    del frames[2]
+    assert feed(tp, frames + segment(second)) == [second]
+    assert tp.dropped == 1
+
+
+def test_out_of_order_consecutive_frames():
+    tp = reassembler()
+    frames = segment(bytes(range(30)))
+    frames[2], frames[3] = frames[3], frames[2]
+    assert feed(tp, frames) == []
+    assert tp.dropped == 1
+    assert len(tp.sessions) == 0
+
+
+def test_new_first_frame_aborts_transfer():
+    tp = reassembler()
+    first, second = bytes(range(30)), bytes(range(10))
+    assert feed(tp, segment(first)[:2] + segment(second)) == [second]
+    assert tp.dropped == 1
+
+
+def test_timeout_between_consecutive_frames():
+    tp = reassembler()
+    assert feed(tp, segment(bytes(range(30))), period=2.0) == []
+    assert tp.dropped == 1
+
+
+def test_flow_control_overflow_aborts_transfer():
+    tp = reassembler()
+    frames = segment(bytes(range(30)))
+    frames.insert(1, (FLOW_CONTROL_ID, b'\x32\x00\x00'))
+    assert feed(tp, frames) == []
+    assert tp.dropped == 1
+
+
+def test_corrupt_first_frame_length_is_dropped():
+    tp = reassembler()
+    assert tp.max_transfer_size == DEFAULT_MAX_TRANSFER_SIZE
+    # Escape sequence announcing 4 GiB
+    corrupt = b'\x10\x00\xff\xff\xff\xff\x00\x00'
+    sdu = bytes(range(10))
+    assert feed(tp, [corrupt, b'\x21' + bytes(7)] + segment(sdu)) == [sdu]
+    assert tp.dropped == 1
+    assert len(tp.sessions) == 0
+
+
+def test_max_sizes():
+    sdu = bytes(i & 0xff for i in range(5000))
+    tp = reassembler(max_transfer_size=4096)
+    assert feed(tp, segment(sdu)) == []
+    assert tp.dropped == 1
+    tp = reassembler(max_transfer_size=8192)
+    assert feed(tp, segment(sdu)) == [sdu]
+    # The SDU length of the connection takes precedence over a larger limit
+    tp = reassembler(max_transfer_size=8192, max_size=100)
+    assert feed(tp, segment(bytes(120)) + segment(bytes(100))) == [bytes(100)]
+    assert tp.dropped == 1
+
+
+def test_extended_addressing():
+    layout = CanTpLayout('Tp', CanIdFilter('Data', DATA_ID), address=0x55)
+    tp = CanTpReassembler([layout])
+    sdu = bytes(range(20))
+    # With extended addressing every frame starts with the target address, leaving one byte less for data
+    frames = [b'\x55\x10\x14' + sdu[:5]]
+    for sequence, position in enumerate(range(5, 20, 6), 1):
+        frames.append(bytes([0x55, 0x20 | sequence]) + sdu[position:position + 6])
+    other = [b'\x66\x03\x01\x02\x03']
+    assert feed(tp, other + frames) == [sdu]
@@ -0,0 +1,212 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.capture import (
+    LINKTYPE_ETHERNET,
+    LINKTYPE_IPV4,
+    PCAP_MAGIC,
+    PCAP_NANOSECOND_MAGIC,
+    CaptureFile,
+    CapturePipeline,
+    split_some_ip,
+    transport_payloads,
+)
+from autosar.extractor.common import Array, DataType
+
+KEY = (0x1234, 0x8001, 1)
+ELEMENTS = {
+    'Counter': DataType('Counter', '>u2'),
+    'Values': Array('Values', DataType('Value', '>u1'), (1, 8)),
+}
+SOURCE = ('10.0.0.1', 30490)
+OTHER_SOURCE = ('10.0.0.2', 30490)
+
+
+def some_ip(counter: int, values: bytes = b'', key: tuple[int, int, int] = KEY) -> bytes:
+    service_id, method_id, interface_version = key
+    body = struct.pack('>HI', counter, len(values)) + values
+    return struct.pack('>HHIHHBBBB', service_id, method_id, len(body) + 8, 0, 1, 1, interface_version, 2, 0) + body
+
+
+def ipv4_udp(payload: bytes, source: tuple[str, int] = SOURCE, destination_port: int = 30490) -> bytes:
+    address = bytes(int(part) for part in source[0].split('.'))
+    udp = struct.pack('>HHHH', source[1], destination_port, 8 + len(payload), 0) + payload
+    return struct.pack('>BBHHHBBH4s4s', 0x45, 0, 20 + len(udp), 0, 0, 64, 17, 0, address, bytes([10, 0, 0, 9])) + udp
+
+
+def ipv6_udp(payload: bytes, source_port: int = 30490) -> bytes:
+    udp = struct.pack('>HHHH', source_port, 30490, 8 + len(payload), 0) + payload
+    source = bytes(15) + b'\x01'
+    return struct.pack('>IHBB16s16s', 0x60000000, len(udp), 17, 64, source, bytes(15) + b'\x02') + udp
+
+
+def ethernet(ip_packet: bytes, vlan: int | None = None) -> bytes:
+    ethertype = 0x86dd if ip_packet[0] >> 4 == 6 else 0x0800
+    header = bytes(6) + bytes(6)
+    if vlan is not None:
+        header += struct.pack('>HH', 0x8100, vlan)
+    return header + struct.pack('>H', ethertype) + ip_packet
+
+
+def write_pcap(path, packets: list[tuple[int, int, bytes]], endian: str = '<', nanoseconds: bool = False,
+               link_type: int = LINKTYPE_ETHERNET):
+    magic = PCAP_NANOSECOND_MAGIC if nanoseconds else PCAP_MAGIC
+    with open(path, 'wb') as file:
+        file.write(struct.pack(f'{endian}IHHiIII', magic, 2, 4, 0, 0, 65535, link_type))
+        for seconds, fraction, data in packets:
+            file.write(struct.pack(f'{endian}IIII', seconds, fraction, len(data), len(data)) + data)
+
+
+def pad(data: bytes) -> bytes:
+    return data + bytes(-len(data) % 4)
+
+
+def block(block_type: int, body: bytes) -> bytes:
+    length = 12 + len(pad(body))
+    return struct.pack('<II', block_type, length) + pad(body) + struct.pack('<I', length)
+
+
+def interface(link_type: int, resolution: int | None = None) -> bytes:
+    options = b''
+    if resolution is not None:
+        options = struct.pack('<HH', 9, 1) + pad(bytes([resolution])) + struct.pack('<HH', 0, 0)
+    return block(1, struct.pack('<HHI', link_type, 0, 65535) + options)
+
+
+def enhanced_packet(interface_id: int, ticks: int, data: bytes) -> bytes:
+    return block(6, struct.pack('<IIIII', interface_id, ticks >> 32, ticks & 0xffffffff, len(data), len(data)) + data)
+
+
+def simple_packet(data: bytes) -> bytes:
+    return block(3, struct.pack('<I', len(data)) + data)
+
+
+def section_header() -> bytes:
+    return block(0x0a0d0d0a, struct.pack('<IHHq', 0x1a2b3c4d, 1, 0, -1))
+
+
+def read_chunks(path, chunk_size: int):
+    chunks = list(CaptureFile(path, chunk_size).iter_chunks())
+    offsets = np.concatenate([chunk.offset for chunk in chunks])
+    lengths = np.concatenate([chunk.length for chunk in chunks])
+    timestamps = np.concatenate([chunk.timestamp for chunk in chunks])
+    link_types = np.concatenate([chunk.link_type for chunk in chunks])
+    assert [chunk.first_packet for chunk in chunks] == list(range(0, len(offsets), chunk_size))
+    data = [bytes(chunks[0].buffer[o:o + n]) for o, n in zip(offsets.tolist(), lengths.tolist())]
+    return data, timestamps, link_types
+
+
+@pytest.mark.parametrize('endian', ['<', '>'])
+@pytest.mark.parametrize('nanoseconds', [False, True])
+@pytest.mark.parametrize('chunk_size', [1, 2, 16])
+def test_pcap(tmp_path, endian, nanoseconds, chunk_size):
+    path = tmp_path / 'capture.pcap'
+    packets = [(1700000000 + i, 1000 * i + 7, ethernet(ipv4_udp(some_ip(i)))) for i in range(5)]
+    write_pcap(path, packets, endian, nanoseconds)
+    data, timestamps, link_types = read_chunks(path, chunk_size)
+    assert data == [packet for _, _, packet in packets]
+    scale = 1 if nanoseconds else 1000
+    expected = [np.datetime64(s * 1000000000 + f * scale, 'ns') for s, f, _ in packets]
+    assert timestamps.tolist() == [t.item() for t in expected]
+    assert link_types.tolist() == [LINKTYPE_ETHERNET] * 5
+
+
+def test_pcap_truncated_last_packet(tmp_path):
+    path = tmp_path / 'capture.pcap'
+    packets = [(0, 0, ethernet(ipv4_udp(some_ip(i)))) for i in range(3)]
+    write_pcap(path, packets)
+    with open(path, 'r+b') as file:
+        file.truncate(path.stat().st_size - 5)
+    data, _, _ = read_chunks(path, 16)
+    assert data == [packet for _, _, packet in packets[:2]]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 16])
+def test_pcapng(tmp_path, chunk_size):
+    path = tmp_path / 'capture.pcapng'
+    first = ethernet(ipv4_udp(some_ip(1)))
+    second = ipv4_udp(some_ip(2))
+    third = ethernet(ipv6_udp(some_ip(3)), vlan=5)
+    fourth = ethernet(ipv4_udp(some_ip(4)))
+    path.write_bytes(
+        section_header()
+        + interface(LINKTYPE_ETHERNET)
+        + interface(LINKTYPE_IPV4, resolution=9)
+        + enhanced_packet(0, 1700000000123456, first)
+        + enhanced_packet(1, 1700000000123456789, second)
+        + enhanced_packet(0, 1700000001000000, third)
+        + simple_packet(fourth)
+    )
+    data, timestamps, link_types = read_chunks(path, chunk_size)
+    assert data == [first, second, third, fourth]
+    assert link_types.tolist() == [LINKTYPE_ETHERNET, LINKTYPE_IPV4, LINKTYPE_ETHERNET, LINKTYPE_ETHERNET]
+    assert timestamps[:3].astype(np.int64).tolist() == [1700000000123456000, 1700000000123456789, 1700000001000000000]
+    assert np.isnat(timestamps[3])
+
+
+def test_not_a_capture_file(tmp_path):
+    path = tmp_path / 'capture.pcap'
+    path.write_bytes(bytes(32))
+    with pytest.raises(ValueError):
+        list(CaptureFile(path).iter_chunks())
+
+
+def test_transport_payloads_and_split(tmp_path):
+    path = tmp_path / 'capture.pcap'
+    messages = [some_ip(1, b'\x01'), some_ip(2), some_ip(3, b'\x02\x03')]
+    # Two messages in one datagram, a truncated message and a datagram without SOME/IP
+    packets = [
+        ethernet(ipv4_udp(messages[0] + messages[1])),
+        ethernet(ipv6_udp(messages[2]), vlan=7),
+        ethernet(ipv4_udp(messages[0][:-1])),
+        ethernet(ipv4_udp(b'\x00\x01')),
+    ]
+    write_pcap(path, [(0, 0, packet) for packet in packets])
+    chunk, = CaptureFile(path).iter_chunks()
+    payloads = transport_payloads(chunk)
+    assert payloads.packet.tolist() == [0, 1, 2, 3]
+    assert payloads.protocol.tolist() == [17] * 4
+    assert payloads.source['port'].tolist() == [30490] * 4
+    assert bytes(payloads.source['address'][0]) == bytes(10) + b'\xff\xff' + bytes([10, 0, 0, 1])
+    assert bytes(payloads.source['address'][1]) == bytes(15) + b'\x01'
+    starts, ends, payload = split_some_ip(chunk.buffer, payloads.start, payloads.end)
+    assert payload.tolist() == [0, 0, 1]
+    assert [bytes(chunk.buffer[s:e]) for s, e in zip(starts.tolist(), ends.tolist())] == messages
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 64])
+def test_pipeline(tmp_path, chunk_size):
+    path = tmp_path / 'capture.pcap'
+    unknown_key = (0x1234, 0x8002, 1)
+    packets = [
+        ethernet(ipv4_udp(some_ip(1, b'\x0a\x0b') + some_ip(2))),
+        ethernet(ipv4_udp(some_ip(3, b'\x0c'), OTHER_SOURCE)),
+        ethernet(ipv4_udp(some_ip(4, key=unknown_key))),
+        ethernet(ipv4_udp(some_ip(5, b'\x0d'))),
+    ]
+    write_pcap(path, [(100 + i, 0, packet) for i, packet in enumerate(packets)])
+    ecu = SimpleNamespace(name='Ecu0')
+    pipeline = CapturePipeline(
+        {KEY: ('Service::Event', SimpleNamespace(elements=ELEMENTS, array_length_size=None))},
+        {f'{SOURCE[0]}:{SOURCE[1]}': ecu},
+        chunk_size,
+    )
+    counters, values, packet_numbers, senders, seconds = [], [], [], [], []
+    for decoded in pipeline.iter_chunks(path):
+        if KEY not in decoded.messages:
+            continue
+        messages = decoded.messages[KEY]
+        counters += messages.columns['Counter'].tolist()
+        values += [messages.columns['Values'][i].tolist() for i in range(len(messages.index))]
+        packet_numbers += decoded.packet[messages.index].tolist()
+        senders += decoded.sender[messages.index].tolist()
+        seconds += (decoded.timestamp[messages.index].astype(np.int64) // 1000000000).tolist()
+    assert counters == [1, 2, 3, 5]
+    assert values == [[10, 11], [], [12], [13]]
+    assert packet_numbers == [0, 0, 1, 3]
+    assert senders == [ecu, ecu, None, ecu]
+    assert seconds == [100, 100, 101, 103]
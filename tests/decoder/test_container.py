@@ -0,0 +1,135 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.container import (
+    LONG_HEADER,
+    NO_HEADER,
+    SHORT_HEADER,
+    ContainedPduLayout,
+    ContainerDemultiplexer,
+)
+from autosar.decoder.pdu import PduDecoder, SignalLayout
+
+UNKNOWN_ID = 0x99
+
+
+def header(header_type: str, header_id: int, length: int) -> bytes:
+    if header_type == SHORT_HEADER:
+        return header_id.to_bytes(3, 'big') + bytes([length])
+    return header_id.to_bytes(4, 'big') + length.to_bytes(4, 'big')
+
+
+def layouts() -> list[ContainedPduLayout]:
+    decoder = PduDecoder('Pdu1', 4, [SignalLayout('Value', 0, 16), SignalLayout('Flag', 16, 1, encoding='BOOLEAN')])
+    return [
+        ContainedPduLayout('Pdu0', header_id=0x10, length=3),
+        ContainedPduLayout('Pdu1', header_id=0x20, length=4, decoder=decoder),
+        ContainedPduLayout('Pdu2', header_id=0x30),
+    ]
+
+
+def pack(rng, header_type: str, contained: list[ContainedPduLayout], count: int):
+    """
+    Packs random instances of the contained PDUs and of an unknown ID into count containers. Returns the containers
+    and the expected (container, bytes) of every contained PDU.
+    """
+    containers = []
+    expected = {layout.name: [] for layout in contained}
+    for i in range(count):
+        container = b''
+        for _ in range(int(rng.integers(0, 5))):
+            k = int(rng.integers(0, len(contained) + 1))
+            length = int(rng.integers(0, 9))
+            data = rng.integers(0, 256, size=length, dtype=np.uint8).tobytes()
+            if k == len(contained):
+                container += header(header_type, UNKNOWN_ID, length) + data
+                continue
+            container += header(header_type, contained[k].header_id, length) + data
+            expected[contained[k].name].append((i, data))
+        containers.append(container)
+    return containers, expected
+
+
+def split(demultiplexer: ContainerDemultiplexer, containers: list[bytes]):
+    lengths = np.array([len(c) for c in containers], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    buffer = np.frombuffer(b''.join(containers), dtype=np.uint8)
+    result = {}
+    for instances in demultiplexer.split(buffer, ends - lengths, ends):
+        result[instances.layout.name] = list(zip(
+            instances.container.tolist(), [view.tobytes() for view in instances.views(buffer)],
+        ))
+    return result
+
+
+@pytest.mark.parametrize('header_type', [SHORT_HEADER, LONG_HEADER])
+@pytest.mark.parametrize('seed', range(4))
+def test_round_trip(header_type, seed):
+    rng = np.random.default_rng(seed)
+    contained = layouts()
+    containers, expected = pack(rng, header_type, contained, 50)
+    demultiplexer = ContainerDemultiplexer('Container', header_type, contained)
+    assert split(demultiplexer, containers) == {name: items for name, items in expected.items() if items}
+
+
+@pytest.mark.parametrize('header_type', [SHORT_HEADER, LONG_HEADER])
+def test_container_end(header_type):
+    demultiplexer = ContainerDemultiplexer('Container', header_type, layouts())
+    padding = header(header_type, 0, 0) + header(header_type, 0x10, 1) + b'\x01'
+    truncated = header(header_type, 0x10, 5) + b'\x01\x02'
+    short_header = header(header_type, 0x10, 1) + b'\x01' + header(header_type, 0x20, 1)[:-1]
+    containers = [
+        header(header_type, 0x10, 1) + b'\xaa' + padding,
+        truncated,
+        short_header,
+    ]
+    assert split(demultiplexer, containers) == {'Pdu0': [(0, b'\xaa'), (2, b'\x01')]}
+
+
+def test_decode():
+    demultiplexer = ContainerDemultiplexer('Container', SHORT_HEADER, layouts())
+    containers = [
+        header(SHORT_HEADER, 0x20, 4) + b'\x34\x12\x01\x00',
+        header(SHORT_HEADER, 0x10, 1) + b'\x00' + header(SHORT_HEADER, 0x20, 3) + b'\x78\x56\x01',
+        header(SHORT_HEADER, 0x20, 2) + b'\x01\x00',
+    ]
+    lengths = np.array([len(c) for c in containers], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    buffer = np.frombuffer(b''.join(containers), dtype=np.uint8)
+    decoded, = demultiplexer.decode(buffer, ends - lengths, ends)
+    assert decoded.pdu == 'Pdu1'
+    # The last instance is too short for the flag
+    assert decoded.container.tolist() == [0, 1]
+    assert decoded.signals['Value'].tolist() == [0x1234, 0x5678]
+    assert decoded.signals['Flag'].tolist() == [True, True]
+
+
+def test_static_layout():
+    contained = [
+        ContainedPduLayout('Pdu0', offset=1, length=2),
+        ContainedPduLayout('Pdu1', offset=3, length=3, update_indication_bit_position=2),
+        ContainedPduLayout('Pdu2', offset=0),
+    ]
+    demultiplexer = ContainerDemultiplexer('Container', NO_HEADER, contained)
+    payloads = np.array([
+        [0x04, 1, 2, 3, 4, 5],
+        [0x00, 6, 7, 8, 9, 10],
+        [0x04, 11, 12, 13, 14, 15],
+    ], dtype=np.uint8)
+    result = {
+        instances.layout.name: (instances.container.tolist(), instances.start.tolist())
+        for instances in demultiplexer.split_rows(payloads, lengths=[6, 6, 4])
+    }
+    assert result == {'Pdu0': ([0, 1, 2], [1, 7, 13]), 'Pdu1': ([0], [3])}
+    views = demultiplexer.static_views(payloads)
+    assert views.keys() == {'Pdu0', 'Pdu1'}
+    assert views['Pdu1'].tolist() == payloads[:, 3:6].tolist()
+    assert np.shares_memory(views['Pdu1'], payloads)
+
+
+def test_unsupported_header_type():
+    with pytest.raises(ValueError):
+        ContainerDemultiplexer('Container', 'MEDIUM-HEADER', [])
+    with pytest.raises(ValueError):
+        ContainerDemultiplexer('Container', SHORT_HEADER, layouts()).static_views(np.zeros((1, 8), dtype=np.uint8))
@@ -0,0 +1,170 @@
+import logging
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.e2e import (
+    CRC16,
+    CRC32P4,
+    CRC64,
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_OK_SOME_LOST,
+    STATUS_REPEATED,
+    STATUS_WRONG_SEQUENCE,
+    Crc,
+    E2EChecker,
+    profile_layouts,
+)
+from autosar.extractor.e2e import e2e_profiles
+from autosar.model.signal import EndToEndTransformationISignalProps
+from autosar.model.transformation import EndToEndTransformationDescription
+
+DATA_ID = 0x12345678
+# Width, polynomial, initial value, final XOR and reflection of every CRC, the polynomial in normal form
+CRC_PARAMETERS = {
+    'PROFILE_05': (16, 0x1021, 0xffff, 0x0000, False),
+    'PROFILE_04': (32, 0xf4acfb13, 0xffffffff, 0xffffffff, True),
+    'PROFILE_07': (64, 0x42f0e1eba9ea3693, 0xffffffffffffffff, 0xffffffffffffffff, True),
+}
+
+
+def reflect(value: int, width: int) -> int:
+    return int(f'{value:0{width}b}'[::-1], 2)
+
+
+def reference_crc(data: bytes, width: int, polynomial: int, initial: int, final_xor: int, reflected: bool) -> int:
+    """
+    Computes a CRC one bit at a time
+    """
+    crc = initial
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    for byte in data:
+        if reflected:
+            byte = reflect(byte, 8)
+        crc ^= byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial if crc & top else crc << 1) & mask
+    if reflected:
+        crc = reflect(crc, width)
+    return crc ^ final_xor
+
+
+def compute(crc: Crc, data: bytes) -> int:
+    value = crc.start(1)
+    for byte in data:
+        value = crc.update(value, byte)
+    return int(crc.finish(value)[0])
+
+
+@pytest.mark.parametrize('crc, check', [
+    (CRC16, 0x29b1),
+    (CRC32P4, 0x1697d06a),
+    (CRC64, 0x995dc9bbdf1939fa),
+])
+def test_crc_check_values(crc, check):
+    assert compute(crc, b'123456789') == check
+
+
+@pytest.mark.parametrize('profile', sorted(CRC_PARAMETERS))
+def test_crc_tables_match_bitwise_reference(profile):
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 256, size=64, dtype=np.uint8).tobytes()
+    assert compute(profile_layouts[profile].crc, data) == reference_crc(data, *CRC_PARAMETERS[profile])
+
+
+def test_layouts_follow_extracted_header_fields():
+    assert set(profile_layouts) == set(e2e_profiles)
+    for name, fields in e2e_profiles.items():
+        layout = profile_layouts[name]
+        assert layout.header_size == sum(np.dtype(data_type.dtype).itemsize for data_type in fields.values())
+        assert layout.crc_dtype == fields['E2E_crc'].dtype
+    assert profile_layouts['PROFILE_05'].crc_dtype == '<u2'
+
+
+def protect(profile: str, counter: int, data: bytes, offset: int = 0) -> bytes:
+    """
+    Builds a message with the E2E header of profile at offset, followed by data
+    """
+    layout = profile_layouts[profile]
+    message = bytearray(offset + layout.header_size) + data
+
+    def write(position: int, dtype: str, value: int):
+        value_bytes = np.array(value, dtype=dtype).tobytes()
+        message[offset + position:offset + position + len(value_bytes)] = value_bytes
+
+    write(layout.counter_position, layout.counter_dtype, counter)
+    if layout.length_position is not None:
+        write(layout.length_position, layout.length_dtype, len(message))
+    if layout.data_id_position is not None:
+        write(layout.data_id_position, layout.data_id_dtype, DATA_ID)
+    crc_start = offset + layout.crc_position
+    protected = bytes(message[:crc_start] + message[crc_start + layout.crc.width // 8:])
+    if layout.data_id_position is None:
+        protected += bytes([DATA_ID & 0xff, DATA_ID >> 8 & 0xff])
+    write(layout.crc_position, layout.crc_dtype, reference_crc(protected, *CRC_PARAMETERS[profile]))
+    return bytes(message)
+
+
+def check(checker: E2EChecker, messages: list[bytes]) -> list[int]:
+    lengths = np.array([len(m) for m in messages], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    buffer = np.frombuffer(b''.join(messages), dtype=np.uint8)
+    return checker.check(buffer, ends - lengths, ends).tolist()
+
+
+@pytest.mark.parametrize('profile', sorted(profile_layouts))
+def test_counter_sequence(profile):
+    data_id = DATA_ID & 0xffff if profile == 'PROFILE_05' else DATA_ID
+    checker = E2EChecker(profile, data_id, offset=2, max_delta_counter=2)
+    counters = [0, 1, 1, 3, 6, 7]
+    messages = [protect(profile, counter, bytes(range(10)), offset=2) for counter in counters]
+    assert check(checker, messages) == [
+        STATUS_OK, STATUS_OK, STATUS_REPEATED, STATUS_OK_SOME_LOST, STATUS_WRONG_SEQUENCE, STATUS_OK,
+    ]
+    # The counter continues across batches
+    assert check(checker, [protect(profile, 8, b'', offset=2)]) == [STATUS_OK]
+
+
+@pytest.mark.parametrize('profile', sorted(profile_layouts))
+def test_errors(profile):
+    data_id = DATA_ID & 0xffff if profile == 'PROFILE_05' else DATA_ID
+    checker = E2EChecker(profile, data_id)
+    corrupted = bytearray(protect(profile, 1, bytes(range(10))))
+    corrupted[-1] ^= 0x01
+    wrong_id = E2EChecker(profile, data_id ^ 0x0101)
+    messages = [protect(profile, 0, bytes(range(10))), bytes(corrupted), protect(profile, 1, bytes(range(10)))]
+    assert check(checker, messages) == [STATUS_OK, STATUS_ERROR, STATUS_OK]
+    assert check(wrong_id, messages[:1]) == [STATUS_ERROR]
+    # Too short for the header
+    assert check(E2EChecker(profile, data_id), [b'\x00']) == [STATUS_ERROR]
+
+
+def test_length_limits():
+    checker = E2EChecker('PROFILE_05', DATA_ID & 0xffff, min_length=8, max_length=8)
+    messages = [protect('PROFILE_05', 0, bytes(5)), protect('PROFILE_05', 1, bytes(6)), protect('PROFILE_05', 1, bytes(4))]
+    assert check(checker, messages) == [STATUS_OK, STATUS_ERROR, STATUS_ERROR]
+
+
+def test_check_rows():
+    checker = E2EChecker('PROFILE_07', DATA_ID)
+    rows = np.frombuffer(b''.join(protect('PROFILE_07', i, bytes([i] * 4)) for i in range(4)), dtype=np.uint8)
+    assert checker.check_rows(rows.reshape(4, -1)).tolist() == [STATUS_OK] * 4
+
+
+def test_from_description_warns_about_ignored_settings(caplog):
+    props = EndToEndTransformationISignalProps(transformer_ref='/Transformers/E2E', data_ids=[DATA_ID])
+    description = EndToEndTransformationDescription(profile_name='PROFILE_04', offset=64, crc_offset=128, counter_offset=80)
+    with caplog.at_level(logging.WARNING):
+        checker = E2EChecker.from_description(description, props)
+    assert checker.offset == 8
+    assert caplog.messages == []
+    description.crc_offset = 0
+    description.window_size_valid = 4
+    with caplog.at_level(logging.WARNING):
+        E2EChecker.from_description(description, props)
+    assert any('crc_offset' in message for message in caplog.messages)
+    assert any('window sizes' in message for message in caplog.messages)
+    assert not any('counter_offset' in message for message in caplog.messages)
@@ -0,0 +1,161 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.pdu import BIG_ENDIAN, LITTLE_ENDIAN, OPAQUE, PduDecoder, SignalLayout
+
+
+def bit(payload: bytes, position: int) -> int:
+    return payload[position // 8] >> (position % 8) & 1
+
+
+def reference_raw(payload: bytes, signal: SignalLayout) -> int:
+    """
+    Reads the raw value of signal one bit at a time
+    """
+    value = 0
+    if signal.byte_order == LITTLE_ENDIAN:
+        for i in range(signal.length):
+            value |= bit(payload, signal.start_position + i) << i
+        return value
+    position = signal.start_position
+    for _ in range(signal.length):
+        value = value << 1 | bit(payload, position)
+        # Motorola layouts continue with the most significant bit of the next byte
+        position = position + 15 if position % 8 == 0 else position - 1
+    return value
+
+
+def reference_value(raw: int, signal: SignalLayout):
+    length = signal.length
+    sign = 1 << (length - 1)
+    if signal.encoding == '2C':
+        return raw - (1 << length) if raw & sign else raw
+    if signal.encoding == 'SM':
+        return -(raw & (sign - 1)) if raw & sign else raw
+    if signal.encoding == '1C':
+        return -(~raw & ((1 << length) - 1)) if raw & sign else raw
+    if signal.encoding == 'BOOLEAN':
+        return raw != 0
+    return raw
+
+
+def random_layout(rng, index: int, pdu_length: int) -> SignalLayout:
+    byte_order = LITTLE_ENDIAN if rng.random() < 0.5 else BIG_ENDIAN
+    length = int(rng.integers(1, 65))
+    encoding = str(rng.choice(['NONE', '2C', 'SM', '1C', 'BOOLEAN'])) if length > 1 else 'NONE'
+    if byte_order == LITTLE_ENDIAN:
+        start = int(rng.integers(0, pdu_length * 8 - length + 1))
+    else:
+        # The most significant bit, chosen so that the signal ends within the PDU
+        first_bit = int(rng.integers(0, pdu_length * 8 - length + 1))
+        start = first_bit // 8 * 8 + 7 - first_bit % 8
+    return SignalLayout(f'Signal{index}', start, length, byte_order, encoding)
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_layouts_match_bitwise_reference(seed):
+    rng = np.random.default_rng(seed)
+    pdu_length = 16
+    signals = [random_layout(rng, i, pdu_length) for i in range(40)]
+    decoder = PduDecoder('Pdu', pdu_length, signals)
+    payloads = rng.integers(0, 256, size=(25, pdu_length), dtype=np.uint8)
+    decoded = decoder.decode(payloads)
+    for signal in signals:
+        expected = [reference_value(reference_raw(bytes(row), signal), signal) for row in payloads]
+        assert decoded[signal.name].tolist() == expected, signal
+
+
+@pytest.mark.parametrize('byte_order', [LITTLE_ENDIAN, BIG_ENDIAN])
+def test_nine_byte_span(byte_order):
+    # 64 bit signals starting in the middle of a byte occupy 9 bytes
+    start = 3 if byte_order == LITTLE_ENDIAN else 4
+    signal = SignalLayout('Wide', start, 64, byte_order)
+    assert signal.end_byte == 9
+    payloads = np.random.default_rng(1).integers(0, 256, size=(10, 9), dtype=np.uint8)
+    decoded = PduDecoder('Pdu', 9, [signal]).decode(payloads)['Wide']
+    assert decoded.dtype == np.uint64
+    assert decoded.tolist() == [reference_raw(bytes(row), signal) for row in payloads]
+
+
+def test_result_types():
+    signals = [
+        SignalLayout('U8', 0, 8),
+        SignalLayout('U12', 8, 12),
+        SignalLayout('S16', 24, 16, encoding='2C'),
+        SignalLayout('Flag', 40, 1, encoding='BOOLEAN'),
+        SignalLayout('U33', 0, 33, BIG_ENDIAN),
+    ]
+    decoded = PduDecoder('Pdu', 8, signals).decode(np.zeros((3, 8), dtype=np.uint8))
+    assert [decoded[name].dtype for name in ('U8', 'U12', 'S16', 'Flag', 'U33')] == [
+        np.uint8, np.uint16, np.int16, np.bool_, np.uint64,
+    ]
+
+
+def test_float_and_opaque():
+    signals = [
+        SignalLayout('F32', 0, 32, LITTLE_ENDIAN, 'IEEE754'),
+        SignalLayout('F64', 39, 64, BIG_ENDIAN, 'IEEE754'),
+        SignalLayout('Bytes', 96, 32, OPAQUE),
+    ]
+    payload = struct.pack('<f', 1.5) + struct.pack('>d', -2.25) + b'\x01\x02\x03\x04'
+    payloads = np.frombuffer(payload, dtype=np.uint8).reshape(1, -1)
+    decoded = PduDecoder('Pdu', len(payload), signals).decode(payloads)
+    assert decoded['F32'].tolist() == [1.5]
+    assert decoded['F64'].tolist() == [-2.25]
+    assert decoded['Bytes'].tolist() == [[1, 2, 3, 4]]
+
+
+def test_update_flags():
+    signals = [SignalLayout('A', 0, 8, update_indication_bit_position=15), SignalLayout('B', 16, 8)]
+    decoder = PduDecoder('Pdu', 3, signals)
+    payloads = np.array([[0, 0x80, 0], [0, 0x7f, 0]], dtype=np.uint8)
+    assert decoder.update_flags(payloads)['A'].tolist() == [True, False]
+    assert list(decoder.update_flags(payloads)) == ['A']
+
+
+@pytest.mark.parametrize('signal', [
+    SignalLayout('Empty', 0, 0),
+    SignalLayout('Unaligned', 3, 80, OPAQUE),
+    SignalLayout('Half', 0, 16, encoding='IEEE754'),
+    SignalLayout('Unknown', 0, 8, encoding='BCD-PACKED'),
+    SignalLayout('Order', 0, 8, byte_order='MIDDLE'),
+])
+def test_unsupported_layouts(signal):
+    with pytest.raises(ValueError):
+        PduDecoder('Pdu', 16, [signal])
+
+
+def test_payload_checks():
+    decoder = PduDecoder('Pdu', 4, [SignalLayout('A', 16, 16)])
+    with pytest.raises(ValueError):
+        decoder.decode(np.zeros((2, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        decoder.decode(np.zeros(4, dtype=np.uint8))
+    # Wider payloads are accepted
+    assert decoder.decode(np.zeros((2, 6), dtype=np.uint8))['A'].tolist() == [0, 0]
+
+
+def test_from_i_signal_i_pdu(ws):
+    pdu = ws.find('/Pdus/Pdu0')
+    decoder = PduDecoder.from_i_signal_i_pdu(pdu)
+    assert decoder.length == pdu.length
+    assert [signal.name for signal in decoder.signals] == [
+        ws.find(mapping.i_signal_ref).name for mapping in pdu.i_signal_to_pdu_mappings
+    ]
+    for signal, mapping in zip(decoder.signals, pdu.i_signal_to_pdu_mappings):
+        assert signal.start_position == mapping.start_position
+        assert signal.byte_order == mapping.packing_byte_order
+
+
+def test_from_i_signal_i_pdu_skips_bad_mappings(ws, caplog):
+    pdu = ws.find('/Pdus/Pdu0')
+    mappings = pdu.i_signal_to_pdu_mappings
+    mappings[0].start_position = None
+    mappings[1].i_signal_ref = '/Signals/Missing'
+    mappings[2].start_position = pdu.length * 8
+    decoder = PduDecoder.from_i_signal_i_pdu(pdu)
+    assert len(decoder.signals) == len(mappings) - 3
+    assert 'no start position' in caplog.text
@@ -0,0 +1,121 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.someip import TP_FLAG, SomeIpDecoder, SomeIpPayloadLayout
+from autosar.extractor.common import Array, DataType
+from autosar.extractor.system_extractor import SystemExtractor
+from autosar.model.signal import ISignal, SomeIpTransformationISignalProps, SomeIpTransformationISignalPropsVariants
+
+KEY = (0x1234, 0x8001, 1)
+LENGTH_FORMATS = {1: '>B', 2: '>H', 4: '>I'}
+
+ELEMENTS = {
+    'Counter': DataType('Counter', '>u2'),
+    'Values': Array('Values', DataType('Value', '>i2'), (1, 4)),
+    'Status': DataType('Status', '>u1'),
+}
+
+
+def payload(counter: int, values: list[int], status: int, length_size: int = 4) -> bytes:
+    array = struct.pack(f'>{len(values)}h', *values)
+    return (
+        struct.pack('>H', counter)
+        + struct.pack(LENGTH_FORMATS[length_size], len(array))
+        + array
+        + struct.pack('>B', status)
+    )
+
+
+def message(key: tuple[int, int, int], body: bytes, message_type: int = 2) -> bytes:
+    service_id, method_id, interface_version = key
+    return struct.pack(
+        '>HHIHHBBBB', service_id, method_id, len(body) + 8, 0, 1, 1, interface_version, message_type, 0,
+    ) + body
+
+
+def decode_payloads(layout: SomeIpPayloadLayout, payloads: list[bytes]):
+    lengths = np.array([len(p) for p in payloads], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    buffer = np.frombuffer(b''.join(payloads), dtype=np.uint8)
+    return layout.decode(buffer, ends - lengths, ends)
+
+
+@pytest.mark.parametrize('length_size', [1, 2, 4])
+def test_dynamic_array_with_configured_length_size(length_size):
+    layout = SomeIpPayloadLayout(KEY, 'Event', ELEMENTS, length_size)
+    assert layout.minimum_size == 2 + length_size + 1
+    payloads = [
+        payload(1, [1, -2, 3], 7, length_size),
+        payload(2, [], 8, length_size),
+        payload(3, [-32768, 32767, 0, 5], 9, length_size),
+    ]
+    columns, valid = decode_payloads(layout, payloads)
+    assert valid.tolist() == [True, True, True]
+    assert columns['Counter'].tolist() == [1, 2, 3]
+    assert columns['Status'].tolist() == [7, 8, 9]
+    values = columns['Values']
+    assert len(values) == 3
+    assert values[0].tolist() == [1, -2, 3]
+    assert values[1].tolist() == []
+    assert values[2].tolist() == [-32768, 32767, 0, 5]
+
+
+def test_invalid_payloads_are_dropped():
+    layout = SomeIpPayloadLayout(KEY, 'Event', ELEMENTS)
+    too_long = payload(2, [1, 2, 3, 4, 5], 0)
+    odd_length = struct.pack('>HI', 3, 3) + b'\x00\x01\x02' + b'\x00'
+    payloads = [payload(1, [1], 1), too_long, odd_length, payload(4, [4, 4], 4)[:-1], payload(5, [5], 5)]
+    columns, valid = decode_payloads(layout, payloads)
+    assert valid.tolist() == [True, False, False, False, True]
+    assert columns['Counter'].tolist() == [1, 5]
+    assert [columns['Values'][i].tolist() for i in range(2)] == [[1], [5]]
+
+
+def test_unsupported_length_size():
+    with pytest.raises(ValueError):
+        SomeIpPayloadLayout(KEY, 'Event', ELEMENTS, 3)
+    # Without dynamic arrays the size of the length fields does not matter
+    SomeIpPayloadLayout(KEY, 'Event', {'Counter': ELEMENTS['Counter']}, 3)
+
+
+def test_decoder_dispatches_on_header():
+    other_key = (0x1234, 0x8002, 1)
+    decoder = SomeIpDecoder({
+        KEY: ('Service::Event', SimpleNamespace(elements=ELEMENTS, array_length_size=2)),
+        other_key: ('Service::Other', SimpleNamespace(elements={'Counter': ELEMENTS['Counter']}, array_length_size=None)),
+    })
+    assert decoder.layouts[KEY].array_length_size == 2
+    assert decoder.layouts[other_key].array_length_size == 4
+    messages = [
+        message(KEY, payload(1, [10, 11], 1, 2)),
+        message(other_key, struct.pack('>H', 7)),
+        message((0x1234, 0x8003, 1), b'\x00\x00'),
+        message(KEY, payload(2, [12], 2, 2), message_type=2 | TP_FLAG),
+        message(KEY, payload(3, [], 3, 2)),
+    ]
+    result = decoder.decode_messages(messages)
+    assert set(result) == {KEY, other_key}
+    event = result[KEY]
+    assert event.index.tolist() == [0, 4]
+    assert event.columns['Counter'].tolist() == [1, 3]
+    assert [event.columns['Values'][i].tolist() for i in range(2)] == [[10, 11], []]
+    assert result[other_key].index.tolist() == [1]
+    assert result[other_key].columns['Counter'].tolist() == [7]
+
+
+def test_array_length_size_from_i_signal():
+    props = SomeIpTransformationISignalProps(transformer_ref='/Transformers/SomeIp', size_of_array_length_fields=2)
+    signal = ISignal(
+        name='Signal',
+        system_signal_ref='/Signals/SystemSignal',
+        data_type_policy='TRANSFORMING-I-SIGNAL',
+        length=0,
+        transformation_i_signal_props=[SomeIpTransformationISignalPropsVariants([props])],
+    )
+    assert SystemExtractor._get_array_length_size(signal) == 2
+    props.size_of_array_length_fields = None
+    assert SystemExtractor._get_array_length_size(signal) is None
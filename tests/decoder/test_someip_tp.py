@@ -0,0 +1,232 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.decoder.capture import LINKTYPE_IPV4, CapturePipeline
+from autosar.decoder.someip import TP_FLAG, SomeIpDecoder
+from autosar.decoder.someip_tp import SomeIpTpReassembler, TpConnection, concatenate_messages
+from autosar.extractor.common import Array, DataType
+from autosar.extractor.system_extractor import ExtractedSystem
+from autosar.model.package import Package
+from autosar.model.some_ip_tp import SomeIpConfig, SomeIpConnection, SomeIpTPChannel
+
+SERVICE_ID = 0x1234
+METHOD_ID = 0x8001
+KEY = (SERVICE_ID, METHOD_ID, 1)
+ELEMENTS = {
+    'Counter': DataType('Counter', '>u2'),
+    'Values': Array('Values', DataType('Value', '>u1'), (1, 256)),
+}
+TIMEOUT = 1000000000
+
+
+def some_ip(payload: bytes, session_id: int = 1, message_type: int = 2) -> bytes:
+    return struct.pack(
+        '>HHIHHBBBB', SERVICE_ID, METHOD_ID, len(payload) + 8, 0, session_id, 1, 1, message_type, 0,
+    ) + payload
+
+
+def body(counter: int, values: bytes) -> bytes:
+    return struct.pack('>HI', counter, len(values)) + values
+
+
+def segment(payload: bytes, session_id: int = 1, size: int = 32) -> list[bytes]:
+    """
+    Splits payload into SOME/IP-TP segments of size bytes, the last one shorter
+    """
+    segments = []
+    for offset in range(0, len(payload), size):
+        more = offset + size < len(payload)
+        tp_header = struct.pack('>I', offset | more)
+        segments.append(some_ip(tp_header + payload[offset:offset + size], session_id, 2 | TP_FLAG))
+    return segments
+
+
+def reassembler(max_size: int = 1024) -> SomeIpTpReassembler:
+    return SomeIpTpReassembler({(SERVICE_ID, METHOD_ID): TpConnection(max_size, TIMEOUT)})
+
+
+def feed(tp: SomeIpTpReassembler, segments: list[bytes], timestamps: list[int] | None = None,
+         sources: list[int] | None = None) -> list:
+    if timestamps is None:
+        timestamps = list(range(len(segments)))
+    lengths = np.array([len(s) for s in segments], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    buffer = np.frombuffer(b''.join(segments), dtype=np.uint8)
+    source_array = None if sources is None else np.array(sources, dtype='>u4')
+    return tp.feed(buffer, ends - lengths, ends, np.array(timestamps, dtype=np.int64), source_array)
+
+
+@pytest.mark.parametrize('batch', [1, 2, 3, 10])
+def test_reassembly_across_feed_calls(batch):
+    payload = bytes(i & 0xff for i in range(100))
+    segments = segment(payload)
+    tp = reassembler()
+    messages = []
+    for first in range(0, len(segments), batch):
+        part = segments[first:first + batch]
+        messages += feed(tp, part, list(range(first, first + len(part))))
+    assert len(messages) == 1
+    message = messages[0]
+    assert (message.service_id, message.method_id, message.session_id) == (SERVICE_ID, METHOD_ID, 1)
+    assert bytes(message.data) == some_ip(payload)
+    assert message.timestamp == len(segments) - 1
+    assert message.index == (len(segments) - 1) % batch
+    assert tp.dropped == 0
+    assert len(tp.sessions) == 0
+
+
+def test_interleaved_sessions_and_sources():
+    first, second, third = bytes(range(40)), bytes(range(70)), bytes(range(50, 90))
+    a, b, c = segment(first, session_id=1), segment(second, session_id=2), segment(third, session_id=1)
+    # Session 1 is sent from two sources at once
+    segments = [a[0], b[0], c[0], a[1], b[1], c[1], b[2]]
+    sources = [1, 1, 2, 1, 1, 2, 1]
+    messages = feed(reassembler(), segments, sources=sources)
+    assert [bytes(message.data) for message in messages] == [
+        some_ip(first, 1), some_ip(third, 1), some_ip(second, 2),
+    ]
+    assert [message.source for message in messages] == [b'\x00\x00\x00\x01', b'\x00\x00\x00\x02', b'\x00\x00\x00\x01']
+
+
+def test_dropped_segment():
+    tp = reassembler()
+    lost = segment(bytes(100), session_id=1)
+    del lost[1]
+    complete = segment(bytes(range(50)), session_id=2)
+    messages = feed(tp, lost + complete)
+    assert [bytes(message.data) for message in messages] == [some_ip(bytes(range(50)), 2)]
+    # The segment after the gap discards the session, the remaining ones find none
+    assert tp.dropped == len(lost) - 1
+    assert len(tp.sessions) == 0
+
+
+def test_out_of_order_segments():
+    tp = reassembler()
+    segments = segment(bytes(100))
+    segments[1], segments[2] = segments[2], segments[1]
+    assert feed(tp, segments) == []
+    assert tp.dropped == 3
+    assert len(tp.sessions) == 0
+
+
+def test_repeated_first_segment_restarts_session():
+    tp = reassembler()
+    payload = bytes(range(60))
+    segments = segment(payload)
+    assert [bytes(m.data) for m in feed(tp, segments[:1] + segments)] == [some_ip(payload)]
+    assert tp.dropped == 1
+
+
+def test_invalid_segments():
+    # Unaligned segment followed by more segments
+    tp = reassembler()
+    assert feed(tp, segment(bytes(100), size=20)) == []
+    assert tp.dropped > 0
+    # Larger than the connection allows
+    tp = reassembler(max_size=64)
+    assert feed(tp, segment(bytes(100))) == []
+    assert tp.dropped > 0
+    # Unknown event and messages without TP flag
+    tp = reassembler()
+    unknown = bytearray(segment(bytes(10))[0])
+    unknown[0] ^= 0xff
+    assert feed(tp, [bytes(unknown), some_ip(bytes(10))]) == []
+    assert tp.dropped == 2
+
+
+def test_timeout():
+    tp = reassembler()
+    segments = segment(bytes(100))
+    assert feed(tp, segments, [i * 2 * TIMEOUT for i in range(len(segments))]) == []
+    assert len(tp.sessions) == 0
+    # Expired at the end of a batch
+    tp = reassembler()
+    feed(tp, segments[:1], [0])
+    feed(tp, [some_ip(b'')], [2 * TIMEOUT])
+    assert len(tp.sessions) == 0
+
+
+def test_reassembled_messages_decode():
+    decoder = SomeIpDecoder({KEY: ('Service::Event', SimpleNamespace(elements=ELEMENTS, array_length_size=None))})
+    payloads = [body(1, bytes(range(100))), body(2, bytes(range(60)))]
+    segments = segment(payloads[0], 1) + segment(payloads[1], 2)
+    parts = []
+    for i, message in enumerate(feed(reassembler(), segments)):
+        decoded = decoder.decode(message.array(), np.zeros(1, dtype=np.int64))[KEY]
+        decoded.index = decoded.index + i
+        parts.append(decoded)
+    messages = concatenate_messages(parts)
+    assert messages.index.tolist() == [0, 1]
+    assert messages.columns['Counter'].tolist() == [1, 2]
+    assert messages.columns['Values'][0].tolist() == list(range(100))
+    assert messages.columns['Values'][1].tolist() == list(range(60))
+    assert messages.header['message_type'].tolist() == [2, 2]
+    assert messages.header['length'].tolist() == [len(p) + 8 for p in payloads]
+
+
+def ipv4_udp(payload: bytes) -> bytes:
+    udp = struct.pack('>HHHH', 30490, 30490, 8 + len(payload), 0) + payload
+    return struct.pack('>BBHHHBBH4s4s', 0x45, 0, 20 + len(udp), 0, 0, 64, 17, 0, bytes([10, 0, 0, 1]), bytes(4)) + udp
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 64])
+def test_pipeline_reassembles_across_chunks(tmp_path, chunk_size):
+    payload = body(7, bytes(range(80)))
+    packets = [some_ip(body(1, b'\x01'))] + segment(payload) + [some_ip(body(2, b''))]
+    path = tmp_path / 'capture.pcap'
+    with open(path, 'wb') as file:
+        file.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, LINKTYPE_IPV4))
+        for i, packet in enumerate(packets):
+            data = ipv4_udp(packet)
+            file.write(struct.pack('<IIII', i, 0, len(data), len(data)) + data)
+    pipeline = CapturePipeline(
+        {KEY: ('Service::Event', SimpleNamespace(elements=ELEMENTS, array_length_size=None))},
+        {},
+        chunk_size,
+        reassembler(),
+    )
+    counters, packet_numbers, lengths = [], [], []
+    for decoded in pipeline.iter_chunks(path):
+        if KEY not in decoded.messages:
+            continue
+        messages = decoded.messages[KEY]
+        counters += messages.columns['Counter'].tolist()
+        packet_numbers += decoded.packet[messages.index].tolist()
+        lengths += [len(messages.columns['Values'][i]) for i in range(len(messages.index))]
+    # The reassembled message carries the packet number of its last segment
+    order = np.argsort(packet_numbers, kind='stable')
+    assert [counters[i] for i in order] == [1, 7, 2]
+    assert [packet_numbers[i] for i in order] == [0, len(packets) - 2, len(packets) - 1]
+    assert [lengths[i] for i in order] == [1, 80, 0]
+    assert pipeline.reassembler.dropped == 0
+
+
+def test_from_extracted_system(ws, caplog):
+    package = Package('SomeIpTp')
+    ws.append(package)
+    package.append(SomeIpConfig(name='Config', tp_channels=[SomeIpTPChannel(name='Channel', separation_time='0.01')]))
+    channel = '/Clusters/EthCluster0/EthChannel'
+    mapping = {
+        0x12348001: SomeIpConnection(tp_sdu_ref=f'{channel}/EventPduTrig0', separation_time=0.5),
+        0x12348002: SomeIpConnection(tp_sdu_ref=f'{channel}/EventPduTrig2', tp_channel_ref='/SomeIpTp/Config/Channel'),
+        0x12348003: SomeIpConnection(tp_sdu_ref=f'{channel}/EventPduTrig1'),
+        # A CAN PDU triggering and a missing one are skipped
+        0x12348004: SomeIpConnection(tp_sdu_ref='/Clusters/CanCluster0/CanChannel/PduTrig0'),
+        0x12348005: SomeIpConnection(tp_sdu_ref=f'{channel}/Nope'),
+    }
+    extracted = ExtractedSystem(ws.find('/Systems/System'), (), {}, {}, mapping)
+    tp = SomeIpTpReassembler.from_extracted_system(extracted, timeout_factor=4, default_timeout=2)
+    assert tp.connections == {
+        (0x1234, 0x8001): TpConnection(1, 2000000000),
+        (0x1234, 0x8002): TpConnection(4, 40000000),
+        (0x1234, 0x8003): TpConnection(2, 2000000000),
+    }
+    assert sum('PduTrig0' in message or 'Nope' in message for message in caplog.messages) == 2
+    pipeline = CapturePipeline.from_extracted_system(extracted)
+    assert pipeline.reassembler.connections.keys() == tp.connections.keys()
+    extracted.some_ip_tp_mapping = {}
+    assert CapturePipeline.from_extracted_system(extracted).reassembler is None
@@ -0,0 +1,45 @@
+import logging
+
+from autosar.model.ar_object import ArObject
+from autosar.model.element import Element
+from autosar.model.package import Package
+from autosar.model.signal import ISignal, SystemSignal
+
+
+class Plain(ArObject):
+    def __init__(self, value: int, items: list | None = None):
+        self.value = value
+        self.items = items
+        self._hidden = 1
+        self.parent = None
+
+
+class Named(Element):
+    pass
+
+
+def test_repr_lists_constructor_attributes():
+    signal = ISignal(system_signal_ref='/Signals/SysSig0', data_type_policy='LEGACY', length=8, name='Sig0')
+    text = repr(signal)
+    assert text.startswith("ISignal(name='Sig0', ")
+    for expected in ("system_signal_ref='/Signals/SysSig0'", "data_type_policy='LEGACY'", 'length=8', "i_signal_type='PRIMITIVE'"):
+        assert expected in text
+    # Private slots, the parent and lists are left out
+    assert '_parent' not in text and 'parent=' not in text and '_ref_cache' not in text
+    assert 'data_transformation_refs' not in text
+
+
+def test_repr_of_dict_based_objects():
+    assert repr(Plain(3, [1, 2])) == 'Plain(value=3)'
+    assert repr(SystemSignal(name='SysSig0')).startswith("SystemSignal(name='SysSig0', ")
+    assert repr(Package('Pdus')).startswith("Package(name='Pdus', role=None, ")
+
+
+def test_logger_per_class():
+    assert isinstance(Element._logger, logging.Logger)
+    assert Element._logger.name == 'Element'
+    assert ISignal._logger.name == 'ISignal'
+    assert Named._logger.name == 'Named'
+    assert Named._logger is not Element._logger
+    assert Named(name='x')._logger is Named._logger
+    assert Plain._logger.name == 'Plain'
@@ -0,0 +1,132 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from autosar.extractor.conversion import (
+    BitfieldConversion,
+    ConstantConversion,
+    ConversionInterval,
+    LinearConversion,
+    MapConversion,
+    NumericAndMapConversion,
+    NumericConversion,
+    RationalConversion,
+)
+
+RAW = np.arange(-3, 260)
+
+
+def text(value: str, low: int, high: int | None = None) -> ConversionInterval:
+    return ConversionInterval(low, low if high is None else high, ConstantConversion(value))
+
+
+def assert_matches_scalar(values, expected: list):
+    """
+    Compares the result of apply() with apply_scalar() on every raw value, NaN compares equal to NaN
+    """
+    np.testing.assert_array_equal(values, np.array(expected, dtype=np.float64))
+
+
+def test_linear():
+    conversion = LinearConversion(0.5, -10)
+    raw = np.array([-4, 0, 3, 255])
+    assert conversion.apply(raw).tolist() == [conversion.apply_scalar(value) for value in raw.tolist()] == [-12, -10, -8.5, 117.5]
+    assert LinearConversion(2, 1).apply(np.array([1, 2], dtype=np.uint8)).tolist() == [3, 5]
+
+
+def test_rational():
+    # Coefficients are given lowest order first: (1 + 2x + 3x^2) / (4 + x)
+    conversion = RationalConversion([1, 2, 3], [4, 1])
+    raw = np.array([-3, -1, 0, 1, 2, 10, 255])
+    expected = [(1 + 2 * x + 3 * x * x) / (4 + x) for x in raw.tolist()]
+    np.testing.assert_allclose(conversion.apply(raw), expected)
+    np.testing.assert_allclose([conversion.apply_scalar(x) for x in raw.tolist()], expected)
+    assert list(conversion.numerator) == [(3, 2), (2, 1), (1, 0)]
+    # A constant denominator of a higher order polynomial
+    cubic = RationalConversion([0, 0, 0, 1], [8])
+    assert cubic.apply(np.array([2, -2])).tolist() == [cubic.apply_scalar(2), cubic.apply_scalar(-2)] == [1, -1]
+
+
+def test_numeric_with_rational_scales():
+    conversion = NumericConversion([
+        ConversionInterval(0, 99, LinearConversion(0.1, 0)),
+        ConversionInterval(100, 200, RationalConversion([0, 1], [2])),
+        ConversionInterval(201, 210, None),
+    ])
+    assert_matches_scalar(conversion.apply(RAW), [conversion.apply_scalar(value) for value in RAW.tolist()])
+    assert conversion.apply_scalar(150) == 75
+    assert conversion.apply_scalar(205) == 205
+    assert np.isnan(conversion.apply_scalar(-1))
+
+
+def test_gaps_between_intervals_are_split_at_the_midpoint():
+    conversion = NumericConversion([
+        ConversionInterval(20, 30, LinearConversion(1, 100)),
+        ConversionInterval(0, 10, LinearConversion(2, 0)),
+    ])
+    assert [(iv.min, iv.max) for iv in conversion.numeric_intervals] == [(0, 15), (15, 30)]
+    raw = np.array([-1, 0, 10, 14, 15, 16, 25, 30, 31])
+    expected = [float('nan'), 0, 20, 28, 30, 116, 125, 130, float('nan')]
+    np.testing.assert_array_equal(conversion.apply(raw), expected)
+    np.testing.assert_array_equal([conversion.apply_scalar(value) for value in raw.tolist()], expected)
+
+
+def test_map_codes_and_labels():
+    conversion = MapConversion([
+        text('Off', 0),
+        text('On', 1),
+        text('Error', 2, 5),
+        text('Off', 200, 250),
+    ])
+    assert conversion.labels == ('Off', 'On', 'Error')
+    codes = conversion.apply_codes(RAW)
+    assert codes.dtype == np.int32
+    assert conversion.apply(RAW).tolist() == codes.tolist()
+    scalars = [conversion.apply_scalar(value) for value in RAW.tolist()]
+    assert [None if code < 0 else conversion.labels[code] for code in codes.tolist()] == scalars
+    assert scalars[3:10] == ['Off', 'On', 'Error', 'Error', 'Error', 'Error', None]
+    assert scalars[0] is None and scalars[-1] is None
+
+
+def test_numeric_and_map():
+    conversion = NumericAndMapConversion(
+        numeric_intervals=[ConversionInterval(0, 100, LinearConversion(2, 1)), ConversionInterval(150, 200, None)],
+        map_intervals=[text('Init', 101, 120), text('SNA', 255)],
+    )
+    values = conversion.apply(RAW)
+    codes = conversion.apply_codes(RAW)
+    for raw, value, code in zip(RAW.tolist(), values.tolist(), codes.tolist()):
+        scalar = conversion.apply_scalar(raw)
+        if isinstance(scalar, str):
+            assert np.isnan(value)
+            assert conversion.labels[code] == scalar
+        else:
+            assert code == -1
+            assert value == scalar or (np.isnan(value) and np.isnan(scalar))
+    assert conversion.apply_scalar(10) == 21
+    assert conversion.apply_scalar(255) == 'SNA'
+    # The gap up to 150 is split between the numeric intervals, texts inside it take precedence
+    assert conversion.apply_scalar(110) == 'Init'
+    assert conversion.apply_scalar(130) == 130
+    assert np.isnan(conversion.apply_scalar(201))
+
+
+def test_bitfield():
+    conversion = BitfieldConversion([
+        (0x03, text('A', 0)),
+        (0x03, text('B', 1)),
+        (0x03, text('C', 2)),
+        (0x0c, text('X', 4)),
+        (0x0c, text('Y', 8, 12)),
+        (0xf0, text('High', 0x10, 0x30)),
+    ])
+    assert conversion.labels == {0x03: ('A', 'B', 'C'), 0x0c: ('X', 'Y'), 0xf0: ('High',)}
+    codes = conversion.apply(RAW)
+    assert codes.keys() == {0x03, 0x0c, 0xf0}
+    for i, raw in enumerate(RAW.tolist()):
+        expected = tuple(
+            conversion.labels[mask][mask_codes[i]] for mask, mask_codes in codes.items() if mask_codes[i] >= 0
+        )
+        assert conversion.apply_scalar(raw) == expected
+    assert conversion.apply_scalar(0x19) == ('B', 'Y', 'High')
+    assert conversion.apply_scalar(0xc3) == ()
@@ -0,0 +1,117 @@
+from autosar.model.communication_cluster import PduTriggering
+
+
+def scanned_child(element, name: str):
+    """
+    Looks name up in the child lists of element the way find() did before the name map
+    """
+    for subset in element._find_sets:
+        if subset is None:
+            continue
+        for child in subset if isinstance(subset, list) else [subset]:
+            if child.name == name:
+                return child
+    return None
+
+
+def assert_children_found(element):
+    for subset in element._find_sets:
+        for child in subset if isinstance(subset, list) else [subset]:
+            assert element.find(child.name) is scanned_child(element, child.name)
+
+
+def can_channel(ws):
+    return ws.find('/Clusters/CanCluster0/CanChannel')
+
+
+def test_find_children(ws):
+    channel = can_channel(ws)
+    assert_children_found(channel)
+    assert channel.find('PduTrig0/Nope') is None
+    assert channel.find('Nope') is None
+    ethernet_channel = ws.find('/Clusters/EthCluster0/EthChannel')
+    assert_children_found(ethernet_channel)
+    assert ethernet_channel.find('Ecu0_Socket').name == 'Ecu0_Socket'
+
+
+def test_find_after_append_and_remove(ws):
+    channel = can_channel(ws)
+    triggerings = channel.pdu_triggerings
+    assert channel.find('PduTrig0') is triggerings[0]
+    added = PduTriggering(name='Added', parent=channel, i_pdu_ref=None)
+    triggerings.append(added)
+    assert channel.find('Added') is added
+    removed = triggerings.pop(0)
+    assert channel.find(removed.name) is None
+    assert_children_found(channel)
+
+
+def test_find_after_replacing_children_of_same_count(ws):
+    channel = can_channel(ws)
+    triggerings = channel.pdu_triggerings
+    assert channel.find('PduTrig0') is triggerings[0]
+    removed = triggerings.pop(0)
+    added = PduTriggering(name='Added', parent=channel, i_pdu_ref=None)
+    triggerings.append(added)
+    assert channel.find(removed.name) is None
+    assert channel.find('Added') is added
+    replacement = PduTriggering(name='Replacement', parent=channel, i_pdu_ref=None)
+    triggerings[-1] = replacement
+    assert channel.find('Added') is None
+    assert channel.find('Replacement') is replacement
+
+
+def test_find_after_rename(ws):
+    channel = can_channel(ws)
+    triggering = channel.find('PduTrig1')
+    triggering.name = 'Renamed'
+    assert channel.find('Renamed') is triggering
+    assert channel.find('PduTrig1') is None
+    assert ws.find('/Clusters/CanCluster0/CanChannel/Renamed') is triggering
+    assert_children_found(channel)
+
+
+def test_find_after_reparent(ws):
+    channel = can_channel(ws)
+    ethernet_channel = ws.find('/Clusters/EthCluster0/EthChannel')
+    assert ethernet_channel.find('PduTrig2') is None
+    triggering = channel.find('PduTrig2')
+    channel.pdu_triggerings.remove(triggering)
+    ethernet_channel.pdu_triggerings.append(triggering)
+    triggering.parent = ethernet_channel
+    assert channel.find('PduTrig2') is None
+    assert ethernet_channel.find('PduTrig2') is triggering
+    assert triggering.ref == '/Clusters/EthCluster0/EthChannel/PduTrig2'
+
+
+def test_find_after_replacing_find_sets(ws):
+    channel = can_channel(ws)
+    assert channel.find('FrameTrig0') is not None
+    channel._find_sets = (channel.pdu_triggerings,)
+    assert channel.find('FrameTrig0') is None
+    assert channel.find('PduTrig0') is channel.pdu_triggerings[0]
+
+
+def test_find_after_replacing_middle_child(ws):
+    channel = can_channel(ws)
+    triggerings = channel.pdu_triggerings
+    replaced = triggerings[1]
+    assert channel.find(replaced.name) is replaced
+    middle = PduTriggering(name='Mid', parent=channel, i_pdu_ref=None)
+    triggerings[1] = middle
+    assert channel.find('Mid') is middle
+    assert channel.find(replaced.name) is None
+    assert_children_found(channel)
+
+
+def test_find_after_reordering_children(ws):
+    channel = can_channel(ws)
+    triggerings = channel.pdu_triggerings
+    assert_children_found(channel)
+    inserted = PduTriggering(name='Inserted', parent=channel, i_pdu_ref=None)
+    triggerings.insert(2, inserted)
+    removed = triggerings.pop(4)
+    assert channel.find('Inserted') is inserted
+    assert channel.find(removed.name) is None
+    triggerings.sort(key=lambda triggering: triggering.name, reverse=True)
+    assert_children_found(channel)
@@ -0,0 +1,76 @@
+from autosar.model.datatype import DataType, IntegerDataType, StringDataType
+from autosar.model.element import Element
+from autosar.model.package import Package
+from autosar.model.pdu import ISignalIPdu
+from autosar.model.signal import ISignal
+
+
+def refs(elements) -> list[str]:
+    return [element.ref for element in elements]
+
+
+def package_elements(ws, cls: type) -> list:
+    """
+    Returns the package elements of class cls, collected from scratch
+    """
+    return [element for element in ws.findall('/**/*') if isinstance(element, cls)]
+
+
+def test_matches_package_elements(ws):
+    for cls in (ISignal, ISignalIPdu, Element):
+        assert sorted(refs(ws.instances_of(cls))) == sorted(refs(package_elements(ws, cls)))
+    assert refs(ws.instances_of(ISignalIPdu))[:8] == [f'/Pdus/Pdu{i}' for i in range(8)]
+    # Nested elements are not registered
+    assert ws.find('/Pdus/Pdu0/Sig0_Map') not in list(ws.instances_of(Element))
+
+
+def test_subclasses(ws):
+    package = ws.create_package('Types')
+    package.append(IntegerDataType('Int', 0, 10))
+    package.append(StringDataType('Text', 8, 'UTF-8'))
+    assert refs(ws.instances_of(DataType)) == ['/Types/Int', '/Types/Text']
+    assert refs(ws.instances_of(IntegerDataType)) == ['/Types/Int']
+    assert list(ws.instances_of(DataType, include_subclasses=False)) == []
+    assert refs(ws.instances_of(IntegerDataType, include_subclasses=False)) == ['/Types/Int']
+
+
+def test_append_and_delete(ws):
+    package = ws.create_package('Types')
+    integer = IntegerDataType('Int', 0, 10)
+    package.append(integer)
+    assert list(ws.instances_of(IntegerDataType)) == [integer]
+    # Elements of a package appended later are registered with it
+    other = Package('More')
+    sub_package = Package('Sub')
+    other.append(sub_package)
+    nested = IntegerDataType('Nested', 0, 1)
+    sub_package.append(nested)
+    ws.append(other)
+    assert list(ws.instances_of(IntegerDataType)) == [integer, nested]
+    package.delete('Int')
+    assert list(ws.instances_of(IntegerDataType)) == [nested]
+    ws.delete('/More')
+    assert list(ws.instances_of(IntegerDataType)) == []
+
+
+def test_update_replaces_instances(ws):
+    package = ws.create_package('Types')
+    old = IntegerDataType('Int', 0, 10)
+    package.append(old)
+    source = Package('Types')
+    source.append(IntegerDataType('Int', 0, 20))
+    source.append(IntegerDataType('New', 0, 30))
+    package.update(source)
+    instances = list(ws.instances_of(IntegerDataType))
+    assert old not in instances
+    assert refs(instances) == ['/Types/Int', '/Types/New']
+    assert [instance.max_val for instance in instances] == [20, 30]
+    assert instances == package.elements
+
+
+def test_delete_keeps_other_instances(ws):
+    before = {id(element) for element in ws.instances_of(Element)}
+    pdu = ws.find('/Pdus/Pdu2')
+    ws.find('/Pdus').delete('Pdu2')
+    after = {id(element) for element in ws.instances_of(Element)}
+    assert after == before - {id(pdu)}
@@ -0,0 +1,78 @@
+import pytest
+
+import autosar
+from autosar.model.pdu import ISignalIPdu
+from autosar.parser.package_parser import PackageParser
+
+
+def pending(ws) -> list[str]:
+    """
+    Returns the refs of the packages whose elements have not been parsed yet
+    """
+    result = []
+    packages = list(ws.packages)
+    while packages:
+        package = packages.pop(0)
+        if package._lazy_xml:
+            result.append(package.ref)
+        packages.extend(package.sub_packages)
+    return result
+
+
+@pytest.fixture
+def lazy_ws(arxml_file):
+    ws = autosar.workspace()
+    ws.load_xml(arxml_file, lazy=True)
+    return ws
+
+
+@pytest.fixture
+def parsed(monkeypatch) -> list[str]:
+    """
+    Records the ref of every package whose elements are parsed
+    """
+    refs = []
+    load_elements = PackageParser.load_elements
+
+    def record(self, package, *args, **kwargs):
+        refs.append(package.ref)
+        return load_elements(self, package, *args, **kwargs)
+
+    monkeypatch.setattr(PackageParser, 'load_elements', record)
+    return refs
+
+
+def test_listing_does_not_parse(lazy_ws, ws, parsed):
+    assert '/Pdus' in pending(lazy_ws)
+    before = pending(lazy_ws)
+    assert lazy_ws.list_packages() == ws.list_packages()
+    assert lazy_ws.dir() == ws.dir()
+    assert lazy_ws.dir('/Pdus') == ws.dir('/Pdus')
+    assert lazy_ws.dir('/DataTypes/BaseTypes') == ws.dir('/DataTypes/BaseTypes')
+    assert pending(lazy_ws) == before
+    assert parsed == []
+
+
+def test_find_parses_a_package_once(lazy_ws, ws, parsed):
+    pdu = lazy_ws.find('/Pdus/Pdu0')
+    assert isinstance(pdu, ISignalIPdu)
+    assert parsed == ['/Pdus']
+    assert lazy_ws.find('/Pdus/Pdu1') is not None
+    assert lazy_ws.find('/Pdus/Pdu0') is pdu
+    assert lazy_ws.find('/Pdus/Nope') is None
+    assert parsed == ['/Pdus']
+    assert '/Pdus' not in pending(lazy_ws)
+    assert '/Frames' in pending(lazy_ws)
+    assert lazy_ws.dir('/Pdus') == ws.dir('/Pdus')
+
+
+def test_lazy_matches_eager(lazy_ws, ws):
+    refs = [obj.ref for obj in ws.findall('/**/*')]
+    assert [obj.ref for obj in lazy_ws.findall('/**/*')] == refs
+    assert pending(lazy_ws) == []
+    for ref in refs:
+        assert lazy_ws.find(ref).ref == ref
+    assert type(lazy_ws.find('/Pdus/Pdu0/Sig0_Map')) is type(ws.find('/Pdus/Pdu0/Sig0_Map'))
+    assert [obj.ref for obj in lazy_ws.instances_of(ISignalIPdu)] == [obj.ref for obj in ws.instances_of(ISignalIPdu)]
+    assert [system.ref for system in lazy_ws.systems] == [system.ref for system in ws.systems]
+    assert lazy_ws.unhandled_parser == ws.unhandled_parser
@@ -0,0 +1,120 @@
+import importlib
+import logging
+
+import pytest
+
+import autosar
+from autosar.model.collection import Collection
+from autosar.model.pdu import ISignalIPdu
+from autosar.model.system import System
+from autosar.parser.package_parser import TagFilter
+from autosar.parser.parser_base import ElementParser
+
+# autosar.workspace is shadowed by the workspace() factory
+workspace_module = importlib.import_module('autosar.workspace')
+
+COLLECTION = """\
+<AR-PACKAGE><SHORT-NAME>Collections</SHORT-NAME>
+<ELEMENTS>
+<COLLECTION><SHORT-NAME>Interfaces</SHORT-NAME><ELEMENT-ROLE>SO_SERVICE_INTERFACE</ELEMENT-ROLE>
+<ELEMENT-REFS><ELEMENT-REF DEST="SERVICE-INTERFACE">/PortInterfaces/Service0</ELEMENT-REF></ELEMENT-REFS></COLLECTION>
+</ELEMENTS>
+</AR-PACKAGE>
+</AR-PACKAGES>"""
+
+
+class NoopParser(ElementParser):
+    def get_supported_tags(self):
+        return []
+
+    def parse_element(self, xml_element, parent=None):
+        return None
+
+
+@pytest.fixture
+def source(arxml_file, tmp_path):
+    path = tmp_path / 'source.arxml'
+    path.write_text(arxml_file.read_text().replace('</AR-PACKAGES>\n</AUTOSAR>', COLLECTION + '\n</AUTOSAR>'))
+    return path
+
+
+def refs(objects) -> list[str]:
+    return [obj.ref for obj in objects]
+
+
+def cached_load(path, cache_dir, **kwargs):
+    ws = autosar.workspace()
+    ws.load_xml(path, cache_dir=cache_dir, **kwargs)
+    return ws
+
+
+def test_miss_then_hit(source, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    first = cached_load(source, cache_dir)
+    assert len(list(cache_dir.glob('*.pickle'))) == 1
+
+    def fail(*_):
+        raise AssertionError('parsed although the snapshot is cached')
+
+    monkeypatch.setattr(workspace_module, '_load_file_detached', fail)
+    second = cached_load(source, cache_dir)
+    assert refs(second.findall('/**/*')) == refs(first.findall('/**/*'))
+    assert len(list(cache_dir.glob('*.pickle'))) == 1
+
+
+def test_cached_load_matches_parsed_load(source, tmp_path):
+    expected = autosar.workspace()
+    expected.load_xml(source)
+    cache_dir = tmp_path / 'cache'
+    cached_load(source, cache_dir)
+    ws = cached_load(source, cache_dir)
+    assert ws.xml_root is None
+    assert (ws.major, ws.minor, ws.schema) == (expected.major, expected.minor, expected.schema)
+    all_refs = refs(expected.findall('/**/*'))
+    assert refs(ws.findall('/**/*')) == all_refs
+    for ref in all_refs:
+        assert ws.find(ref).ref == ref
+    assert refs(ws.systems) == refs(expected.systems) == ['/Systems/System']
+    assert ws.systems[0] is ws.find('/Systems/System')
+    assert {role: refs(elements) for role, elements in ws.role_elements.items()} == {
+        'SO_SERVICE_INTERFACE': ['/Collections/Interfaces'],
+    }
+    assert ws.role_elements['SO_SERVICE_INTERFACE'][0] is ws.find('/Collections/Interfaces')
+    assert ws.type_references == expected.type_references
+    for cls in (ISignalIPdu, System, Collection):
+        assert refs(ws.instances_of(cls)) == refs(expected.instances_of(cls))
+    assert refs(ws.referrers('/Signals/Sig0')) == refs(expected.referrers('/Signals/Sig0')) != []
+
+
+def test_key_changes(source, arxml_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+
+    def key(path=source, element_parsers=(), tag_filter=None) -> str:
+        return workspace_module._cache_key(path, list(element_parsers), tag_filter)
+
+    base = key()
+    assert key() == base
+    assert key(arxml_file) != base
+    assert key(element_parsers=[NoopParser()]) != base
+    assert key(tag_filter=TagFilter(None, ['SYSTEM'])) != base
+    # Touching the file without changing its content keeps the key
+    source.write_text(source.read_text())
+    assert key() == base
+    source.write_text(source.read_text().replace('Interfaces', 'Interfaces2'))
+    changed_content = key()
+    assert changed_content != base
+    monkeypatch.setattr(workspace_module, '_package_version', lambda: '0.0.0')
+    assert key() != changed_content
+
+    cached_load(source, cache_dir)
+    ws = autosar.workspace()
+    ws.register_element_parser(NoopParser(ws.version))
+    ws.load_xml(source, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob('*.pickle'))) == 2
+
+
+def test_lazy_is_ignored_with_a_warning(source, tmp_path, caplog):
+    with caplog.at_level(logging.WARNING):
+        ws = cached_load(source, tmp_path / 'cache', lazy=True)
+    assert any('lazy' in message for message in caplog.messages)
+    assert all(not package._lazy_xml for package in ws.packages)
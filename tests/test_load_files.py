@@ -0,0 +1,78 @@
+import shutil
+
+import pytest
+
+import autosar
+from autosar.model.system import System
+
+HEADER = '''\
+<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" \
+xsi:schemaLocation="http://autosar.org/schema/r4.0 AUTOSAR_4-2-2.xsd">
+<AR-PACKAGES>
+'''
+FOOTER = '</AR-PACKAGES>\n</AUTOSAR>\n'
+# A second System of the same name and a collection giving an element role, in new and in existing packages
+EXTRA = HEADER + """\
+<AR-PACKAGE><SHORT-NAME>Systems</SHORT-NAME>
+<ELEMENTS>
+<SYSTEM><SHORT-NAME>System</SHORT-NAME></SYSTEM>
+<SYSTEM><SHORT-NAME>OtherSystem</SHORT-NAME></SYSTEM>
+</ELEMENTS>
+</AR-PACKAGE>
+<AR-PACKAGE><SHORT-NAME>Collections</SHORT-NAME>
+<ELEMENTS>
+<COLLECTION><SHORT-NAME>Interfaces</SHORT-NAME><ELEMENT-ROLE>SO_SERVICE_INTERFACE</ELEMENT-ROLE>
+<ELEMENT-REFS><ELEMENT-REF DEST="SERVICE-INTERFACE">/PortInterfaces/Service0</ELEMENT-REF></ELEMENT-REFS></COLLECTION>
+</ELEMENTS>
+</AR-PACKAGE>
+""" + FOOTER
+
+
+@pytest.fixture
+def filenames(arxml_file, tmp_path) -> list:
+    copy = tmp_path / 'copy.arxml'
+    shutil.copyfile(arxml_file, copy)
+    extra = tmp_path / 'extra.arxml'
+    extra.write_text(EXTRA)
+    return [arxml_file, extra, copy, extra]
+
+
+def refs(objects) -> list[str]:
+    return [obj.ref for obj in objects]
+
+
+def load(filenames, jobs: int):
+    ws = autosar.workspace()
+    ws.load_files(filenames, jobs=jobs)
+    return ws
+
+
+def test_sequential_and_parallel_loads_match(filenames):
+    sequential = load(filenames, 1)
+    parallel = load(filenames, 2)
+    all_refs = refs(sequential.findall('/**/*'))
+    assert all_refs == refs(parallel.findall('/**/*'))
+    assert len(all_refs) == len(set(all_refs))
+    assert refs(sequential.systems) == refs(parallel.systems) == ['/Systems/System', '/Systems/OtherSystem']
+    assert {role: refs(elements) for role, elements in sequential.role_elements.items()} == {
+        'SO_SERVICE_INTERFACE': ['/Collections/Interfaces'],
+    }
+    assert {role: refs(elements) for role, elements in parallel.role_elements.items()} == {
+        'SO_SERVICE_INTERFACE': ['/Collections/Interfaces'],
+    }
+    for ws in (sequential, parallel):
+        assert ws.xml_root is None
+        for ref in all_refs:
+            assert ws.find(ref).ref == ref
+        assert [system.ref for system in ws.instances_of(System)] == ['/Systems/System', '/Systems/OtherSystem']
+        assert ws.find('/Systems/System') is ws.systems[0]
+
+
+def test_single_file_matches_load_xml(arxml_file):
+    expected = autosar.workspace()
+    expected.load_xml(arxml_file)
+    ws = load([arxml_file], None)
+    assert refs(ws.findall('/**/*')) == refs(expected.findall('/**/*'))
+    assert refs(ws.systems) == refs(expected.systems)
+    assert ws.version == expected.version
@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+import autosar
+from autosar.model.pdu import ISignalIPdu
+
+
+def element_refs(ws) -> list[str]:
+    return sorted(obj.ref for obj in ws.findall('/**/*'))
+
+
+def write_prefixed(source, target):
+    """
+    Writes source with the AUTOSAR namespace bound to the prefix ar instead of being the default namespace
+    """
+    text = source.read_text()
+    text = text.replace('xmlns="', 'xmlns:ar="', 1)
+    text = re.sub(r'<(/?)([A-Z])', r'<\1ar:\2', text)
+    target.write_text(text)
+
+
+def write_without_namespace(source, target):
+    text = source.read_text()
+    text = re.sub(r' xmlns="[^"]*"', '', text, count=1)
+    target.write_text(text)
+
+
+def test_streaming_matches_tree(arxml_file):
+    expected = autosar.workspace()
+    expected.load_xml(arxml_file)
+    ws = autosar.workspace()
+    ws.load_xml(arxml_file, streaming=True)
+    assert element_refs(ws) == element_refs(expected)
+    assert (ws.major, ws.minor, ws.schema) == (expected.major, expected.minor, expected.schema)
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_prefixed_namespace(arxml_file, tmp_path, streaming):
+    prefixed = tmp_path / 'prefixed.arxml'
+    write_prefixed(arxml_file, prefixed)
+    expected = autosar.workspace()
+    expected.load_xml(arxml_file)
+    ws = autosar.workspace()
+    ws.load_xml(prefixed, streaming=streaming)
+    assert element_refs(ws) == element_refs(expected)
+    assert len(list(ws.instances_of(ISignalIPdu))) == len(list(expected.instances_of(ISignalIPdu)))
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_missing_namespace(arxml_file, tmp_path, streaming):
+    plain = tmp_path / 'plain.arxml'
+    write_without_namespace(arxml_file, plain)
+    ws = autosar.workspace()
+    with pytest.raises(ValueError, match='plain.arxml'):
+        ws.load_xml(plain, streaming=streaming)
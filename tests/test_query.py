@@ -0,0 +1,115 @@
+from fnmatch import fnmatchcase
+
+import pytest
+
+from autosar.model.index import iter_child_elements
+from autosar.model.package import Package
+from autosar.model.pdu import ISignalIPdu
+from autosar.model.signal import ISignal
+
+
+def all_nodes(ws) -> list[tuple[tuple[tuple[str, bool], ...], object]]:
+    """
+    Returns the object of every package, package element and nested element of ws, with its path of
+    (name, is package) pairs
+    """
+    nodes = []
+    pending = [(((package.name, True),), package) for package in ws.packages]
+    while pending:
+        path, obj = pending.pop()
+        nodes.append((path, obj))
+        if isinstance(obj, Package):
+            children = [*obj.elements, *obj.sub_packages]
+        else:
+            children = iter_child_elements(obj)
+        pending.extend(((*path, (child.name, isinstance(child, Package))), child) for child in children)
+    return nodes
+
+
+def reference_match(segments: list[str], path: tuple[tuple[str, bool], ...]) -> bool:
+    """
+    Brute force matcher, '**' stands for zero or more package levels
+    """
+    if not segments:
+        return not path
+    if not path:
+        return segments == ['**']
+    name, is_package = path[0]
+    if segments[0] == '**':
+        return reference_match(segments[1:], path) or (is_package and reference_match(segments, path[1:]))
+    return fnmatchcase(name, segments[0]) and reference_match(segments[1:], path[1:])
+
+
+def reference_findall(ws, pattern: str, cls: type | None = None) -> list:
+    segments = pattern.strip('/').split('/')
+    return [
+        obj for path, obj in all_nodes(ws)
+        if reference_match(segments, path) and (cls is None or isinstance(obj, cls))
+    ]
+
+
+patterns = [
+    '/Pdus/Pdu0',
+    '/Pdus/Pdu?',
+    '/Pdus/[!P]*',
+    '/Pdus/Pdu[0-3]',
+    '/*/*Types',
+    '/*/*/*',
+    '/Pdus/Pdu0/*',
+    '/**',
+    '/**/uint8',
+    '/**/**/uint8',
+    '/DataTypes/**/uint*',
+    '/**/BaseTypes/*',
+    '/**/Pdu0/Sig*_Map',
+    '/Nope/*',
+    '/**/Nope',
+    '/Pdus/Pdu0/Nope',
+    '/Pdus/[',
+]
+
+
+@pytest.mark.parametrize('pattern', patterns)
+def test_findall_matches_brute_force(ws, pattern):
+    found = ws.findall(pattern)
+    assert len({id(obj) for obj in found}) == len(found)
+    assert {id(obj) for obj in found} == {id(obj) for obj in reference_findall(ws, pattern)}
+
+
+@pytest.mark.parametrize('pattern, cls', [
+    ('/**/*', ISignalIPdu),
+    ('/**/Pdu?', ISignalIPdu),
+    ('/Pdus/**/Pdu?', ISignalIPdu),
+    ('/**/Sig1?', ISignal),
+    ('/**/Nope', ISignal),
+])
+def test_findall_by_class(ws, pattern, cls):
+    found = ws.findall(pattern, cls)
+    assert all(isinstance(obj, cls) for obj in found)
+    assert {id(obj) for obj in found} == {id(obj) for obj in reference_findall(ws, pattern, cls)}
+
+
+def test_findall_no_match(ws):
+    assert ws.findall('/Nope') == []
+    assert ws.findall('/**/Nope') == []
+    assert ws.findall(None) is None
+    assert list(ws.iterfind('/Pdus/Nope*')) == []
+
+
+def test_findall_leaves_out_root(ws):
+    packages = ws.findall('/**')
+    assert ws not in packages
+    assert all(isinstance(obj, Package) for obj in packages)
+    assert len(packages) == sum(isinstance(obj, Package) for _, obj in all_nodes(ws))
+    data_types = ws.find('/DataTypes')
+    below = data_types.findall('**')
+    assert data_types not in below
+    assert below == data_types.sub_packages
+    assert ws.findall('/') == []
+
+
+def test_package_findall_is_relative(ws):
+    data_types = ws.find('/DataTypes')
+    assert data_types.findall('BaseTypes/uint8') == [ws.find('/DataTypes/BaseTypes/uint8')]
+    assert data_types.findall('**/uint8') == ws.findall('/**/uint8')
+    assert data_types.findall('**/uint8', ISignal) == []
@@ -0,0 +1,103 @@
+import autosar
+from autosar.model.ar_object import ArObject
+from autosar.model.element import Element
+from autosar.workspace import Workspace
+
+
+class PlainObject(ArObject):
+    """
+    Object with a ref that does not track changes of its name and parent
+    """
+
+    def __init__(self, name: str, parent: ArObject):
+        self.name = name
+        self.parent = parent
+
+    @property
+    def ref(self):
+        return f'{self.parent.ref}/{self.name}'
+
+    def root_ws(self):
+        return self.parent.root_ws()
+
+
+def uncached_ref(obj) -> str | None:
+    names = []
+    while not isinstance(obj, Workspace):
+        if obj is None:
+            return None
+        names.append(obj.name)
+        obj = obj.parent
+    return '/' + '/'.join(reversed(names))
+
+
+def create_workspace():
+    ws = autosar.workspace()
+    package = ws.create_package('Pkg')
+    sub_package = package.create_sub_package('Sub')
+    swc = sub_package.create_application_software_component('Swc')
+    area = swc.behavior.create_exclusive_area('Area')
+    return ws, package, sub_package, swc, area
+
+
+def test_ref_follows_rename():
+    ws, package, sub_package, swc, area = create_workspace()
+    assert area.ref == '/Pkg/Sub/Swc_InternalBehavior/Area'
+    sub_package.name = 'Renamed'
+    assert area.ref == uncached_ref(area) == '/Pkg/Renamed/Swc_InternalBehavior/Area'
+    swc.behavior.name = 'Behavior'
+    assert area.ref == '/Pkg/Renamed/Behavior/Area'
+    assert swc.ref == '/Pkg/Renamed/Swc'
+
+
+def test_ref_follows_reparent():
+    ws, package, sub_package, swc, area = create_workspace()
+    other = ws.create_package('Other')
+    assert area.ref == '/Pkg/Sub/Swc_InternalBehavior/Area'
+    package.delete('Sub')
+    assert sub_package.ref is None
+    other.append(sub_package)
+    assert area.ref == uncached_ref(area) == '/Other/Sub/Swc_InternalBehavior/Area'
+
+
+def test_ref_below_untracked_parent():
+    ws, package, sub_package, swc, area = create_workspace()
+    plain = PlainObject('P', swc.behavior)
+    middle = Element('Middle', plain)
+    child = Element('Child', middle)
+    assert child.ref == '/Pkg/Sub/Swc_InternalBehavior/P/Middle/Child'
+    middle.name = 'Renamed'
+    assert middle.ref == '/Pkg/Sub/Swc_InternalBehavior/P/Renamed'
+    assert child.ref == '/Pkg/Sub/Swc_InternalBehavior/P/Renamed/Child'
+    plain.name = 'Q'
+    assert child.ref == '/Pkg/Sub/Swc_InternalBehavior/Q/Renamed/Child'
+
+
+def test_rename_keeps_other_workspaces_cached():
+    ws, package, sub_package, swc, area = create_workspace()
+    other_ws, other_package, _, _, other_area = create_workspace()
+    assert other_area.ref == '/Pkg/Sub/Swc_InternalBehavior/Area'
+    assert other_area._ref_cache is not None
+    package.name = 'Renamed'
+    assert other_area._ref_cache is not None
+    assert area._ref_cache is None
+    assert area.ref == '/Renamed/Sub/Swc_InternalBehavior/Area'
+
+
+def test_rename_keeps_siblings_cached():
+    ws, package, sub_package, swc, area = create_workspace()
+    second = swc.behavior.create_exclusive_area('Second')
+    other = package.create_sub_package('Other')
+    assert second.ref is not None and other.ref is not None
+    area.name = 'First'
+    assert second._ref_cache is not None
+    assert other._ref_cache is not None
+    assert area.ref == '/Pkg/Sub/Swc_InternalBehavior/First'
+
+
+def test_find_after_rename():
+    ws, package, sub_package, swc, area = create_workspace()
+    assert ws.find('/Pkg/Sub/Swc_InternalBehavior/Area') is area
+    area.name = 'Renamed'
+    assert ws.find('/Pkg/Sub/Swc_InternalBehavior/Area') is None
+    assert ws.find('/Pkg/Sub/Swc_InternalBehavior/Renamed') is area
@@ -0,0 +1,124 @@
+from autosar.model.element import Element
+from autosar.model.index import iter_child_elements
+from autosar.model.package import Package
+
+
+def package_tree(ws) -> dict[str, object]:
+    """
+    Returns the packages and package elements of ws by their ref, collected from scratch
+    """
+    result = {}
+    pending = list(ws.packages)
+    while pending:
+        package = pending.pop()
+        result[package.ref] = package
+        for element in package.elements:
+            result[element.ref] = element
+        pending.extend(package.sub_packages)
+    return result
+
+
+def assert_index_consistent(ws):
+    expected = package_tree(ws)
+    for ref, obj in expected.items():
+        assert ws.find(ref) is obj
+    # Every key is either current or a leftover of a rename, which find() detects
+    for ref, obj in ws.ref_index.items():
+        assert obj.ref == ref or expected.get(ref) is not obj
+    for parent_ref, refs in ws._ref_children.items():
+        for ref in refs:
+            assert ref.rpartition('/')[0] == parent_ref
+
+
+def assert_not_indexed(ws, ref: str):
+    prefix = f'{ref}/'
+    assert all(key != ref and not key.startswith(prefix) for key in ws.ref_index)
+    assert all(key != ref and not key.startswith(prefix) for key in ws._ref_children)
+    assert ws.find(ref) is None
+
+
+def test_index_after_load(ws):
+    assert_index_consistent(ws)
+    assert set(package_tree(ws)) <= set(ws.ref_index)
+
+
+def test_nested_refs_indexed_on_find(ws):
+    mapping = ws.find('/Pdus/Pdu0/Sig0_Map')
+    assert mapping is not None
+    assert ws.ref_index['/Pdus/Pdu0/Sig0_Map'] is mapping
+    assert '/Pdus/Pdu0/Sig0_Map' in ws._ref_children['/Pdus/Pdu0']
+
+
+def test_delete_element(ws):
+    assert ws.find('/Pdus/Pdu0/Sig0_Map') is not None
+    ws.find('/Pdus').delete('Pdu0')
+    assert_not_indexed(ws, '/Pdus/Pdu0')
+    assert '/Pdus/Pdu0' not in ws._ref_children['/Pdus']
+    assert ws.find('/Pdus/Pdu1') is not None
+    assert_index_consistent(ws)
+
+
+def test_delete_package(ws):
+    ws.find('/DataTypes/BaseTypes/uint8')
+    ws.find('/DataTypes').delete('BaseTypes')
+    assert_not_indexed(ws, '/DataTypes/BaseTypes')
+    ws.delete('/Signals')
+    assert_not_indexed(ws, '/Signals')
+    assert_index_consistent(ws)
+
+
+def test_append_package(ws):
+    package = Package('Extra')
+    sub_package = Package('Sub')
+    package.append(sub_package)
+    element = Element('Item')
+    sub_package.append(element)
+    ws.append(package)
+    assert ws.ref_index['/Extra/Sub/Item'] is element
+    assert_index_consistent(ws)
+    ws.delete('/Extra')
+    assert_not_indexed(ws, '/Extra')
+
+
+def test_rename_and_reparent(ws):
+    mapping = ws.find('/Pdus/Pdu1/Sig1_Map')
+    assert mapping is not None
+    mapping.name = 'Renamed'
+    assert ws.find('/Pdus/Pdu1/Sig1_Map') is None
+    assert ws.find('/Pdus/Pdu1/Renamed') is mapping
+    frames = ws.find('/Frames')
+    frame = frames.elements[0]
+    frames.delete(frame.name)
+    ws.find('/Pdus').append(frame)
+    assert ws.find(f'/Pdus/{frame.name}') is frame
+    assert ws.find(f'/Frames/{frame.name}') is None
+    assert_index_consistent(ws)
+
+
+def descendant_refs(element) -> list[str]:
+    """
+    Returns the refs of element and of every element nested below it, including the ones inside package elements
+    """
+    refs = []
+    pending = [element]
+    while pending:
+        current = pending.pop()
+        refs.append(current.ref)
+        if isinstance(current, Package):
+            pending.extend(current.elements)
+            pending.extend(current.sub_packages)
+        else:
+            pending.extend(iter_child_elements(current))
+    return refs
+
+
+def test_delete_package_removes_descendants(ws):
+    refs = descendant_refs(ws.find('/Pdus'))
+    assert len(refs) > len(ws.find('/Pdus').elements) + 1
+    for ref in refs:
+        assert ws.find(ref) is not None
+    ws.delete('/Pdus')
+    for ref in refs:
+        assert ws.find(ref) is None
+    assert_not_indexed(ws, '/Pdus')
+    assert_index_consistent(ws)
@@ -0,0 +1,73 @@
+from autosar.model.element import Element
+from autosar.model.index import ReferrerIndex, iter_references
+
+
+def rebuilt_referrers(ws) -> dict[str, list[int]]:
+    """
+    Returns the ids of the referrers of every reference, collected from scratch
+    """
+    index = {}
+    pending = list(ws.packages)
+    while pending:
+        package = pending.pop()
+        for element in package.elements:
+            seen = set()
+            for ref, referrer in iter_references(element):
+                if (ref, id(referrer)) not in seen:
+                    seen.add((ref, id(referrer)))
+                    index.setdefault(ref, []).append(id(referrer))
+        pending.extend(package.sub_packages)
+    return {ref: sorted(ids) for ref, ids in index.items()}
+
+
+def indexed_referrers(ws) -> dict[str, list[int]]:
+    index: ReferrerIndex = ws._referrer_index
+    return {ref: sorted(id(referrer) for referrer in referrers) for ref, referrers in index._referrers.items()}
+
+
+def test_referrers_of_signal(ws):
+    referrers = ws.referrers('/Signals/Sig0')
+    assert len(referrers) > 0
+    assert all(
+        any(ref == '/Signals/Sig0' for ref, owner in iter_references(referrer) if owner is referrer)
+        for referrer in referrers
+    )
+    assert ws.referrers('Signals/Sig0') == referrers
+    assert ws.referrers('/Signals/Missing') == []
+
+
+def test_index_matches_rebuild(ws):
+    ws.referrers('/Signals/Sig0')
+    assert indexed_referrers(ws) == rebuilt_referrers(ws)
+
+
+def test_delete_element(ws):
+    referrers = ws.referrers('/Signals/Sig0')
+    mapping = ws.find('/Pdus/Pdu0/Sig0_Map')
+    assert mapping in referrers
+    ws.find('/Pdus').delete('Pdu0')
+    assert mapping not in ws.referrers('/Signals/Sig0')
+    assert indexed_referrers(ws) == rebuilt_referrers(ws)
+
+
+def test_delete_package(ws):
+    ws.referrers('/Signals/Sig0')
+    ws.delete('/Pdus')
+    assert all(not referrer.ref.startswith('/Pdus/') for referrer in ws.referrers('/Signals/Sig0'))
+    assert indexed_referrers(ws) == rebuilt_referrers(ws)
+    ws.find('/DataTypes').delete('CompuMethods')
+    assert indexed_referrers(ws) == rebuilt_referrers(ws)
+
+
+def test_append_element(ws):
+    ws.referrers('/Signals/Sig0')
+    package = ws.find('/Signals')
+    signal = package.elements[0]
+    package.delete(signal.name)
+    assert indexed_referrers(ws) == rebuilt_referrers(ws)
+    other = ws.find('/Pdus')
+    other.append(signal)
+    assert indexed_referrers(ws) == rebuilt_referrers(ws)
+    element = Element('Extra')
+    package.append(element)
+    assert indexed_referrers(ws) == rebuilt_referrers(ws)
@@ -0,0 +1,53 @@
+import pickle
+
+import pytest
+
+from autosar.model.communication_cluster import PduTriggering
+from autosar.model.pdu import ISignalIPdu
+from autosar.model.signal import ISignal
+from autosar.model.system import System
+
+
+def test_slotted_classes_reject_unknown_attributes(ws):
+    signal = ws.find('/Signals/Sig0')
+    assert isinstance(signal, ISignal)
+    assert not hasattr(signal, '__dict__')
+    with pytest.raises(AttributeError):
+        signal.lenght = 16
+    with pytest.raises(AttributeError):
+        ws.find('/Pdus/Pdu0').unknown = None
+    triggering = PduTriggering(name='Added', i_pdu_ref=None)
+    with pytest.raises(AttributeError):
+        triggering.unknown = None
+    # Classes that were not converted keep a __dict__
+    system = ws.find('/Systems/System')
+    system.note = 'kept'
+    assert system.note == 'kept'
+
+
+def test_pickle_round_trip(ws):
+    refs = [obj.ref for obj in ws.findall('/**/*')]
+    nested = ws.find('/Pdus/Pdu0/Sig0_Map')
+    # The XML tree and the default element parsers are not part of a snapshot, see _load_file_detached()
+    ws.xml_root = None
+    ws.package_parser = None
+    loaded = pickle.loads(pickle.dumps(ws, protocol=pickle.HIGHEST_PROTOCOL))
+    package = loaded.packages[[p.name for p in loaded.packages].index('Pdus')]
+    pdu = package.map['elements']['Pdu0']
+    assert isinstance(pdu, ISignalIPdu)
+    # Cached refs and child name maps are dropped when pickling and rebuilt on use
+    assert package._ref_cache is None
+    assert pdu._ref_cache is None
+    assert pdu._find_index is None
+    assert pdu.ref == '/Pdus/Pdu0'
+    assert loaded.find('/Pdus/Pdu0') is pdu is not ws.find('/Pdus/Pdu0')
+    assert pdu.find('Sig0_Map').ref == nested.ref
+    assert [obj.ref for obj in loaded.findall('/**/*')] == refs
+    for ref in refs:
+        assert loaded.find(ref).ref == ref
+    assert loaded.find('/Pdus/Pdu0/Sig0_Map').i_signal_ref == nested.i_signal_ref
+    assert loaded.find('/Clusters/CanCluster0/CanChannel/PduTrig1').parent is loaded.find('/Clusters/CanCluster0/CanChannel')
+    assert [system.ref for system in loaded.instances_of(System)] == ['/Systems/System']
+    # A renamed element changes the ref of its unpickled children
+    pdu.name = 'Renamed'
+    assert pdu.find('Sig0_Map').ref == '/Pdus/Renamed/Sig0_Map'
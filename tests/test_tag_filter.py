@@ -0,0 +1,47 @@
+import pytest
+
+import autosar
+from autosar.model.behavior import InternalBehaviorCommon
+from autosar.model.component import ApplicationSoftwareComponent
+from autosar.model.pdu import ISignalIPdu
+
+
+def components(ws) -> list[ApplicationSoftwareComponent]:
+    return list(ws.instances_of(ApplicationSoftwareComponent))
+
+
+@pytest.mark.parametrize('mode', [{}, {'streaming': True}, {'lazy': True}])
+def test_exclude_nested_behavior(arxml_file, mode):
+    ws = autosar.workspace()
+    ws.load_xml(arxml_file, exclude_tags=['SWC-INTERNAL-BEHAVIOR'], **mode)
+    assert len(components(ws)) > 0
+    for component in components(ws):
+        assert component.behavior is None
+        assert component.find('Behavior') is None
+        assert component.parent.skipped_tags == {'SWC-INTERNAL-BEHAVIOR'}
+    assert ws.skipped_tags == {'SWC-INTERNAL-BEHAVIOR'}
+
+
+def test_without_filter_behavior_is_parsed(ws):
+    for component in components(ws):
+        assert isinstance(component.behavior, InternalBehaviorCommon)
+        assert component.find('Behavior') is component.behavior
+    assert ws.skipped_tags == set()
+
+
+def test_include_tags(arxml_file, ws):
+    filtered = autosar.workspace()
+    filtered.load_xml(arxml_file, include_tags='I-SIGNAL-I-PDU')
+    assert [pdu.ref for pdu in filtered.instances_of(ISignalIPdu)] == [pdu.ref for pdu in ws.instances_of(ISignalIPdu)]
+    assert components(filtered) == []
+    assert 'APPLICATION-SW-COMPONENT-TYPE' in filtered.skipped_tags
+    assert 'I-SIGNAL-I-PDU' not in filtered.skipped_tags
+    assert filtered.unhandled_parser == set()
+
+
+def test_include_tags_keep_nested_behavior(arxml_file):
+    ws = autosar.workspace()
+    ws.load_xml(arxml_file, include_tags=['APPLICATION-SW-COMPONENT-TYPE'])
+    assert len(components(ws)) > 0
+    assert all(component.behavior is not None for component in components(ws))
+    assert 'SWC-INTERNAL-BEHAVIOR' not in ws.skipped_tags